@@ -22,7 +22,9 @@ class ErrorCode(enum.Enum):
     HEADER_AUTHORIZATION_TOKEN_INVALID_MESSAGE                          = 'header.authorization.token_not_valid_message'
     HEADER_AUTHORIZATION_UNRECOGNIZED_SCHEME                            = 'header.authorization.unrecognized_scheme'
     HEADER_AUTHORIZATION_NOT_BASE64_ENCODED_VALUE                       = 'header.authorization.not_base64_encoded_value'
+    HEADER_BATCH_SIZE_INVALID                                           = 'header.batch_size.invalid'
     HEADER_CONTENT_TYPE_NOT_SUPPORTED                                   = 'header.content_type.not_supported'
+    HEADER_LONG_POLL_TIMEOUT_INVALID                                    = 'header.long_poll_timeout.invalid'
     HEADER_PROTOCOL_VERSION_UNSUPPORTED                                 = 'header.protocol_version.unsupported'
     MESSAGE_AUTHORIZED_CLIENT_PUBLIC_KEY_UNAUTHORIZED_CLIENT            = 'message.authorized_client_public_key_unauthorized_client'
     MESSAGE_AUTHORIZED_CLIENT_PUBLIC_KEY_WRONG_TYPE                     = 'message.authorized_client_public_key_wrong_type'
@@ -2,6 +2,7 @@ import calendar
 import base64
 import binascii
 import datetime
+import threading
 import time
 
 from django.conf import settings
@@ -26,11 +27,14 @@ from common.constants import ErrorCode
 class RequestIDGenerator:
 
     _request_id = 0
+    _lock = threading.Lock()
 
     @classmethod
     def generate_request_id(cls) -> int:
-        cls._request_id += 1
-        return cls._request_id
+        # Requests sent from different threads share connections to MiddleMan, so their ids must not repeat.
+        with cls._lock:
+            cls._request_id += 1
+            return cls._request_id
 
 
 def is_base64(data: str) -> bool:
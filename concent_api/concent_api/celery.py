@@ -1,7 +1,15 @@
 import os
+from typing import Any
+
 from celery import Celery
+from celery.signals import task_postrun
 from kombu import Queue
 
+from core.constants import DEPOSIT_CLAIM_FINALIZATION_INTERVAL
+from core.constants import PAYMENT_EVENTS_INDEXER_INTERVAL
+from core.constants import TIMED_OUT_SUBTASKS_SWEEPER_INTERVAL
+from core.message_cache import reset_deserialized_message_cache
+
 # set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'concent_api.settings')
 
@@ -26,9 +34,32 @@ app.conf.task_routes = ([
     ('core.tasks.verification_result', {'queue': 'concent'}),
     ('core.tasks.upload_finished', {'queue': 'concent'}),
     ('core.tasks.result_upload_finished', {'queue': 'concent'}),
+    ('core.tasks.update_timed_out_subtasks', {'queue': 'concent'}),
+    ('core.tasks.index_payment_events', {'queue': 'concent'}),
+    ('core.tasks.finalize_requested_payments', {'queue': 'concent'}),
     ('conductor.tasks.blender_verification_request', {'queue': 'conductor'}),
     ('conductor.tasks.result_transfer_request', {'queue': 'conductor'}),
     ('conductor.tasks.upload_acknowledged', {'queue': 'conductor'}),
     ('verifier.tasks.blender_verification_order', {'queue': 'verifier'}),
 ],)
 app.conf.task_default_queue = 'concent'
+
+app.conf.beat_schedule = {
+    'update-timed-out-subtasks': {
+        'task':     'core.tasks.update_timed_out_subtasks',
+        'schedule': TIMED_OUT_SUBTASKS_SWEEPER_INTERVAL,
+    },
+    'index-payment-events': {
+        'task':     'core.tasks.index_payment_events',
+        'schedule': PAYMENT_EVENTS_INDEXER_INTERVAL,
+    },
+    'finalize-requested-payments': {
+        'task':     'core.tasks.finalize_requested_payments',
+        'schedule': DEPOSIT_CLAIM_FINALIZATION_INTERVAL,
+    },
+}
+
+
+@task_postrun.connect
+def reset_deserialized_message_cache_after_task(task: Any = None, **kwargs: Any) -> None:  # pylint: disable=unused-argument
+    reset_deserialized_message_cache(task.name if task is not None else 'task')
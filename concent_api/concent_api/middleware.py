@@ -15,6 +15,7 @@ from mimeparse import best_match
 
 from concent_api.constants import DEFAULT_ERROR_MESSAGE
 from common.constants import ErrorCode
+from core.message_cache import reset_deserialized_message_cache
 
 
 class GolemMessagesVersionMiddleware():
@@ -53,6 +54,22 @@ class ConcentVersionMiddleware(object):
         return response
 
 
+class DeserializedMessageCacheMiddleware():
+    """
+    Used to make sure that messages cached by core.message_cache are kept only until the end of the request.
+
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        try:
+            return self.get_response(request)
+        finally:
+            reset_deserialized_message_cache(request.path)
+
+
 def determine_return_type(request_meta: dict) -> str:
     try:
         # The list of preferred mime-types should be sorted in order of increasing desirability,
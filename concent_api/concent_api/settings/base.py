@@ -47,6 +47,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'concent_api.middleware.GolemMessagesVersionMiddleware',
     'concent_api.middleware.ConcentVersionMiddleware',
+    'concent_api.middleware.DeserializedMessageCacheMiddleware',
 ]
 
 ROOT_URLCONF = 'concent_api.urls'
@@ -365,6 +366,11 @@ MAJOR_MINOR_GOLEM_MESSAGES_VERSION = get_major_and_minor_golem_messages_version(
 # Define if exception should be raised when database transactions are nested.
 DETECT_NESTED_TRANSACTIONS = True
 
+# Alias of a cache from CACHES used to remember clients who have no pending messages, so that their empty
+# requests to `receive` endpoint are answered without querying the database. The cache must be shared by all instances
+# with "concent-api" and "concent-worker" features, e.g. memcached. If None, every request queries the database.
+RECEIVE_CACHE_ALIAS = None
+
 # Define how long concent wait for middleman response before raising exception.
 SCI_CALLBACK_RETRIES_TIME = 60
 
@@ -519,6 +519,14 @@ def create_error_61_ethereum_chain_is_invalid() -> Error:
     )
 
 
+def create_error_62_receive_cache_alias_is_not_in_caches(receive_cache_alias: Any) -> Error:
+    return Error(
+        f'RECEIVE_CACHE_ALIAS setting has value {receive_cache_alias} which is not a cache defined in CACHES setting',
+        hint='Set RECEIVE_CACHE_ALIAS to None or to an alias of a cache defined in CACHES in your local_settings.py',
+        id='concent.E062',
+    )
+
+
 @register()
 def check_settings_concent_features(app_configs: None=None, **kwargs: Any) -> list:  # pylint: disable=unused-argument
 
@@ -890,3 +898,12 @@ def check_ethereum_chain(app_configs: None=None, **kwargs: Any) -> list:  # pyli
             return [create_error_61_ethereum_chain_is_invalid()]
 
     return []
+
+
+@register()
+def check_receive_cache_alias(app_configs: None=None, **kwargs: Any) -> list:  # pylint: disable=unused-argument
+    receive_cache_alias = getattr(settings, 'RECEIVE_CACHE_ALIAS', None)
+    if receive_cache_alias is not None and receive_cache_alias not in settings.CACHES:
+        return [create_error_62_receive_cache_alias_is_not_in_caches(receive_cache_alias)]
+
+    return []
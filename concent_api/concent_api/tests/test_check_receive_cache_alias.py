@@ -0,0 +1,28 @@
+from assertpy import assert_that
+
+from django.test import override_settings
+
+from concent_api.system_check import check_receive_cache_alias
+from concent_api.system_check import create_error_62_receive_cache_alias_is_not_in_caches
+
+
+# pylint: disable=no-self-use
+class TestReceiveCacheAliasCheck():
+
+    @override_settings(RECEIVE_CACHE_ALIAS=None)
+    def test_that_receive_cache_alias_check_will_not_produce_error_when_cache_is_disabled(self):
+        errors = check_receive_cache_alias()
+
+        assert_that(errors).is_empty()
+
+    @override_settings(RECEIVE_CACHE_ALIAS='default')
+    def test_that_receive_cache_alias_check_will_not_produce_error_when_cache_is_defined(self):
+        errors = check_receive_cache_alias()
+
+        assert_that(errors).is_empty()
+
+    @override_settings(RECEIVE_CACHE_ALIAS='not-defined')
+    def test_that_receive_cache_alias_check_will_produce_error_when_cache_is_not_defined(self):
+        errors = check_receive_cache_alias()
+
+        assert_that(errors).is_equal_to([create_error_62_receive_cache_alias_is_not_in_caches('not-defined')])
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 14:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('conductor', '0013_auto_20190328_0813'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='uploadreport',
+            index=models.Index(fields=['path'], name='uploadreport_path_idx'),
+        ),
+    ]
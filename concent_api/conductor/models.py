@@ -6,6 +6,7 @@ from django.db.models import DateTimeField
 from django.db.models import DecimalField
 from django.db.models import ForeignKey
 from django.db.models import IntegerField
+from django.db.models import Index
 from django.db.models import Model
 from django.db.models import OneToOneField
 from django.db.models import PositiveIntegerField
@@ -130,6 +131,13 @@ class UploadReport(Model):
     # Indicates when conductor has been notified about the upload.
     created_at = DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            # Reports are looked up by path when linking them with requests. Plain index is used instead of
+            # `db_index=True`, because the latter also creates an index for LIKE queries, which are never used.
+            Index(fields=['path'], name='uploadreport_path_idx'),
+        ]
+
 
 class Frame(Model):
     """
@@ -0,0 +1,46 @@
+from collections import OrderedDict
+from typing import Optional
+import threading
+
+from core.constants import CLIENT_ID_CACHE_MAXIMUM_SIZE
+
+
+class ClientIdCache:
+    """
+    Keeps ids of Clients by their public keys, so that clients do not have to be looked up in the database every time
+    a message from or to them is handled. Clients are never removed, so a cached id never becomes stale as long as only
+    ids of clients stored by committed transactions are added. The cache is shared by all threads of the process.
+    When the cache is full, the least recently used id is evicted.
+    """
+
+    def __init__(self, maximum_size: int = CLIENT_ID_CACHE_MAXIMUM_SIZE) -> None:
+        assert maximum_size > 0
+        self.maximum_size = maximum_size
+        self._client_ids: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._client_ids)
+
+    def get(self, public_key: bytes) -> Optional[int]:
+        with self._lock:
+            if public_key not in self._client_ids:
+                return None
+            self._client_ids.move_to_end(public_key)
+            return self._client_ids[public_key]
+
+    def add(self, public_key: bytes, client_id: int) -> None:
+        assert isinstance(public_key, bytes)
+        assert isinstance(client_id, int)
+        with self._lock:
+            self._client_ids[public_key] = client_id
+            self._client_ids.move_to_end(public_key)
+            if len(self._client_ids) > self.maximum_size:
+                self._client_ids.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._client_ids.clear()
+
+
+client_id_cache = ClientIdCache()
@@ -44,9 +44,93 @@ CELERY_LOCKED_SUBTASK_DELAY = 60
 
 MAXIMUM_VERIFICATION_RESULT_TASK_RETRIES = 3
 
+# Defines how many seconds pass between consecutive runs of the task which updates timed out subtasks.
+TIMED_OUT_SUBTASKS_SWEEPER_INTERVAL = 5
+
+# Defines how many subtasks are locked and updated by the timed out subtasks sweeper in a single transaction.
+TIMED_OUT_SUBTASKS_SWEEPER_BATCH_SIZE = 100
+
+# Defines maximum number of messages returned by `receive-batch` endpoint in a single response.
+RECEIVE_BATCH_MAXIMUM_SIZE = 50
+
+# Defines `struct` format of the length prefix preceding each message returned by `receive-batch` endpoint.
+RECEIVE_BATCH_MESSAGE_LENGTH_FORMAT = '>I'
+
+# Defines maximum number of seconds for which `receive` endpoint can wait for a pending message in long-poll mode.
+RECEIVE_LONG_POLL_MAXIMUM_TIMEOUT = 30
+
+# Defines for how many seconds a client can be remembered as having no pending messages.
+RECEIVE_CACHE_TIMEOUT = 30
+
+# Defines for how many seconds, after a new message is queued for a client, the client can't be remembered as having
+# no pending messages. Must be longer than the longest request to `receive` endpoint.
+RECEIVE_CACHE_INVALIDATION_TIMEOUT = 2 * RECEIVE_LONG_POLL_MAXIMUM_TIMEOUT
+
+# Defines keys under which numbers of `receive` requests answered from cache and from database are stored.
+RECEIVE_CACHE_HITS_KEY = 'receive_cache_hits'
+RECEIVE_CACHE_MISSES_KEY = 'receive_cache_misses'
+
+# Defines maximum number of deserialized StoredMessages kept in memory during a single request or task.
+DESERIALIZED_MESSAGE_CACHE_MAXIMUM_SIZE = 100
+
+# Defines maximum number of Client ids kept in memory by a single process, so that clients do not have to be looked up
+# by public key in the database.
+CLIENT_ID_CACHE_MAXIMUM_SIZE = 10000
+
+# Defines how many unreferenced StoredMessageData objects are deleted in a single transaction.
+STORED_MESSAGE_DATA_DELETION_BATCH_SIZE = 1000
+
+# Defines zlib compression level used for serialized messages.
+MESSAGE_COMPRESSION_LEVEL = 9
+
+# Defines maximum size of a dictionary used to compress serialized messages. zlib does not use more than 32 KiB.
+MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE = 32 * 1024
+
+# Defines length of byte sequences compared between messages when training a compression dictionary.
+MESSAGE_COMPRESSION_DICTIONARY_SEGMENT_LENGTH = 8
+
+# Defines for how many seconds the number of the latest block is remembered by the deposit value cache.
+# Must be well below the time between blocks, because deposit values are cached only until a new block is seen.
+DEPOSIT_VALUE_CACHE_BLOCK_NUMBER_TIMEOUT = 1
+
+# Defines after how many seconds the cached SCI synchronization status is refreshed in the background.
+# Determines how soon requests start being rejected with SCINotSynchronized after the Ethereum node falls behind.
+SCI_SYNCHRONIZATION_STATUS_REFRESH_INTERVAL = 5
+
+# Defines for how many seconds the cached SCI synchronization status can be used at all, e.g. when refreshing it
+# in the background keeps failing.
+SCI_SYNCHRONIZATION_STATUS_TIMEOUT = 15
+
+# Defines how many seconds pass between consecutive runs of the task which copies payment events to the database.
+PAYMENT_EVENTS_INDEXER_INTERVAL = 15
+
+# Defines how many blocks are read from the blockchain and stored by the payment events indexer in a single transaction.
+PAYMENT_EVENTS_INDEXER_MAXIMUM_BLOCK_RANGE = 1000
+
+# Defines how many blocks before the latest confirmed block are indexed when the payment events indexer runs for
+# the first time. Payments from earlier blocks are still read directly from the blockchain.
+PAYMENT_EVENTS_INDEXER_INITIAL_BLOCK_RANGE = 50000
+
 # Defines how many seconds should SCI callback wait for response from MiddleMan.
 SCI_CALLBACK_MAXIMUM_TIMEOUT = 30
 
+# Defines how many queries to the payment backend can be run concurrently by Bankster in a single Concent process.
+BANKSTER_PAYMENT_QUERIES_MAXIMUM_WORKERS = 8
+
+# Defines how many seconds pass between consecutive runs of the task which pays out deposit claims queued for
+# finalization. Claims queued in the meantime are paid out together.
+DEPOSIT_CLAIM_FINALIZATION_INTERVAL = 5
+
+# Defines how many deposit claims are paid out by a single run of the deposit claim finalization task.
+DEPOSIT_CLAIM_FINALIZATION_BATCH_SIZE = 100
+
+# Defines how many transactions paying out deposit claims can be submitted concurrently by a single Concent process.
+DEPOSIT_CLAIM_FINALIZATION_MAXIMUM_CONCURRENT_TRANSACTIONS = 8
+
+# Defines how many connections to MiddleMan can be kept open by a single Concent process for sending requests
+# to the Signing Service. Each connection is shared by concurrent requests.
+MIDDLEMAN_CLIENT_MAXIMUM_NUMBER_OF_CONNECTIONS = 2
+
 # Defines how many blocks before first block for forced subtask payments or additional verification payments
 # should be listed.
 PAYMENTS_FROM_BLOCK_SAFETY_MARGIN = 10
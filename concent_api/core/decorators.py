@@ -1,5 +1,6 @@
 from functools import wraps
 from logging import getLogger
+from struct import pack
 from time import time
 from typing import Any
 from typing import Callable
@@ -32,6 +33,7 @@ from common.logging import get_json_from_message_without_redundant_fields_for_lo
 from common.logging import log
 from common.logging import log_400_error
 from common.shortcuts import load_without_public_key
+from core.constants import RECEIVE_BATCH_MESSAGE_LENGTH_FORMAT
 from core.exceptions import CreateModelIntegrityError
 from core.exceptions import SCICallbackTimeoutError
 from core.exceptions import SCINotSynchronized
@@ -295,7 +297,27 @@ def handle_errors_and_responses(database_name: str) -> Callable:
                     client_public_key,
                 )
                 return response_from_view
-            elif response_from_view is None:
+            elif isinstance(response_from_view, list) and len(response_from_view) > 0:
+                serialized_messages = []
+                for message_to_return in response_from_view:
+                    assert isinstance(message_to_return, message.Message)
+                    assert message_to_return.sig is None
+                    logging.log_message_returned(
+                        logger,
+                        message_to_return,
+                        client_public_key,
+                        request.resolver_match._func_path if request.resolver_match is not None else None,
+                    )
+                    serialized_message = dump(
+                        message_to_return,
+                        settings.CONCENT_PRIVATE_KEY,
+                        client_public_key,
+                    )
+                    # Each message is preceded by its length, so that the client can split the stream.
+                    serialized_messages.append(pack(RECEIVE_BATCH_MESSAGE_LENGTH_FORMAT, len(serialized_message)))
+                    serialized_messages.append(serialized_message)
+                return HttpResponse(b''.join(serialized_messages), content_type = 'application/octet-stream')
+            elif response_from_view is None or response_from_view == []:
 
                 log(
                     logger,
@@ -0,0 +1,121 @@
+from time import perf_counter
+from typing import Any
+from typing import Callable
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from django.db import connections
+from django.db import transaction
+
+from core.model_helpers import get_sum_of_deposit_claims
+from core.models import Client
+from core.models import DepositAccount
+from core.models import DepositClaim
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds deposit accounts with open claims and compares the time of reading the total of claims against '
+        'a locked account by summing DepositClaims with reading DepositAccount.total_claimed. Everything is done '
+        'in a transaction that is always rolled back.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--accounts',
+            type=int,
+            default=10,
+            help='Number of deposit accounts to generate.',
+        )
+        parser.add_argument(
+            '--claims',
+            type=int,
+            default=10000,
+            help='Number of open claims to generate against each deposit account.',
+        )
+        parser.add_argument(
+            '--repetitions',
+            type=int,
+            default=100,
+            help='Number of times each variant is measured.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        number_of_accounts = max(options['accounts'], 1)
+        claims_per_account = max(options['claims'], 1)
+        repetitions = max(options['repetitions'], 1)
+
+        with transaction.atomic(using='control'):
+            deposit_account_id = self._seed_database(number_of_accounts, claims_per_account)
+
+            def read_sum_of_claims() -> None:
+                DepositAccount.objects.select_for_update().get(pk=deposit_account_id)
+                get_sum_of_deposit_claims(deposit_account_id)
+
+            def read_total_claimed() -> None:
+                DepositAccount.objects.select_for_update().get(pk=deposit_account_id).total_claimed  # pylint: disable=expression-not-assigned
+
+            assert (
+                DepositAccount.objects.get(pk=deposit_account_id).total_claimed ==
+                get_sum_of_deposit_claims(deposit_account_id)
+            )
+            self._benchmark('SUM over DepositClaim', read_sum_of_claims, repetitions)
+            self._benchmark('DepositAccount.total_claimed', read_total_claimed, repetitions)
+            transaction.set_rollback(True, using='control')
+
+    def _seed_database(self, number_of_accounts: int, claims_per_account: int) -> int:
+        """ Inserts accounts with open claims and returns id of the first account. """
+        with connections['control'].cursor() as cursor:
+            cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {Client._meta.db_table}')
+            client_base_id = cursor.fetchone()[0]
+            cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {DepositAccount._meta.db_table}')
+            deposit_account_base_id = cursor.fetchone()[0]
+
+            self.stdout.write(f'Seeding {number_of_accounts} deposit accounts with {claims_per_account} claims each...')
+            cursor.execute(
+                f'''
+                INSERT INTO {Client._meta.db_table} (id, public_key, created_at)
+                SELECT {client_base_id} + i, 'benchmark' || i, now()
+                FROM generate_series(1, {number_of_accounts}) AS i
+                '''
+            )
+            cursor.execute(
+                f'''
+                INSERT INTO {DepositAccount._meta.db_table} (id, client_id, ethereum_address, created_at, total_claimed)
+                SELECT
+                    {deposit_account_base_id} + i,
+                    {client_base_id} + i,
+                    '0x' || lpad(to_hex(i), 40, '0'),
+                    now(),
+                    {sum(claim_number % 1000 + 1 for claim_number in range(1, claims_per_account + 1))}
+                FROM generate_series(1, {number_of_accounts}) AS i
+                '''
+            )
+            cursor.execute(
+                f'''
+                INSERT INTO {DepositClaim._meta.db_table} (
+                    subtask_id, payer_deposit_account_id, payee_ethereum_address, concent_use_case, amount, created_at,
+                    modified_at
+                )
+                SELECT
+                    'benchmark' || i || '-' || j,
+                    {deposit_account_base_id} + i,
+                    '0x' || lpad(to_hex(1000000 + j), 40, '0'),
+                    1,
+                    j % 1000 + 1,
+                    now(),
+                    now()
+                FROM generate_series(1, {number_of_accounts}) AS i, generate_series(1, {claims_per_account}) AS j
+                '''
+            )
+            for model in [Client, DepositAccount, DepositClaim]:
+                cursor.execute(f'ANALYZE {model._meta.db_table}')  # type: ignore
+
+        return deposit_account_base_id + 1
+
+    def _benchmark(self, name: str, read_total: Callable[[], None], repetitions: int) -> None:
+        read_total()
+        start = perf_counter()
+        for _ in range(repetitions):
+            read_total()
+        self.stdout.write(f'{name}: {(perf_counter() - start) / repetitions * 1000:.3f} ms per locked read')
@@ -0,0 +1,273 @@
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Tuple
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+from django.db import connections
+from django.db import transaction
+from django.db.models import Q
+from django.db.models import QuerySet
+
+from conductor.models import UploadReport
+from core.models import Client
+from core.models import DepositAccount
+from core.models import DepositClaim
+from core.models import PendingResponse
+from core.models import StoredMessage
+from core.models import StoredMessageData
+from core.models import Subtask
+from core.subtask_helpers import _get_subtasks_to_update_query_set
+
+# Defines how many clients are created per row count given in --rows.
+ROWS_PER_CLIENT = 100
+
+# Defines which fraction of seeded subtasks is in an active state. In production most subtasks are finished.
+ACTIVE_SUBTASKS_FRACTION = 0.02
+
+# Defines which fraction of seeded pending responses has not been delivered yet.
+UNDELIVERED_PENDING_RESPONSES_FRACTION = 0.05
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds the database with generated rows and prints query plans and timings of the hot queries with and '
+        'without the indexes created for them. Everything is done in a transaction that is always rolled back. '
+        'Indexes are dropped for the duration of the transaction, which locks the tables, so the command must not '
+        'be run against a database used by a live Concent instance.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=1000000,
+            help='Number of subtasks, pending responses, deposit claims and upload reports to generate.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rows = options['rows']
+
+        with transaction.atomic(using='control'):
+            client_id = self._seed_control_database(rows)
+            self._benchmark(
+                'control',
+                'Active subtasks of a client',
+                lambda: _get_subtasks_to_update_query_set().filter(
+                    Q(requestor__in=Client.objects.filter(pk=client_id).values('pk')) |
+                    Q(provider__in=Client.objects.filter(pk=client_id).values('pk'))
+                ).values_list('subtask_id', flat=True),
+                ['core_subtask_active_requestor_next_deadline', 'core_subtask_active_provider_next_deadline'],
+            )
+            self._benchmark(
+                'control',
+                'Undelivered pending responses of a client',
+                lambda: PendingResponse.objects.filter(
+                    client_id=client_id,
+                    delivered=False,
+                ).order_by('created_at').values('pk')[:10],
+                ['core_pendingresponse_undelivered_client_created_at'],
+            )
+            transaction.set_rollback(True, using='control')
+
+        with transaction.atomic(using='storage'):
+            self._seed_storage_database(rows)
+            self._benchmark(
+                'storage',
+                'Upload reports with given path',
+                lambda: UploadReport.objects.filter(path=f'benchmark/{rows // 2}.zip').values('pk'),
+                ['uploadreport_path_idx'],
+            )
+            transaction.set_rollback(True, using='storage')
+
+    def _seed_control_database(self, rows: int) -> int:
+        """ Inserts generated rows into the control database and returns id of the client used in queries. """
+        number_of_clients = max(rows // ROWS_PER_CLIENT, 2)
+        active_subtasks_modulo = max(int(1 / ACTIVE_SUBTASKS_FRACTION), 1)
+        undelivered_modulo = max(int(1 / UNDELIVERED_PENDING_RESPONSES_FRACTION), 1)
+        active_states = ', '.join(f"'{state.name}'" for state in Subtask.ACTIVE_STATES)
+
+        # Explicit primary keys are used instead of sequences so that rows can be related to each other without joins.
+        client_base_id = self._get_maximum_id('control', Client)
+        stored_message_data_id = self._get_maximum_id('control', StoredMessageData) + 1
+        stored_message_base_id = self._get_maximum_id('control', StoredMessage)
+        subtask_base_id = self._get_maximum_id('control', Subtask)
+        deposit_account_base_id = self._get_maximum_id('control', DepositAccount)
+
+        self.stdout.write(f'Seeding {number_of_clients} clients and {rows} rows per table...')
+        self._execute(
+            'control',
+            f'''
+            INSERT INTO {Client._meta.db_table} (id, public_key, created_at)
+            SELECT {client_base_id} + i, 'benchmark' || i, now()
+            FROM generate_series(1, {number_of_clients}) AS i
+            ''',
+        )
+        # Contents of stored messages do not affect the benchmarked queries, so all of them share a single row.
+        self._execute(
+            'control',
+            f'''
+            INSERT INTO {StoredMessageData._meta.db_table} (id, digest, data, codec, created_at)
+            VALUES ({stored_message_data_id}, 'benchmark', ''::bytea, '{StoredMessageData.Codec.UNCOMPRESSED.name}', now())
+            ''',
+        )
+        self._execute(
+            'control',
+            f'''
+            INSERT INTO {StoredMessage._meta.db_table}
+                (id, type, timestamp, message_data_id, task_id, subtask_id, created_at, protocol_version)
+            SELECT
+                {stored_message_base_id} + i, 0, now(), {stored_message_data_id}, 'benchmark', 'benchmark' || i, now(), ''
+            FROM generate_series(1, {3 * rows}) AS i
+            ''',
+        )
+        self._execute(
+            'control',
+            f'''
+            INSERT INTO {Subtask._meta.db_table} (
+                id, task_id, subtask_id, computation_deadline, result_package_size, requestor_id, provider_id, state,
+                next_deadline, created_at, modified_at, task_to_compute_id, want_to_compute_task_id,
+                report_computed_task_id, result_upload_finished, protocol_version
+            )
+            SELECT
+                {subtask_base_id} + i,
+                'benchmark',
+                'benchmark' || i,
+                now(),
+                0,
+                {client_base_id} + 1 + i % {number_of_clients},
+                {client_base_id} + 1 + (i + 1) % {number_of_clients},
+                CASE WHEN i % {active_subtasks_modulo} = 0
+                    THEN (ARRAY[{active_states}])[1 + i % {len(Subtask.ACTIVE_STATES)}]
+                    ELSE 'ACCEPTED'
+                END,
+                CASE WHEN i % {active_subtasks_modulo} = 0
+                    THEN now() + (i % 7200 - 3600) * interval '1 second'
+                    ELSE NULL
+                END,
+                now(),
+                now(),
+                {stored_message_base_id} + 3 * i - 2,
+                {stored_message_base_id} + 3 * i - 1,
+                {stored_message_base_id} + 3 * i,
+                false,
+                ''
+            FROM generate_series(1, {rows}) AS i
+            ''',
+        )
+        self._execute(
+            'control',
+            f'''
+            INSERT INTO {PendingResponse._meta.db_table}
+                (response_type, client_id, queue, delivered, subtask_id, created_at, modified_at)
+            SELECT
+                'ForceReportComputedTaskResponse',
+                {client_base_id} + 1 + i % {number_of_clients},
+                'Receive',
+                i % {undelivered_modulo} <> 0,
+                {subtask_base_id} + i,
+                now() - i * interval '1 second',
+                now()
+            FROM generate_series(1, {rows}) AS i
+            ''',
+        )
+        self._execute(
+            'control',
+            f'''
+            INSERT INTO {DepositAccount._meta.db_table} (id, client_id, ethereum_address, created_at, total_claimed)
+            SELECT {deposit_account_base_id} + i, {client_base_id} + i, '0x' || lpad(to_hex(i), 40, '0'), now(), 0
+            FROM generate_series(1, {number_of_clients}) AS i
+            ''',
+        )
+        self._execute(
+            'control',
+            f'''
+            INSERT INTO {DepositClaim._meta.db_table} (
+                subtask_id, payer_deposit_account_id, payee_ethereum_address, concent_use_case, amount, created_at,
+                modified_at
+            )
+            SELECT
+                'benchmark' || i,
+                {deposit_account_base_id} + 1 + i % {number_of_clients},
+                '0x' || lpad(to_hex(i), 40, '0'),
+                1,
+                i % 1000 + 1,
+                now(),
+                now()
+            FROM generate_series(1, {rows}) AS i
+            ''',
+        )
+        # Keeps DepositAccount.total_claimed consistent with the claims seeded above.
+        self._execute(
+            'control',
+            f'''
+            UPDATE {DepositAccount._meta.db_table} AS deposit_account
+            SET total_claimed = claims.total_claimed
+            FROM (
+                SELECT payer_deposit_account_id, SUM(amount) AS total_claimed
+                FROM {DepositClaim._meta.db_table}
+                WHERE payer_deposit_account_id > {deposit_account_base_id}
+                GROUP BY payer_deposit_account_id
+            ) AS claims
+            WHERE deposit_account.id = claims.payer_deposit_account_id
+            ''',
+        )
+        for model in [Client, StoredMessageData, StoredMessage, Subtask, PendingResponse, DepositAccount, DepositClaim]:
+            self._execute('control', f'ANALYZE {model._meta.db_table}')
+
+        return client_base_id + 1
+
+    def _seed_storage_database(self, rows: int) -> None:
+        self.stdout.write(f'Seeding {rows} upload reports...')
+        self._execute(
+            'storage',
+            f'''
+            INSERT INTO {UploadReport._meta.db_table} (path, created_at)
+            SELECT 'benchmark/' || i || '.zip', now()
+            FROM generate_series(1, {rows}) AS i
+            ''',
+        )
+        self._execute('storage', f'ANALYZE {UploadReport._meta.db_table}')
+
+    def _benchmark(
+        self,
+        database: str,
+        name: str,
+        get_query_set: Callable[[], QuerySet],
+        index_names: List[str],
+    ) -> None:
+        """
+        Prints the plan of the query with and without given indexes. Indexes are dropped inside a savepoint which
+        is rolled back afterwards.
+        """
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name}'))
+
+        self.stdout.write(self.style.MIGRATE_LABEL('With indexes:'))
+        self._explain(database, get_query_set())
+
+        with transaction.atomic(using=database):
+            for index_name in index_names:
+                self._execute(database, f'DROP INDEX {index_name}')
+            self.stdout.write(self.style.MIGRATE_LABEL(f'Without {", ".join(index_names)}:'))
+            self._explain(database, get_query_set())
+            transaction.set_rollback(True, using=database)
+
+    def _explain(self, database: str, query_set: QuerySet) -> None:
+        (sql, parameters) = query_set.query.get_compiler(using=database).as_sql()
+        with connections[database].cursor() as cursor:
+            cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {sql}', parameters)
+            plan: List[Tuple[str]] = cursor.fetchall()
+        for (line,) in plan:
+            self.stdout.write(f'    {line}')
+
+    @staticmethod
+    def _get_maximum_id(database: str, model: type) -> int:
+        with connections[database].cursor() as cursor:
+            cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {model._meta.db_table}')  # type: ignore
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def _execute(database: str, sql: str) -> None:
+        with connections[database].cursor() as cursor:
+            cursor.execute(sql)
@@ -0,0 +1,120 @@
+from copy import copy
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import List
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from common.helpers import deserialize_message
+from core.message_compression import compress_message_data
+from core.message_compression import decompress_message_data
+from core.message_compression import train_compression_dictionary
+from core.tests.utils import ConcentIntegrationTestCase
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares size and decoding time of serialized messages stored uncompressed, compressed without a dictionary '
+        'and compressed with a dictionary trained on similar messages. Messages are generated with the same helpers '
+        'as in tests. Database is not used.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--subtasks',
+            type=int,
+            default=250,
+            help='Number of subtasks to generate messages for. Half of them is used to train the dictionary.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        number_of_subtasks = max(options['subtasks'], 2)
+        training_messages = self._generate_serialized_messages(number_of_subtasks // 2)
+        benchmark_messages = self._generate_serialized_messages(number_of_subtasks - number_of_subtasks // 2)
+
+        dictionary_training_start = perf_counter()
+        dictionary = train_compression_dictionary(training_messages)
+        self.stdout.write(
+            f'Trained a dictionary of {len(dictionary)} bytes on {len(training_messages)} messages '
+            f'in {perf_counter() - dictionary_training_start:.2f} s.'
+        )
+
+        self._benchmark('Uncompressed', benchmark_messages, lambda data: data, lambda data: data)
+        self._benchmark(
+            'zlib',
+            benchmark_messages,
+            compress_message_data,
+            decompress_message_data,
+        )
+        self._benchmark(
+            'zlib with dictionary',
+            benchmark_messages,
+            lambda data: compress_message_data(data, dictionary),
+            lambda data: decompress_message_data(data, dictionary),
+        )
+
+    def _benchmark(
+        self,
+        name: str,
+        serialized_messages: List[bytes],
+        encode: Callable[[bytes], bytes],
+        decode: Callable[[bytes], bytes],
+    ) -> None:
+        encoded_messages = [encode(serialized_message) for serialized_message in serialized_messages]
+        assert [decode(encoded_message) for encoded_message in encoded_messages] == serialized_messages
+
+        decoding_start = perf_counter()
+        for encoded_message in encoded_messages:
+            decode(encoded_message)
+        decoding_time = perf_counter() - decoding_start
+
+        deserialization_start = perf_counter()
+        for encoded_message in encoded_messages:
+            deserialize_message(decode(encoded_message))
+        deserialization_time = perf_counter() - deserialization_start
+
+        original_size = sum(len(serialized_message) for serialized_message in serialized_messages)
+        encoded_size = sum(len(encoded_message) for encoded_message in encoded_messages)
+        self.stdout.write(
+            f'{name}: {encoded_size} bytes, compression ratio {original_size / encoded_size:.2f}, '
+            f'decoding {decoding_time / len(encoded_messages) * 10 ** 6:.1f} us per message, '
+            f'decoding and deserialization {deserialization_time / len(encoded_messages) * 10 ** 6:.1f} us per message'
+        )
+
+    @staticmethod
+    def _generate_serialized_messages(number_of_subtasks: int) -> List[bytes]:
+        """
+        Returns messages stored by Concent for subtasks going through the accept or reject results use case.
+        Each call uses different client keys, so that the dictionary is not benchmarked on keys it was trained on.
+        """
+        fixtures = ConcentIntegrationTestCase()
+        fixtures.setUp()
+
+        serialized_messages = []
+        for _ in range(number_of_subtasks):
+            task_to_compute = fixtures._get_deserialized_task_to_compute(  # pylint: disable=protected-access
+                task_id=str(uuid.uuid4()),
+                subtask_id=str(uuid.uuid4()),
+            )
+            report_computed_task = fixtures._get_deserialized_report_computed_task(  # pylint: disable=protected-access
+                task_to_compute=task_to_compute,
+            )
+            ack_report_computed_task = fixtures._get_deserialized_ack_report_computed_task(  # pylint: disable=protected-access
+                report_computed_task=report_computed_task,
+                signer_private_key=fixtures.REQUESTOR_PRIVATE_KEY,
+            )
+            subtask_results_accepted = fixtures._get_deserialized_subtask_results_accepted(  # pylint: disable=protected-access
+                report_computed_task=report_computed_task,
+            )
+            for golem_message in [
+                task_to_compute.want_to_compute_task,
+                task_to_compute,
+                report_computed_task,
+                ack_report_computed_task,
+                subtask_results_accepted,
+            ]:
+                serialized_messages.append(copy(golem_message).serialize())
+        return serialized_messages
@@ -0,0 +1,40 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandParser
+
+from core.model_helpers import correct_total_claimed
+from core.model_helpers import find_deposit_accounts_with_incorrect_total_claimed
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares DepositAccount.total_claimed with the actual sum of DepositClaims against each account and lists '
+        'accounts for which they differ. With --fix the totals are recalculated under a lock.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--fix',
+            action='store_true',
+            help='Set total_claimed of inconsistent accounts to the actual sum of their claims.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        inconsistent_accounts = find_deposit_accounts_with_incorrect_total_claimed()
+
+        for (deposit_account_id, total_claimed, sum_of_claims) in inconsistent_accounts:
+            self.stdout.write(
+                f'DepositAccount {deposit_account_id}: total_claimed is {total_claimed}, '
+                f'sum of claims is {sum_of_claims}.'
+            )
+            if options['fix']:
+                corrected_total = correct_total_claimed(deposit_account_id)
+                self.stdout.write(f'DepositAccount {deposit_account_id}: total_claimed set to {corrected_total}.')
+
+        if len(inconsistent_accounts) == 0:
+            self.stdout.write('total_claimed of all deposit accounts is consistent with their claims.')
+        elif not options['fix']:
+            self.stdout.write(self.style.ERROR(
+                f'Found {len(inconsistent_accounts)} inconsistent deposit accounts. Run with --fix to correct them.'
+            ))
@@ -0,0 +1,19 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core.constants import STORED_MESSAGE_DATA_DELETION_BATCH_SIZE
+from core.model_helpers import delete_unreferenced_stored_message_data
+
+
+class Command(BaseCommand):
+    help = 'Deletes serialized messages which are no longer referenced by any StoredMessage.'
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        total_number_of_deleted_objects = 0
+        while True:
+            number_of_deleted_objects = delete_unreferenced_stored_message_data(STORED_MESSAGE_DATA_DELETION_BATCH_SIZE)
+            if number_of_deleted_objects == 0:
+                break
+            total_number_of_deleted_objects += number_of_deleted_objects
+        self.stdout.write(f'Deleted {total_number_of_deleted_objects} unreferenced serialized messages.')
@@ -0,0 +1,21 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from core.receive_cache import get_receive_cache_statistics
+
+
+class Command(BaseCommand):
+    help = 'Shows how many requests to `receive` endpoint were answered without querying the database.'
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        statistics = get_receive_cache_statistics()
+        if len(statistics) == 0:
+            self.stdout.write('Receive cache is disabled. Set RECEIVE_CACHE_ALIAS to enable it.')
+            return
+
+        hit_rate = statistics['hits'] / statistics['requests'] if statistics['requests'] > 0 else 0.0
+        self.stdout.write(
+            f"Hits: {statistics['hits']}, misses: {statistics['misses']}, "
+            f"database round-trips avoided: {hit_rate:.1%}"
+        )
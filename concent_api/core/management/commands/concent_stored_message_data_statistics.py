@@ -0,0 +1,40 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.db.models import Count
+from django.db.models import Func
+from django.db.models import IntegerField
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from core.models import StoredMessage
+from core.models import StoredMessageData
+
+
+class OctetLength(Func):
+    function = 'OCTET_LENGTH'
+    output_field = IntegerField()
+
+
+class Command(BaseCommand):
+    help = 'Shows how much space is saved by storing identical serialized messages only once.'
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        referenced = StoredMessage.objects.aggregate(
+            count=Count('pk'),
+            size=Coalesce(Sum(OctetLength('message_data__data')), 0),
+        )
+        stored = StoredMessageData.objects.aggregate(
+            count=Count('pk'),
+            size=Coalesce(Sum(OctetLength('data')), 0),
+        )
+        unreferenced_count = StoredMessageData.objects.filter(stored_messages__isnull=True).count()
+
+        saved_size = referenced['size'] - stored['size']
+        saved_fraction = saved_size / referenced['size'] if referenced['size'] > 0 else 0.0
+        self.stdout.write(
+            f"Stored messages: {referenced['count']}, {referenced['size']} bytes of stored data\n"
+            f"Distinct serialized messages: {stored['count']}, {stored['size']} bytes "
+            f"({unreferenced_count} no longer referenced)\n"
+            f"Space saved: {saved_size} bytes ({saved_fraction:.1%})"
+        )
@@ -0,0 +1,76 @@
+from typing import Any
+from typing import List
+from typing import Optional
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.core.management.base import CommandParser
+
+from core.constants import MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE
+from core.message_compression import compress_message_data
+from core.message_compression import train_compression_dictionary
+from core.models import MessageCompressionDictionary
+from core.models import StoredMessageData
+
+
+class Command(BaseCommand):
+    help = (
+        'Trains a compression dictionary on a random sample of stored messages and makes it the one used for newly '
+        'stored messages. Messages stored earlier remain compressed with the dictionary they were compressed with.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--sample-size',
+            type=int,
+            default=1000,
+            help='Number of stored messages the dictionary is trained on.',
+        )
+        parser.add_argument(
+            '--dictionary-size',
+            type=int,
+            default=MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE,
+            help=f'Maximum size of the dictionary in bytes. Cannot exceed {MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE}.',
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if not 0 < options['dictionary_size'] <= MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE:
+            raise CommandError(f'Dictionary size must be between 1 and {MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE}.')
+
+        samples = [
+            bytes(stored_message_data.decompressed_data)
+            for stored_message_data in StoredMessageData.objects.order_by('?')[:options['sample_size']]
+        ]
+        if len(samples) < 2:
+            raise CommandError('At least two stored messages are needed to train a dictionary.')
+
+        dictionary = train_compression_dictionary(samples, options['dictionary_size'])
+        if len(dictionary) == 0:
+            raise CommandError('Sampled messages have nothing in common. Try a larger sample.')
+        latest_dictionary_id = MessageCompressionDictionary.objects.get_latest_dictionary_id()
+        latest_dictionary = (
+            MessageCompressionDictionary.objects.get_dictionary_data(latest_dictionary_id)
+            if latest_dictionary_id is not None else None
+        )
+
+        self.stdout.write(f'Trained a dictionary of {len(dictionary)} bytes on {len(samples)} messages.')
+        self.stdout.write(f'Compression ratio on the sample without dictionary: {self._get_compression_ratio(samples, None):.2f}')
+        if latest_dictionary is not None:
+            self.stdout.write(
+                f'Compression ratio on the sample with the current dictionary: '
+                f'{self._get_compression_ratio(samples, latest_dictionary):.2f}'
+            )
+        self.stdout.write(
+            f'Compression ratio on the sample with the new dictionary: {self._get_compression_ratio(samples, dictionary):.2f}'
+        )
+
+        new_dictionary = MessageCompressionDictionary(data=dictionary)
+        new_dictionary.full_clean()
+        new_dictionary.save()
+        self.stdout.write(f'Saved the dictionary with id {new_dictionary.pk}.')
+
+    @staticmethod
+    def _get_compression_ratio(samples: List[bytes], dictionary: Optional[bytes]) -> float:
+        # Messages are never stored compressed if it makes them larger.
+        compressed_size = sum(min(len(compress_message_data(sample, dictionary)), len(sample)) for sample in samples)
+        return sum(len(sample) for sample in samples) / compressed_size
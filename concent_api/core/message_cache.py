@@ -0,0 +1,91 @@
+from collections import OrderedDict
+from logging import getLogger
+from typing import Optional
+import threading
+
+from django.db.models import Model
+from golem_messages import message
+
+from common.helpers import deserialize_message
+from core.constants import DESERIALIZED_MESSAGE_CACHE_MAXIMUM_SIZE
+
+logger = getLogger(__name__)
+
+
+class DeserializedMessageCache:
+    """
+    Keeps deserialized StoredMessages by their primary key, so that the same message is not deserialized many times
+    while handling a single request or task. StoredMessages are never modified after being stored, so a cached message
+    never becomes stale. Cached messages are shared and must not be modified.
+    When the cache is full, the least recently used message is evicted.
+    """
+
+    def __init__(self, maximum_size: int = DESERIALIZED_MESSAGE_CACHE_MAXIMUM_SIZE) -> None:
+        assert maximum_size > 0
+        self.maximum_size = maximum_size
+        self.hits = 0
+        self.misses = 0
+        self._messages: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __contains__(self, stored_message_id: int) -> bool:
+        return stored_message_id in self._messages
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses > 0 else 0.0
+
+    def get(self, stored_message_id: int) -> Optional[message.Message]:
+        if stored_message_id not in self._messages:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._messages.move_to_end(stored_message_id)
+        return self._messages[stored_message_id]
+
+    def add(self, stored_message_id: int, golem_message: message.Message) -> None:
+        assert stored_message_id is not None
+        self._messages[stored_message_id] = golem_message
+        self._messages.move_to_end(stored_message_id)
+        if len(self._messages) > self.maximum_size:
+            self._messages.popitem(last=False)
+
+    def clear(self) -> None:
+        self._messages.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_thread_local = threading.local()
+
+
+def get_deserialized_message_cache() -> DeserializedMessageCache:
+    """ Returns the cache of the current thread. Each thread handles at most one request or task at a time. """
+    if not hasattr(_thread_local, 'deserialized_message_cache'):
+        _thread_local.deserialized_message_cache = DeserializedMessageCache()
+    return _thread_local.deserialized_message_cache
+
+
+def reset_deserialized_message_cache(scope_name: str) -> None:
+    """ Must be called at the end of every request and task, so that messages are not kept longer than needed. """
+    cache = get_deserialized_message_cache()
+    if cache.hits + cache.misses > 0:
+        logger.debug(
+            f'Deserialized message cache in {scope_name}: {cache.hits} hits, {cache.misses} misses, '
+            f'hit rate {cache.hit_rate:.0%}.'
+        )
+    cache.clear()
+
+
+def deserialize_stored_message(stored_message: Model) -> message.Message:
+    """ Returns deserialized StoredMessage, deserializing it only if it is not present in the cache. """
+    cache = get_deserialized_message_cache()
+    golem_message = cache.get(stored_message.pk)
+    if golem_message is None:
+        # Depending on the database backend, binary data can be returned either as bytes or as memoryview.
+        golem_message = deserialize_message(bytes(stored_message.data))
+        cache.add(stored_message.pk, golem_message)
+    return golem_message
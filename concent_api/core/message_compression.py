@@ -0,0 +1,70 @@
+from collections import Counter
+from typing import List
+from typing import Optional
+import zlib
+
+from core.constants import MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE
+from core.constants import MESSAGE_COMPRESSION_DICTIONARY_SEGMENT_LENGTH
+from core.constants import MESSAGE_COMPRESSION_LEVEL
+
+
+def compress_message_data(data: bytes, dictionary: Optional[bytes] = None) -> bytes:
+    compressor = (
+        zlib.compressobj(MESSAGE_COMPRESSION_LEVEL, zdict=dictionary)
+        if dictionary is not None else
+        zlib.compressobj(MESSAGE_COMPRESSION_LEVEL)
+    )
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress_message_data(data: bytes, dictionary: Optional[bytes] = None) -> bytes:
+    decompressor = zlib.decompressobj(zdict=dictionary) if dictionary is not None else zlib.decompressobj()
+    return decompressor.decompress(data) + decompressor.flush()
+
+
+def train_compression_dictionary(
+    samples: List[bytes],
+    dictionary_size: int = MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE,
+    segment_length: int = MESSAGE_COMPRESSION_DICTIONARY_SEGMENT_LENGTH,
+) -> bytes:
+    """
+    Builds a compression dictionary out of byte sequences repeated across samples. Each sample is split into maximal
+    runs of bytes covered by segments which occur in more than one sample. Runs which also occur in more than one
+    sample are chosen by the number of bytes they would let compressor reference, until dictionary is full. zlib treats the dictionary as data preceding the
+    compressed one, so the most valuable runs are placed at its end, where references to them are the shortest.
+    """
+    assert 0 < dictionary_size <= MESSAGE_COMPRESSION_DICTIONARY_MAXIMUM_SIZE
+    assert segment_length > 0
+
+    # Number of samples each segment occurs in.
+    segment_frequencies: Counter = Counter()
+    for sample in samples:
+        segment_frequencies.update({sample[i:i + segment_length] for i in range(len(sample) - segment_length + 1)})
+
+    # Number of samples each run occurs in.
+    run_frequencies: Counter = Counter()
+    for sample in samples:
+        runs = set()
+        run_start: Optional[int] = None
+        for i in range(len(sample) - segment_length + 1):
+            if segment_frequencies[sample[i:i + segment_length]] > 1:
+                if run_start is None:
+                    run_start = i
+            elif run_start is not None:
+                runs.add(sample[run_start:i - 1 + segment_length])
+                run_start = None
+        if run_start is not None:
+            runs.add(sample[run_start:])
+        run_frequencies.update(runs)
+
+    selected_runs: List[bytes] = []
+    selected_size = 0
+    for run in sorted(run_frequencies, key=lambda run: run_frequencies[run] * len(run), reverse=True):
+        if run_frequencies[run] < 2 or selected_size + len(run) > dictionary_size:
+            continue
+        if any(run in selected_run for selected_run in selected_runs):
+            continue
+        selected_runs.append(run)
+        selected_size += len(run)
+
+    return b''.join(reversed(selected_runs))
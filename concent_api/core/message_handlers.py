@@ -2,6 +2,7 @@ from base64 import b64encode
 from collections import Counter
 from logging import getLogger
 from typing import Any
+from typing import List
 from typing import Optional
 from typing import Tuple
 from typing import Union
@@ -10,7 +11,9 @@ from copy import copy
 from django.conf import settings
 from django.core.mail import mail_admins
 from django.db import IntegrityError
+from django.db.models import Q
 from django.http import HttpResponse
+from django.utils import timezone
 
 from constance import config
 
@@ -34,7 +37,6 @@ from common.constants import ErrorCode
 
 from common.exceptions import ConcentInSoftShutdownMode
 from common.decorators import non_nesting_atomic
-from common.helpers import deserialize_message
 from common.helpers import get_current_utc_timestamp
 from common.helpers import get_storage_result_file_path
 from common.helpers import parse_datetime_to_timestamp
@@ -57,6 +59,8 @@ from core.models import PendingResponse
 from core.models import StoredMessage
 from core.models import Subtask
 from core.model_helpers import get_one_or_none
+from core.message_cache import deserialize_stored_message
+from core.message_cache import get_deserialized_message_cache
 from core.payments import bankster
 from core.queue_operations import send_blender_verification_request
 from core.subtask_helpers import are_keys_and_addresses_unique_in_message_subtask_results_accepted
@@ -205,11 +209,11 @@ def handle_send_ack_report_computed_task(client_message: message.tasks.AckReport
                 )
             validate_all_messages_identical([
                 task_to_compute,
-                deserialize_message(subtask.task_to_compute.data.tobytes()),
+                deserialize_stored_message(subtask.task_to_compute),
             ])
             report_computed_task = substitute_new_report_computed_task_if_needed(
                 report_computed_task_from_acknowledgement=report_computed_task,
-                stored_report_computed_task=deserialize_message(subtask.report_computed_task.data.tobytes()),
+                stored_report_computed_task=deserialize_stored_message(subtask.report_computed_task),
             )
 
             subtask = update_and_return_updated_subtask(
@@ -327,7 +331,7 @@ def handle_send_reject_report_computed_task(client_message: message.tasks.Reject
         validate_all_messages_identical(
             [
                 task_to_compute,
-                deserialize_message(subtask.task_to_compute.data.tobytes()),
+                deserialize_stored_message(subtask.task_to_compute),
             ]
         )
 
@@ -358,7 +362,7 @@ def handle_send_reject_report_computed_task(client_message: message.tasks.Reject
             )
             return HttpResponse("", status=202)
 
-        deserialized_message = deserialize_message(subtask.task_to_compute.data.tobytes())
+        deserialized_message = deserialize_stored_message(subtask.task_to_compute)
 
         if get_current_utc_timestamp() <= deserialized_message.compute_task_def['deadline'] + settings.CONCENT_MESSAGING_TIME:
             if subtask.ack_report_computed_task_id is not None or subtask.ack_report_computed_task_id is not None:
@@ -470,7 +474,7 @@ def handle_send_force_get_task_result(
             if task_to_compute is not None and subtask.task_to_compute is not None:
                 validate_all_messages_identical([
                     task_to_compute,
-                    deserialize_message(subtask.task_to_compute.data.tobytes()),
+                    deserialize_stored_message(subtask.task_to_compute),
                 ])
             subtask = update_and_return_updated_subtask(
                 subtask=subtask,
@@ -611,7 +615,7 @@ def handle_send_force_subtask_results(
             if task_to_compute is not None and subtask.task_to_compute is not None:
                 validate_all_messages_identical([
                     task_to_compute,
-                    deserialize_message(subtask.task_to_compute.data.tobytes()),
+                    deserialize_stored_message(subtask.task_to_compute),
                 ])
             subtask = update_and_return_updated_subtask(
                 subtask=subtask,
@@ -720,7 +724,7 @@ def handle_send_force_subtask_results_response(
 
         validate_all_messages_identical([
             task_to_compute,
-            deserialize_message(subtask.task_to_compute.data.tobytes()),
+            deserialize_stored_message(subtask.task_to_compute),
         ])
 
         delete_deposit_claim(
@@ -961,220 +965,292 @@ def store_subtask(
         raise CreateModelIntegrityError
 
 
+# Related objects needed to build the message delivered to the client, for each type of PendingResponse.
+# Serialized data of StoredMessages is kept in a separate table, so it has to be listed explicitly.
+RELATED_OBJECTS_FOR_RESPONSE_TYPE = {
+    PendingResponse.ResponseType.ForceReportComputedTask: ('subtask__report_computed_task__message_data',),
+    PendingResponse.ResponseType.ForceReportComputedTaskResponse: (
+        'subtask__report_computed_task__message_data',
+        'subtask__ack_report_computed_task__message_data',
+        'subtask__reject_report_computed_task__message_data',
+    ),
+    PendingResponse.ResponseType.VerdictReportComputedTask: ('subtask__report_computed_task__message_data',),
+    PendingResponse.ResponseType.ForceGetTaskResultFailed: ('subtask__task_to_compute__message_data',),
+    PendingResponse.ResponseType.ForceGetTaskResultUpload: ('subtask__force_get_task_result__message_data',),
+    PendingResponse.ResponseType.ForceGetTaskResultDownload: ('subtask__force_get_task_result__message_data',),
+    PendingResponse.ResponseType.ForceSubtaskResults: ('subtask__ack_report_computed_task__message_data',),
+    PendingResponse.ResponseType.SubtaskResultsSettled: ('subtask__task_to_compute__message_data',),
+    PendingResponse.ResponseType.ForceSubtaskResultsResponse: (
+        'subtask__subtask_results_accepted__message_data',
+        'subtask__subtask_results_rejected__message_data',
+    ),
+    PendingResponse.ResponseType.SubtaskResultsRejected: ('subtask__report_computed_task__message_data',),
+    PendingResponse.ResponseType.ForcePaymentCommitted: ('payment_info',),
+}
+
+assert set(RELATED_OBJECTS_FOR_RESPONSE_TYPE) == set(PendingResponse.ResponseType)
+
+
+def get_undelivered_pending_responses_for_update(client_public_key: bytes, limit: int) -> List[PendingResponse]:
+    """
+    Locks and returns up to `limit` oldest undelivered PendingResponses of the client which can be delivered in the
+    protocol version supported by Concent, ordered by creation time. Related objects needed to build messages from
+    them are fetched in the same query. Must be called in a transaction.
+    """
+    assert isinstance(limit, int) and limit > 0
+
+    oldest_pending_responses = PendingResponse.objects.filter(
+        Q(payment_info__isnull=False) | Q(subtask__protocol_version=settings.MAJOR_MINOR_GOLEM_MESSAGES_VERSION),
+        client__public_key=b64encode(client_public_key),
+        delivered=False,
+    ).order_by('created_at').values('pk')[:limit]
+
+    # PostgreSQL does not allow FOR UPDATE on the nullable side of an outer join and Django does not allow limiting
+    # it to a single table, so rows are locked by a query without joins. Condition on `delivered` is checked again
+    # after acquiring the lock, in case the row was delivered by a concurrent request in the meantime.
+    locked_pending_responses = list(
+        PendingResponse.objects.select_for_update().filter(
+            pk__in=oldest_pending_responses,
+            delivered=False,
+        ).values_list('pk', 'response_type')
+    )
+    if len(locked_pending_responses) == 0:
+        return []
+
+    related_objects = {
+        related_object
+        for (_, response_type) in locked_pending_responses
+        for related_object in RELATED_OBJECTS_FOR_RESPONSE_TYPE[PendingResponse.ResponseType[response_type]]
+    }
+    return list(
+        PendingResponse.objects.select_related(*related_objects).filter(
+            pk__in=[pk for (pk, _) in locked_pending_responses],
+        ).order_by('created_at')
+    )
+
+
 def handle_messages_from_database(client_public_key: bytes) -> Union[message.Message, None]:
     assert client_public_key not in ['', None]
-    encoded_client_public_key = b64encode(client_public_key)
     with non_nesting_atomic(using='control'):
-        payments_info_response = PendingResponse.objects.select_for_update().filter(
-            payment_info__isnull=False,
-            client__public_key=encoded_client_public_key,
-            delivered=False,
-        ).order_by('created_at').first()
+        pending_responses = get_undelivered_pending_responses_for_update(client_public_key, limit=1)
+        if len(pending_responses) == 0:
+            return None
 
-        subtask_response = PendingResponse.objects.select_for_update().filter(
-            subtask__protocol_version=settings.MAJOR_MINOR_GOLEM_MESSAGES_VERSION,
-            client__public_key=encoded_client_public_key,
-            delivered=False,
-        ).order_by('created_at').first()
-        if payments_info_response is not None and subtask_response is not None:
-            if payments_info_response.created_at > subtask_response.created_at:
-                pending_response = payments_info_response
-            else:
-                pending_response = subtask_response
-        else:
-            pending_response = subtask_response or payments_info_response
-            if not pending_response:
-                return None
+        response_to_client = create_response_to_client(pending_responses[0], client_public_key)
+        if response_to_client is not None:
+            mark_messages_as_delivered_and_log(pending_responses, [response_to_client], client_public_key)
+        return response_to_client
+
+
+def handle_messages_from_database_in_batch(client_public_key: bytes, batch_size: int) -> List[message.Message]:
+    """
+    Returns up to `batch_size` oldest messages pending for the client, ordered by creation time.
+    All returned messages are marked as delivered with a single query in the same transaction in which they were locked.
+    """
+    assert client_public_key not in ['', None]
+    assert isinstance(batch_size, int) and batch_size > 0
+    with non_nesting_atomic(using='control'):
+        pending_responses = get_undelivered_pending_responses_for_update(client_public_key, limit=batch_size)
+
+        delivered_pending_responses = []
+        responses_to_client = []
+        for pending_response in pending_responses:
+            response_to_client = create_response_to_client(pending_response, client_public_key)
+            if response_to_client is not None:
+                delivered_pending_responses.append(pending_response)
+                responses_to_client.append(response_to_client)
+
+        mark_messages_as_delivered_and_log(delivered_pending_responses, responses_to_client, client_public_key)
+    return responses_to_client
 
-        assert pending_response.response_type_enum in set(PendingResponse.ResponseType)
 
-        if pending_response.response_type == PendingResponse.ResponseType.ForceReportComputedTask.name:  # pylint: disable=no-member
-            report_computed_task = deserialize_message(pending_response.subtask.report_computed_task.data.tobytes())
-            response_to_client = message.concents.ForceReportComputedTask(
-                report_computed_task=report_computed_task
+def create_response_to_client(
+    pending_response: PendingResponse,
+    client_public_key: bytes,
+) -> Union[message.Message, None]:
+    """
+    Builds the message which should be delivered to the client for given PendingResponse.
+    Returns None if PendingResponse cannot be turned into a message.
+    """
+    assert pending_response.response_type_enum in set(PendingResponse.ResponseType)
+
+    if pending_response.response_type == PendingResponse.ResponseType.ForceReportComputedTask.name:  # pylint: disable=no-member
+        report_computed_task = deserialize_stored_message(pending_response.subtask.report_computed_task)
+        response_to_client = message.concents.ForceReportComputedTask(
+            report_computed_task=report_computed_task
+        )
+        return response_to_client
+
+    elif pending_response.response_type == PendingResponse.ResponseType.ForceReportComputedTaskResponse.name:  # pylint: disable=no-member
+        if pending_response.subtask.ack_report_computed_task is not None:
+            ack_report_computed_task = deserialize_stored_message(pending_response.subtask.ack_report_computed_task)
+            response_to_client = message.concents.ForceReportComputedTaskResponse(
+                ack_report_computed_task=ack_report_computed_task,
+                reason=message.concents.ForceReportComputedTaskResponse.REASON.AckFromRequestor,
             )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
             return response_to_client
 
-        elif pending_response.response_type == PendingResponse.ResponseType.ForceReportComputedTaskResponse.name:  # pylint: disable=no-member
-            if pending_response.subtask.ack_report_computed_task is not None:
-                ack_report_computed_task = deserialize_message(
-                    pending_response.subtask.ack_report_computed_task.data.tobytes()
-                )
-                response_to_client = message.concents.ForceReportComputedTaskResponse(
-                    ack_report_computed_task=ack_report_computed_task,
-                    reason=message.concents.ForceReportComputedTaskResponse.REASON.AckFromRequestor,
-                )
-                mark_message_as_delivered_and_log(pending_response, response_to_client)
-                return response_to_client
-
-            elif pending_response.subtask.reject_report_computed_task is not None:
-                reject_report_computed_task = deserialize_message(
-                    pending_response.subtask.reject_report_computed_task.data.tobytes()
-                )
-                response_to_client = message.concents.ForceReportComputedTaskResponse(
-                    reject_report_computed_task=reject_report_computed_task,
-                    reason=message.concents.ForceReportComputedTaskResponse.REASON.RejectFromRequestor,
-                )
-                if reject_report_computed_task.reason == message.tasks.RejectReportComputedTask.REASON.SubtaskTimeLimitExceeded:
-                    ack_report_computed_task = message.tasks.AckReportComputedTask(
-                        report_computed_task=deserialize_message(
-                            pending_response.subtask.report_computed_task.data.tobytes()
-                        ),
-                    )
-                    sign_message(ack_report_computed_task, settings.CONCENT_PRIVATE_KEY)
-                    response_to_client = message.concents.ForceReportComputedTaskResponse(
-                        ack_report_computed_task=ack_report_computed_task,
-                        reason=message.concents.ForceReportComputedTaskResponse.REASON.ConcentAck,
-                    )
-                mark_message_as_delivered_and_log(pending_response, response_to_client)
-                return response_to_client
-            else:
+        elif pending_response.subtask.reject_report_computed_task is not None:
+            reject_report_computed_task = deserialize_stored_message(pending_response.subtask.reject_report_computed_task)
+            response_to_client = message.concents.ForceReportComputedTaskResponse(
+                reject_report_computed_task=reject_report_computed_task,
+                reason=message.concents.ForceReportComputedTaskResponse.REASON.RejectFromRequestor,
+            )
+            if reject_report_computed_task.reason == message.tasks.RejectReportComputedTask.REASON.SubtaskTimeLimitExceeded:
                 ack_report_computed_task = message.tasks.AckReportComputedTask(
-                    report_computed_task=deserialize_message(
-                        pending_response.subtask.report_computed_task.data.tobytes()),
+                    report_computed_task=deserialize_stored_message(pending_response.subtask.report_computed_task),
                 )
                 sign_message(ack_report_computed_task, settings.CONCENT_PRIVATE_KEY)
                 response_to_client = message.concents.ForceReportComputedTaskResponse(
                     ack_report_computed_task=ack_report_computed_task,
                     reason=message.concents.ForceReportComputedTaskResponse.REASON.ConcentAck,
                 )
-                mark_message_as_delivered_and_log(pending_response, response_to_client)
-                return response_to_client
-
-        elif pending_response.response_type == PendingResponse.ResponseType.VerdictReportComputedTask.name:  # pylint: disable=no-member
+            return response_to_client
+        else:
             ack_report_computed_task = message.tasks.AckReportComputedTask(
-                report_computed_task=deserialize_message(pending_response.subtask.report_computed_task.data.tobytes()),
+                report_computed_task=deserialize_stored_message(pending_response.subtask.report_computed_task),
             )
             sign_message(ack_report_computed_task, settings.CONCENT_PRIVATE_KEY)
-            report_computed_task     = deserialize_message(pending_response.subtask.report_computed_task.data.tobytes())
-            response_to_client = message.concents.VerdictReportComputedTask(
-                ack_report_computed_task    = ack_report_computed_task,
-                force_report_computed_task  = message.concents.ForceReportComputedTask(
-                    report_computed_task = report_computed_task,
-                ),
-            )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
-            return response_to_client
-
-        elif pending_response.response_type == PendingResponse.ResponseType.ForceGetTaskResultFailed.name:  # pylint: disable=no-member
-            task_to_compute = deserialize_message(pending_response.subtask.task_to_compute.data.tobytes())
-            response_to_client = message.concents.ForceGetTaskResultFailed(
-                task_to_compute = task_to_compute,
+            response_to_client = message.concents.ForceReportComputedTaskResponse(
+                ack_report_computed_task=ack_report_computed_task,
+                reason=message.concents.ForceReportComputedTaskResponse.REASON.ConcentAck,
             )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
             return response_to_client
 
-        elif pending_response.response_type == PendingResponse.ResponseType.ForceGetTaskResultUpload.name:  # pylint: disable=no-member
-            force_get_task_result = deserialize_message(pending_response.subtask.force_get_task_result.data.tobytes())
-            file_transfer_token = create_file_transfer_token_for_golem_client(
-                force_get_task_result.report_computed_task,
-                client_public_key,
-                FileTransferToken.Operation.upload,
-            )
-
-            response_to_client = message.concents.ForceGetTaskResultUpload(
-                file_transfer_token=file_transfer_token,
-                force_get_task_result=force_get_task_result,
-            )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
-            return response_to_client
+    elif pending_response.response_type == PendingResponse.ResponseType.VerdictReportComputedTask.name:  # pylint: disable=no-member
+        ack_report_computed_task = message.tasks.AckReportComputedTask(
+            report_computed_task=deserialize_stored_message(pending_response.subtask.report_computed_task),
+        )
+        sign_message(ack_report_computed_task, settings.CONCENT_PRIVATE_KEY)
+        report_computed_task     = deserialize_stored_message(pending_response.subtask.report_computed_task)
+        response_to_client = message.concents.VerdictReportComputedTask(
+            ack_report_computed_task    = ack_report_computed_task,
+            force_report_computed_task  = message.concents.ForceReportComputedTask(
+                report_computed_task = report_computed_task,
+            ),
+        )
+        return response_to_client
 
-        elif pending_response.response_type == PendingResponse.ResponseType.ForceGetTaskResultDownload.name:  # pylint: disable=no-member
-            force_get_task_result = deserialize_message(pending_response.subtask.force_get_task_result.data.tobytes())
-            file_transfer_token  = create_file_transfer_token_for_golem_client(
-                force_get_task_result.report_computed_task,
-                client_public_key,
-                FileTransferToken.Operation.download,
-            )
+    elif pending_response.response_type == PendingResponse.ResponseType.ForceGetTaskResultFailed.name:  # pylint: disable=no-member
+        task_to_compute = deserialize_stored_message(pending_response.subtask.task_to_compute)
+        response_to_client = message.concents.ForceGetTaskResultFailed(
+            task_to_compute = task_to_compute,
+        )
+        return response_to_client
+
+    elif pending_response.response_type == PendingResponse.ResponseType.ForceGetTaskResultUpload.name:  # pylint: disable=no-member
+        force_get_task_result = deserialize_stored_message(pending_response.subtask.force_get_task_result)
+        file_transfer_token = create_file_transfer_token_for_golem_client(
+            force_get_task_result.report_computed_task,
+            client_public_key,
+            FileTransferToken.Operation.upload,
+        )
 
-            response_to_client = message.concents.ForceGetTaskResultDownload(
-                file_transfer_token=file_transfer_token,
-                force_get_task_result=force_get_task_result,
-            )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
-            return response_to_client
+        response_to_client = message.concents.ForceGetTaskResultUpload(
+            file_transfer_token=file_transfer_token,
+            force_get_task_result=force_get_task_result,
+        )
+        return response_to_client
+
+    elif pending_response.response_type == PendingResponse.ResponseType.ForceGetTaskResultDownload.name:  # pylint: disable=no-member
+        force_get_task_result = deserialize_stored_message(pending_response.subtask.force_get_task_result)
+        file_transfer_token  = create_file_transfer_token_for_golem_client(
+            force_get_task_result.report_computed_task,
+            client_public_key,
+            FileTransferToken.Operation.download,
+        )
 
-        elif pending_response.response_type == PendingResponse.ResponseType.ForceSubtaskResults.name:  # pylint: disable=no-member
-            ack_report_computed_task = deserialize_message(pending_response.subtask.ack_report_computed_task.data.tobytes())
-            response_to_client = message.concents.ForceSubtaskResults(
-                ack_report_computed_task = ack_report_computed_task
-            )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
-            return response_to_client
+        response_to_client = message.concents.ForceGetTaskResultDownload(
+            file_transfer_token=file_transfer_token,
+            force_get_task_result=force_get_task_result,
+        )
+        return response_to_client
 
-        elif pending_response.response_type == PendingResponse.ResponseType.SubtaskResultsSettled.name:  # pylint: disable=no-member
-            task_to_compute = deserialize_message(pending_response.subtask.task_to_compute.data.tobytes())
-            response_to_client = message.concents.SubtaskResultsSettled(
-                origin=message.concents.SubtaskResultsSettled.Origin.ResultsRejected,
-                task_to_compute=task_to_compute,
-            )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
-            return response_to_client
+    elif pending_response.response_type == PendingResponse.ResponseType.ForceSubtaskResults.name:  # pylint: disable=no-member
+        ack_report_computed_task = deserialize_stored_message(pending_response.subtask.ack_report_computed_task)
+        response_to_client = message.concents.ForceSubtaskResults(
+            ack_report_computed_task = ack_report_computed_task
+        )
+        return response_to_client
 
-        elif pending_response.response_type == PendingResponse.ResponseType.ForceSubtaskResultsResponse.name:  # pylint: disable=no-member
-            subtask_results_accepted = pending_response.subtask.subtask_results_accepted
-            subtask_results_rejected = pending_response.subtask.subtask_results_rejected
+    elif pending_response.response_type == PendingResponse.ResponseType.SubtaskResultsSettled.name:  # pylint: disable=no-member
+        task_to_compute = deserialize_stored_message(pending_response.subtask.task_to_compute)
+        response_to_client = message.concents.SubtaskResultsSettled(
+            origin=message.concents.SubtaskResultsSettled.Origin.ResultsRejected,
+            task_to_compute=task_to_compute,
+        )
+        return response_to_client
 
-            assert (subtask_results_rejected is None and subtask_results_accepted is not None) or \
-                   (subtask_results_accepted is None and subtask_results_rejected is not None)
+    elif pending_response.response_type == PendingResponse.ResponseType.ForceSubtaskResultsResponse.name:  # pylint: disable=no-member
+        subtask_results_accepted = pending_response.subtask.subtask_results_accepted
+        subtask_results_rejected = pending_response.subtask.subtask_results_rejected
 
-            if subtask_results_accepted is not None:
-                response_to_client = message.concents.ForceSubtaskResultsResponse(
-                    subtask_results_accepted=deserialize_message(subtask_results_accepted.data.tobytes()),
-                )
-            else:
-                response_to_client = message.concents.ForceSubtaskResultsResponse(
-                    subtask_results_rejected=deserialize_message(subtask_results_rejected.data.tobytes()),  # type: ignore
-                )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
-            return response_to_client
+        assert (subtask_results_rejected is None and subtask_results_accepted is not None) or \
+               (subtask_results_accepted is None and subtask_results_rejected is not None)
 
-        elif pending_response.response_type == PendingResponse.ResponseType.SubtaskResultsRejected.name:  # pylint: disable=no-member
-            report_computed_task = deserialize_message(pending_response.subtask.report_computed_task.data.tobytes())
-            response_to_client = message.tasks.SubtaskResultsRejected(
-                reason=message.tasks.SubtaskResultsRejected.REASON.ConcentResourcesFailure,
-                report_computed_task=report_computed_task
+        if subtask_results_accepted is not None:
+            response_to_client = message.concents.ForceSubtaskResultsResponse(
+                subtask_results_accepted=deserialize_stored_message(subtask_results_accepted),
             )
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
-            return response_to_client
+        else:
+            response_to_client = message.concents.ForceSubtaskResultsResponse(
+                subtask_results_rejected=deserialize_stored_message(subtask_results_rejected),  # type: ignore
+            )
+        return response_to_client
 
-        elif pending_response.response_type_enum == PendingResponse.ResponseType.ForcePaymentCommitted:
-            payment_message = pending_response.payment_info
+    elif pending_response.response_type == PendingResponse.ResponseType.SubtaskResultsRejected.name:  # pylint: disable=no-member
+        report_computed_task = deserialize_stored_message(pending_response.subtask.report_computed_task)
+        response_to_client = message.tasks.SubtaskResultsRejected(
+            reason=message.tasks.SubtaskResultsRejected.REASON.ConcentResourcesFailure,
+            report_computed_task=report_computed_task
+        )
+        return response_to_client
 
-            response_to_client = message.concents.ForcePaymentCommitted(
-                payment_ts=parse_datetime_to_timestamp(payment_message.payment_ts),
-                task_owner_key=payment_message.task_owner_key.tobytes(),
-                provider_eth_account=payment_message.provider_eth_account,
-                amount_paid=payment_message.amount_paid_as_int,
-                amount_pending=payment_message.amount_pending_as_int,
-            )
-            if payment_message.recipient_type == PaymentInfo.RecipientType.Requestor.name:  # pylint: disable=no-member
-                response_to_client.recipient_type = message.concents.ForcePaymentCommitted.Actor.Requestor
-            elif payment_message.recipient_type == PaymentInfo.RecipientType.Provider.name:  # pylint: disable=no-member
-                response_to_client.recipient_type = message.concents.ForcePaymentCommitted.Actor.Provider
-            else:
-                return None
-            mark_message_as_delivered_and_log(pending_response, response_to_client)
-            return response_to_client
+    elif pending_response.response_type_enum == PendingResponse.ResponseType.ForcePaymentCommitted:
+        payment_message = pending_response.payment_info
 
+        response_to_client = message.concents.ForcePaymentCommitted(
+            payment_ts=parse_datetime_to_timestamp(payment_message.payment_ts),
+            task_owner_key=payment_message.task_owner_key.tobytes(),
+            provider_eth_account=payment_message.provider_eth_account,
+            amount_paid=payment_message.amount_paid_as_int,
+            amount_pending=payment_message.amount_pending_as_int,
+        )
+        if payment_message.recipient_type == PaymentInfo.RecipientType.Requestor.name:  # pylint: disable=no-member
+            response_to_client.recipient_type = message.concents.ForcePaymentCommitted.Actor.Requestor
+        elif payment_message.recipient_type == PaymentInfo.RecipientType.Provider.name:  # pylint: disable=no-member
+            response_to_client.recipient_type = message.concents.ForcePaymentCommitted.Actor.Provider
         else:
             return None
+        return response_to_client
 
+    else:
+        return None
 
-def mark_message_as_delivered_and_log(undelivered_message: PendingResponse, log_message: message.Message) -> None:
-    undelivered_message.delivered = True
-    undelivered_message.full_clean()
-    undelivered_message.save()
 
-    logging.log_receive_message_from_database(
-        logger,
-        log_message,
-        undelivered_message.client.public_key_bytes,
-        undelivered_message.response_type,
-        undelivered_message.queue
+def mark_messages_as_delivered_and_log(
+    undelivered_messages: List[PendingResponse],
+    log_messages: List[message.Message],
+    client_public_key: bytes,
+) -> None:
+    assert len(undelivered_messages) == len(log_messages)
+
+    PendingResponse.objects.filter(
+        pk__in=[undelivered_message.pk for undelivered_message in undelivered_messages],
+    ).update(
+        delivered=True,
+        modified_at=timezone.now(),
     )
 
+    for undelivered_message, log_message in zip(undelivered_messages, log_messages):
+        logging.log_receive_message_from_database(
+            logger,
+            log_message,
+            client_public_key,
+            undelivered_message.response_type,
+            undelivered_message.queue
+        )
+
 
 def update_and_return_updated_subtask(
     subtask: Subtask,
@@ -1319,6 +1395,8 @@ def store_message(
     )
     stored_message.full_clean()
     stored_message.save()
+    # Message is already in memory, so it does not have to be deserialized again while handling this request or task.
+    get_deserialized_message_cache().add(stored_message.pk, copy(golem_message))
 
     return stored_message
 
@@ -1430,7 +1508,7 @@ def handle_send_subtask_results_verify(
             if task_to_compute is not None and subtask.task_to_compute is not None:
                 validate_all_messages_identical([
                     task_to_compute,
-                    deserialize_message(subtask.task_to_compute.data.tobytes()),
+                    deserialize_stored_message(subtask.task_to_compute),
                 ])
 
             update_and_return_updated_subtask(
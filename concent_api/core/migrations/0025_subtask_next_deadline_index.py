@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 10:12
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0024_subtask_subtask_results_verify'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='subtask',
+            name='next_deadline',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
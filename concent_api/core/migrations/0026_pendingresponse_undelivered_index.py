@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 12:40
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0025_subtask_next_deadline_index'),
+    ]
+
+    # Django 1.11 does not support partial indexes in model Meta, so the index is created with raw SQL.
+    # Only undelivered responses are ever looked up by client, so delivered ones are left out to keep the index small.
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX core_pendingresponse_undelivered_client_created_at '
+                'ON core_pendingresponse (client_id, created_at) WHERE delivered = false;',
+            reverse_sql='DROP INDEX core_pendingresponse_undelivered_client_created_at;',
+        ),
+    ]
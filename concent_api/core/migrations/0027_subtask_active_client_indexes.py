@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 14:05
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+# Names of Subtask.ACTIVE_STATES at the time of writing this migration.
+ACTIVE_STATES = "('FORCING_REPORT', 'FORCING_RESULT_TRANSFER', 'FORCING_ACCEPTANCE', 'ADDITIONAL_VERIFICATION', 'VERIFICATION_FILE_TRANSFER')"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0026_pendingresponse_undelivered_index'),
+    ]
+
+    # Django 1.11 does not support partial indexes in model Meta, so the indexes are created with raw SQL.
+    # Subtasks of a client are looked up only in active states, which are a small fraction of all subtasks.
+    operations = [
+        migrations.RunSQL(
+            sql=f'CREATE INDEX core_subtask_active_requestor_next_deadline '
+                f'ON core_subtask (requestor_id, next_deadline) WHERE state IN {ACTIVE_STATES};',
+            reverse_sql='DROP INDEX core_subtask_active_requestor_next_deadline;',
+        ),
+        migrations.RunSQL(
+            sql=f'CREATE INDEX core_subtask_active_provider_next_deadline '
+                f'ON core_subtask (provider_id, next_deadline) WHERE state IN {ACTIVE_STATES};',
+            reverse_sql='DROP INDEX core_subtask_active_provider_next_deadline;',
+        ),
+    ]
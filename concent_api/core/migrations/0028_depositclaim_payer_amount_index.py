@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 14:05
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0027_subtask_active_client_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='depositclaim',
+            index=models.Index(fields=['payer_deposit_account', 'amount'], name='depositclaim_payer_amount_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 15:20
+from __future__ import unicode_literals
+
+from collections import defaultdict
+import hashlib
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def move_data_to_stored_message_data(apps, _schema_editor):
+    StoredMessage = apps.get_model('core', 'StoredMessage')
+    StoredMessageData = apps.get_model('core', 'StoredMessageData')
+
+    # Django 1.11 does not use server-side cursors, so rows are fetched in batches to limit memory usage.
+    stored_message_data_ids = {}
+    last_stored_message_id = 0
+    while True:
+        stored_messages = list(
+            StoredMessage.objects.filter(pk__gt=last_stored_message_id).order_by('pk').values_list('pk', 'data')[:BATCH_SIZE]
+        )
+        if len(stored_messages) == 0:
+            break
+
+        stored_message_ids_to_update = defaultdict(list)
+        for (stored_message_id, data) in stored_messages:
+            data = bytes(data)
+            digest = hashlib.sha256(data).hexdigest()
+            if digest not in stored_message_data_ids:
+                (stored_message_data, _created) = StoredMessageData.objects.get_or_create(
+                    digest=digest,
+                    defaults={'data': data},
+                )
+                stored_message_data_ids[digest] = stored_message_data.pk
+            stored_message_ids_to_update[stored_message_data_ids[digest]].append(stored_message_id)
+
+        for (stored_message_data_id, stored_message_ids) in stored_message_ids_to_update.items():
+            StoredMessage.objects.filter(pk__in=stored_message_ids).update(message_data_id=stored_message_data_id)
+        last_stored_message_id = stored_messages[-1][0]
+
+
+def move_data_to_stored_message(apps, _schema_editor):
+    StoredMessage = apps.get_model('core', 'StoredMessage')
+    StoredMessageData = apps.get_model('core', 'StoredMessageData')
+
+    for stored_message_data in StoredMessageData.objects.iterator():
+        StoredMessage.objects.filter(message_data_id=stored_message_data.pk).update(data=stored_message_data.data)
+    StoredMessage.objects.update(message_data=None)
+    StoredMessageData.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0029_storedmessagedata'),
+    ]
+
+    operations = [
+        migrations.RunPython(move_data_to_stored_message_data, move_data_to_stored_message),
+    ]
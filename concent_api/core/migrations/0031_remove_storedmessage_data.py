@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 15:20
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0030_move_stored_message_data'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='storedmessage',
+            name='message_data',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='stored_messages', to='core.StoredMessageData'),
+        ),
+        migrations.RemoveField(
+            model_name='storedmessage',
+            name='data',
+        ),
+    ]
@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 16:40
+from __future__ import unicode_literals
+
+import zlib
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+
+
+def decompress_stored_message_data(apps, _schema_editor):
+    StoredMessageData = apps.get_model('core', 'StoredMessageData')
+    MessageCompressionDictionary = apps.get_model('core', 'MessageCompressionDictionary')
+
+    # Rows are decompressed before `codec` is removed, so that reversing 0030 does not copy compressed data into
+    # StoredMessage as if it was a serialized message.
+    dictionaries = {}
+    last_stored_message_data_id = 0
+    while True:
+        stored_message_data_rows = list(
+            StoredMessageData.objects.filter(
+                pk__gt=last_stored_message_data_id,
+                codec='ZLIB',
+            ).order_by('pk').values_list('pk', 'data', 'compression_dictionary_id')[:BATCH_SIZE]
+        )
+        if len(stored_message_data_rows) == 0:
+            break
+
+        for (stored_message_data_id, data, compression_dictionary_id) in stored_message_data_rows:
+            if compression_dictionary_id is None:
+                decompressor = zlib.decompressobj()
+            else:
+                if compression_dictionary_id not in dictionaries:
+                    dictionaries[compression_dictionary_id] = bytes(
+                        MessageCompressionDictionary.objects.get(pk=compression_dictionary_id).data
+                    )
+                decompressor = zlib.decompressobj(zdict=dictionaries[compression_dictionary_id])
+            StoredMessageData.objects.filter(pk=stored_message_data_id).update(
+                data=decompressor.decompress(bytes(data)) + decompressor.flush(),
+                codec='UNCOMPRESSED',
+                compression_dictionary_id=None,
+            )
+        last_stored_message_data_id = stored_message_data_rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0031_remove_storedmessage_data'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MessageCompressionDictionary',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='storedmessagedata',
+            name='codec',
+            field=models.CharField(choices=[('UNCOMPRESSED', 'uncompressed'), ('ZLIB', 'zlib')], default='UNCOMPRESSED', max_length=32),
+        ),
+        migrations.AddField(
+            model_name='storedmessagedata',
+            name='compression_dictionary',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to='core.MessageCompressionDictionary'),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, decompress_stored_message_data),
+    ]
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 16:40
+from __future__ import unicode_literals
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0032_stored_message_data_compression'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PaymentEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('BATCH', 'batch'), ('FORCED_SUBTASK_PAYMENT', 'forced_subtask_payment'), ('SETTLEMENT', 'settlement')], max_length=32)),
+                ('block_number', models.IntegerField()),
+                ('tx_hash', models.CharField(max_length=66)),
+                ('payer_ethereum_address', models.CharField(max_length=42, validators=[django.core.validators.MinLengthValidator(42)])),
+                ('payee_ethereum_address', models.CharField(max_length=42, validators=[django.core.validators.MinLengthValidator(42)])),
+                ('amount', models.DecimalField(decimal_places=0, max_digits=78)),
+                ('closure_time', models.BigIntegerField(blank=True, null=True)),
+                ('subtask_id', models.CharField(blank=True, max_length=66, null=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PaymentEventIndexState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('first_indexed_block_number', models.IntegerField()),
+                ('last_indexed_block_number', models.IntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='paymentevent',
+            index=models.Index(fields=['payer_ethereum_address', 'payee_ethereum_address', 'event_type', 'block_number'], name='paymentevent_lookup_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 17:25
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0033_paymentevent_paymenteventindexstate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlockTimestamp',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('block_number', models.IntegerField(unique=True)),
+                ('timestamp', models.BigIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='blocktimestamp',
+            index=models.Index(fields=['timestamp', 'block_number'], name='blocktimestamp_lookup_idx'),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 18:10
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0034_blocktimestamp'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='depositaccount',
+            name='total_claimed',
+            field=models.DecimalField(decimal_places=0, default=0, max_digits=78),
+        ),
+        migrations.RunSQL(
+            '''
+            UPDATE core_depositaccount
+            SET total_claimed = COALESCE(
+                (
+                    SELECT SUM(core_depositclaim.amount)
+                    FROM core_depositclaim
+                    WHERE core_depositclaim.payer_deposit_account_id = core_depositaccount.id
+                ),
+                0
+            )
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
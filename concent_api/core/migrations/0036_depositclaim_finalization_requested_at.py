@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 19:20
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0035_depositaccount_total_claimed'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='depositclaim',
+            name='finalization_requested_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        # Django 1.11 does not support partial indexes in model Meta, so the index is created with raw SQL.
+        # Only a few claims are queued for finalization at any time.
+        migrations.RunSQL(
+            sql='CREATE INDEX core_depositclaim_finalization_requested '
+                'ON core_depositclaim (finalization_requested_at, id) WHERE finalization_requested_at IS NOT NULL;',
+            reverse_sql='DROP INDEX core_depositclaim_finalization_requested;',
+        ),
+    ]
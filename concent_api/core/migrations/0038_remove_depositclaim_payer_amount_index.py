@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.13 on 2026-10-17 21:10
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0037_releasednonce'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='depositclaim',
+            name='depositclaim_payer_amount_idx',
+        ),
+    ]
@@ -1,15 +1,19 @@
+from decimal import Decimal
 from typing import Any
+from typing import List
 from typing import Optional
-from typing import Type
+from typing import Tuple
 from typing import Union
 
-from django.core.exceptions import ValidationError
-from django.db import IntegrityError
 from django.db.models import Model
 from django.db.models import QuerySet
+from django.db.models import Sum
 from django.db.models.base import ModelBase
-from psycopg2 import errorcodes as pg_errorcodes
+from django.db.models.functions import Coalesce
 from common.decorators import non_nesting_atomic
+from core.models import DepositAccount
+from core.models import DepositClaim
+from core.models import StoredMessageData
 
 
 def get_one_or_none(
@@ -26,22 +30,64 @@ def get_one_or_none(
         return None if len(instances) == 0 else instances[0]
 
 
-def get_or_create_with_retry(model: Type[Model], **kwargs: Any) -> Model:
-    try:
-        with non_nesting_atomic(using='control'):
-            model_object = model.objects.get_or_create_full_clean(
-                **kwargs,
-            )
-    except IntegrityError as exception:
-        if exception.__cause__.pgcode == pg_errorcodes.UNIQUE_VIOLATION:
-            model_object = model.objects.get_or_create_full_clean(
-                **kwargs,
-            )
-        else:
-            raise
-    except ValidationError:
-        with non_nesting_atomic(using='control'):
-            model_object = model.objects.get_or_create_full_clean(
-                **kwargs,
-            )
-    return model_object
+def delete_unreferenced_stored_message_data(batch_size: int) -> int:
+    """
+    Deletes up to `batch_size` StoredMessageData objects not referenced by any StoredMessage and returns their number.
+    Objects referenced again by a concurrent transaction are not deleted.
+    """
+    unreferenced_ids = list(
+        StoredMessageData.objects.filter(stored_messages__isnull=True).values_list('pk', flat=True)[:batch_size]
+    )
+    if len(unreferenced_ids) == 0:
+        return 0
+
+    with non_nesting_atomic(using='control'):
+        # Locking prevents deleting objects locked by StoredMessageDataManager.get_or_create_for_data().
+        locked_ids = list(
+            StoredMessageData.objects.select_for_update(skip_locked=True).filter(
+                pk__in=unreferenced_ids,
+            ).values_list('pk', flat=True)
+        )
+        (number_of_deleted_objects, _) = StoredMessageData.objects.filter(
+            pk__in=locked_ids,
+            stored_messages__isnull=True,
+        ).delete()
+    return number_of_deleted_objects
+
+
+def get_sum_of_deposit_claims(deposit_account_id: int) -> Decimal:
+    return DepositClaim.objects.filter(
+        payer_deposit_account_id=deposit_account_id,
+    ).aggregate(
+        sum_of_existing_claims=Coalesce(Sum('amount'), 0)
+    )['sum_of_existing_claims']
+
+
+def find_deposit_accounts_with_incorrect_total_claimed() -> List[Tuple[int, Decimal, Decimal]]:
+    """
+    Returns id, total_claimed and the actual sum of DepositClaims of every DepositAccount for which these values
+    differ. Accounts modified while they are being compared may be reported even if they are correct.
+    """
+    return [
+        (deposit_account_id, total_claimed, sum_of_claims)
+        for (deposit_account_id, total_claimed, sum_of_claims) in DepositAccount.objects.annotate(
+            sum_of_claims=Coalesce(Sum('depositclaim__amount'), 0),
+        ).values_list(
+            'pk',
+            'total_claimed',
+            'sum_of_claims',
+        ).order_by('pk')
+        if total_claimed != sum_of_claims
+    ]
+
+
+def correct_total_claimed(deposit_account_id: int) -> Decimal:
+    """
+    Sets total_claimed of given DepositAccount to the actual sum of its DepositClaims and returns it. The account is
+    locked so that no claim against it can be created, modified or removed in the meantime.
+    """
+    with non_nesting_atomic(using='control'):
+        DepositAccount.objects.select_for_update().get(pk=deposit_account_id)
+        sum_of_claims = get_sum_of_deposit_claims(deposit_account_id)
+        DepositAccount.objects.filter(pk=deposit_account_id).update(total_claimed=sum_of_claims)
+    return sum_of_claims
@@ -1,13 +1,23 @@
 from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
 from typing import Union
+from decimal import Decimal
 import base64
 import datetime
+import hashlib
 
 from django.conf import settings
 from django.core.validators import MaxLengthValidator
 from django.core.validators import MinLengthValidator
 from django.core.validators import MinValueValidator
 from django.core.validators import ValidationError
+from django.db import connections
+from django.db import router
+from django.db import transaction
+from django.db.models import BigIntegerField
 from django.db.models import BinaryField
 from django.db.models import BooleanField
 from django.db.models import CharField
@@ -17,13 +27,16 @@ from django.db.models import ExpressionWrapper
 from django.db.models import F
 from django.db.models import ForeignKey
 from django.db.models import Func
+from django.db.models import Index
 from django.db.models import IntegerField
 from django.db.models import Manager
 from django.db.models import Model
 from django.db.models import OneToOneField
+from django.db.models import PROTECT
 from django.db.models import PositiveSmallIntegerField
 from django.db.models import QuerySet
 from django.db.models import Value
+from django.utils import timezone
 
 from constance import config
 from golem_messages import message
@@ -32,15 +45,19 @@ from common.constants import ConcentUseCase
 from common.exceptions import ConcentInSoftShutdownMode
 from common.fields import Base64Field
 from common.fields import ChoiceEnum
-from common.helpers import deserialize_message
 from common.helpers import parse_datetime_to_timestamp
 
+from .client_id_cache import client_id_cache
 from .constants import BIG_ENDIAN_INT_MAX_DIGITS
 from .constants import ETHEREUM_ADDRESS_LENGTH
 from .constants import ETHEREUM_TRANSACTION_HASH_LENGTH
 from .constants import GOLEM_PUBLIC_KEY_LENGTH
 from .constants import MESSAGE_TASK_ID_MAX_LENGTH
 from .constants import TASK_OWNER_KEY_LENGTH
+from .message_cache import deserialize_stored_message
+from .message_compression import compress_message_data
+from .message_compression import decompress_message_data
+from .message_cache import get_deserialized_message_cache
 
 
 class SubtaskWithTimingColumnsManager(Manager):
@@ -90,18 +107,212 @@ class SubtaskWithTimingColumnsManager(Manager):
         return self.with_timing_columns(super().get_queryset())
 
 
+class MessageCompressionDictionaryManager(Manager):
+
+    # Dictionaries are never modified, so once loaded they are kept in memory for the lifetime of the process.
+    _loaded_dictionaries: Dict[int, bytes] = {}
+
+    def get_dictionary_data(self, dictionary_id: int) -> bytes:
+        if dictionary_id not in self._loaded_dictionaries:
+            self._loaded_dictionaries[dictionary_id] = bytes(self.get(pk=dictionary_id).data)
+        return self._loaded_dictionaries[dictionary_id]
+
+    def get_latest_dictionary_id(self) -> Optional[int]:
+        return self.order_by('pk').values_list('pk', flat=True).last()
+
+
+class MessageCompressionDictionary(Model):
+    """
+    Dictionary used to compress serialized messages, trained on a sample of already stored messages.
+    Must never be modified or deleted, because messages compressed with it cannot be decompressed without it.
+    """
+
+    objects = MessageCompressionDictionaryManager()
+
+    data = BinaryField()
+
+    created_at = DateTimeField(auto_now_add=True)
+
+
+class StoredMessageDataManager(Manager):
+
+    def get_or_create_for_data(self, data: bytes) -> 'StoredMessageData':
+        """
+        Returns instance holding given serialized message, creating it only if identical data has not been stored yet.
+        Existing instance is locked until the end of the transaction, so that it cannot be deleted as unreferenced
+        before the StoredMessage referencing it is saved.
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with transaction.atomic(using=self.db):
+            instance = self.select_for_update().filter(digest=digest).first()
+            if instance is None:
+                # Data is compressed only if it has not been stored yet. It still may have been stored by
+                # a concurrent transaction in the meantime, which get_or_create() handles.
+                (instance, _created) = self.select_for_update().get_or_create(
+                    digest=digest,
+                    defaults=self._get_compressed_fields(data),
+                )
+        return instance
+
+    @staticmethod
+    def _get_compressed_fields(data: bytes) -> Dict[str, Any]:
+        """ Returns fields of a new instance holding given data, compressed with the latest dictionary if it helps. """
+        dictionary_id = MessageCompressionDictionary.objects.get_latest_dictionary_id()
+        compressed_data = compress_message_data(
+            data,
+            MessageCompressionDictionary.objects.get_dictionary_data(dictionary_id) if dictionary_id is not None else None,
+        )
+        if len(compressed_data) >= len(data):
+            return {
+                'data': data,
+                'codec': StoredMessageData.Codec.UNCOMPRESSED.name,
+            }
+        return {
+            'data': compressed_data,
+            'codec': StoredMessageData.Codec.ZLIB.name,
+            'compression_dictionary_id': dictionary_id,
+        }
+
+
+class StoredMessageData(Model):
+    """
+    Serialized Golem message, addressed by its content. Identical messages stored multiple times share a single
+    instance. Instances no longer referenced by any StoredMessage are removed by a separate command.
+    """
+
+    class Codec(ChoiceEnum):
+        UNCOMPRESSED    = 'uncompressed'
+        ZLIB            = 'zlib'
+
+    objects = StoredMessageDataManager()
+
+    # SHA-256 hash of the serialized message, in hexadecimal form.
+    digest = CharField(max_length=64, unique=True)
+
+    # Serialized message, encoded with `codec`. Use `decompressed_data` to read it.
+    data = BinaryField()
+
+    # Rows stored before compression was introduced are not compressed.
+    codec = CharField(max_length=32, choices=Codec.choices(), default=Codec.UNCOMPRESSED.name)
+
+    # Dictionary `data` has been compressed with. NULL if it has been compressed without a dictionary.
+    compression_dictionary = ForeignKey(MessageCompressionDictionary, blank=True, null=True, on_delete=PROTECT)
+
+    created_at = DateTimeField(auto_now_add=True)
+
+    @property
+    def decompressed_data(self) -> bytes:
+        if self.codec == StoredMessageData.Codec.UNCOMPRESSED.name:
+            return bytes(self.data)
+        assert self.codec == StoredMessageData.Codec.ZLIB.name
+        return decompress_message_data(
+            bytes(self.data),
+            (
+                MessageCompressionDictionary.objects.get_dictionary_data(self.compression_dictionary_id)
+                if self.compression_dictionary_id is not None else None
+            ),
+        )
+
+
+class StoredMessageManager(Manager):
+
+    def get_queryset(self) -> QuerySet:
+        # Serialized message is needed whenever StoredMessage is loaded, so it is always fetched in the same query.
+        return super().get_queryset().select_related('message_data')
+
+
 class StoredMessage(Model):
+
+    objects = StoredMessageManager()
+
     type = PositiveSmallIntegerField()
     timestamp = DateTimeField()
-    data = BinaryField()
+    message_data = ForeignKey(StoredMessageData, on_delete=PROTECT, related_name='stored_messages')
     task_id = CharField(max_length=MESSAGE_TASK_ID_MAX_LENGTH)
     subtask_id = CharField(max_length=MESSAGE_TASK_ID_MAX_LENGTH)
     created_at = DateTimeField(auto_now_add=True)
     protocol_version = CharField(max_length=10)
 
+    # Serialized message assigned to `data` but not saved yet. StoredMessageData it belongs to is looked up only when
+    # StoredMessage is saved, because it requires a query.
+    _data_to_store: Optional[bytes] = None
+
+    class Meta:
+        # Used also when accessing StoredMessages related to other models, e.g. `subtask.task_to_compute`.
+        base_manager_name = 'objects'
+
     def __str__(self) -> str:
         return 'StoredMessage #{}, type:{}, {}'.format(self.id, self.type, self.timestamp)
 
+    @property
+    def data(self) -> bytes:
+        if self._data_to_store is not None:
+            return bytes(self._data_to_store)
+        return self.message_data.decompressed_data
+
+    @data.setter
+    def data(self, value: bytes) -> None:
+        self._data_to_store = value
+
+    def clean_fields(self, exclude: Optional[list] = None) -> None:
+        if self._data_to_store is not None:
+            exclude = list(exclude or []) + ['message_data']
+        super().clean_fields(exclude)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if self._data_to_store is not None:
+            self.message_data = StoredMessageData.objects.get_or_create_for_data(bytes(self._data_to_store))
+            self._data_to_store = None
+        super().save(*args, **kwargs)
+
+
+def _get_or_insert_row(
+    model: type,
+    using: str,
+    lookup_field_name: str,
+    values: Dict[str, Any],
+    returned_field_names: List[str],
+) -> tuple:
+    """
+    Returns values of given fields of the row whose unique field `lookup_field_name` has the same value as in `values`.
+    If such row does not exist, it is inserted with `values`. Both are done in a single statement, which is safe to run
+    concurrently with other inserts of the same row and does not consume a sequence value if the row already exists.
+    """
+    connection = connections[using]
+    quote_name = connection.ops.quote_name
+    table = quote_name(model._meta.db_table)  # type: ignore
+    lookup_column = quote_name(model._meta.get_field(lookup_field_name).column)  # type: ignore
+    returned_columns = ', '.join(quote_name(model._meta.get_field(name).column) for name in returned_field_names)  # type: ignore
+    inserted_columns = ', '.join(quote_name(model._meta.get_field(name).column) for name in values)  # type: ignore
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'''
+            WITH existing AS (
+                SELECT {returned_columns} FROM {table} WHERE {lookup_column} = %s
+            ), inserted AS (
+                INSERT INTO {table} ({inserted_columns})
+                SELECT {', '.join(['%s'] * len(values))}
+                WHERE NOT EXISTS (SELECT 1 FROM existing)
+                ON CONFLICT ({lookup_column}) DO NOTHING
+                RETURNING {returned_columns}
+            )
+            SELECT * FROM existing UNION ALL SELECT * FROM inserted
+            ''',
+            [values[lookup_field_name], *values.values()],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            # The row has been inserted by a concurrent transaction which committed after the statement has started.
+            # It is visible to the next statement.
+            cursor.execute(
+                f'SELECT {returned_columns} FROM {table} WHERE {lookup_column} = %s',
+                [values[lookup_field_name]],
+            )
+            row = cursor.fetchone()
+    assert row is not None
+    return row
+
 
 class ClientManager(Manager):
 
@@ -109,16 +320,36 @@ class ClientManager(Manager):
         """
         Returns Model instance.
         Does the same as get_or_create method, but also performs full_clean() on newly created instance.
+        Client is looked up and created if needed in a single statement. Ids of clients stored by committed
+        transactions are cached, so usually no query is made at all. Fields other than id and public_key are
+        loaded from the database only when accessed.
         """
-        try:
-            instance = self.get(public_key = base64.b64encode(public_key))
-        except self.model.DoesNotExist:
-            instance = self.model(
-                public_key_bytes = public_key
+        encoded_public_key = base64.b64encode(public_key).decode()
+        using = router.db_for_write(self.model)
+
+        client_id = client_id_cache.get(public_key)
+        if client_id is None:
+            instance = self.model(public_key_bytes=public_key)
+            # Uniqueness is not validated because the statement below handles existing clients.
+            instance.clean_fields()
+            instance.clean()
+            (client_id,) = _get_or_insert_row(
+                self.model,
+                using,
+                'public_key',
+                {
+                    'public_key': encoded_public_key,
+                    'created_at': timezone.now(),
+                },
+                ['id'],
+            )
+            # Id must not be cached before the client is committed, because the transaction may still be rolled back.
+            transaction.on_commit(
+                lambda: client_id_cache.add(public_key, client_id),
+                using=using,
             )
-            instance.full_clean()
-            instance.save()
-        return instance
+
+        return self.model.from_db(using, ['id', 'public_key'], [client_id, encoded_public_key])
 
 
 class Client(Model):
@@ -372,6 +603,10 @@ class Subtask(Model):
         unique_together = (
             ('requestor', 'subtask_id'),
         )
+        # Active subtasks of a client are looked up using partial indexes on (requestor, next_deadline) and
+        # (provider, next_deadline) restricted to ACTIVE_STATES. Django 1.11 does not support partial indexes
+        # so they are created in migration 0027_subtask_active_client_indexes and have to be kept in sync with
+        # ACTIVE_STATES manually.
 
     task_id = CharField(max_length=MESSAGE_TASK_ID_MAX_LENGTH)
 
@@ -394,7 +629,8 @@ class Subtask(Model):
 
     # If in an active state, it's the time at which Concent automatically transitions to a passive state if it does
     # not get the information it expects from the client (a timeout). Must be NULL in a passive state.
-    next_deadline = DateTimeField(blank=True, null=True)
+    # Indexed because timed out subtasks are looked up by it.
+    next_deadline = DateTimeField(blank=True, null=True, db_index=True)
 
     created_at = DateTimeField(auto_now_add=True)
     modified_at = DateTimeField(auto_now=True)
@@ -418,6 +654,8 @@ class Subtask(Model):
     def __init__(self, *args: list, **kwargs: Union[str, int, datetime.datetime, StoredMessage, None]) -> None:
         super().__init__(*args, **kwargs)
         self._current_state_name = None
+        # Values checked against related messages in the last successful validation. See _get_related_message_values().
+        self._validated_related_message_values: Optional[tuple] = None
 
     def __repr__(self) -> str:
         return f"Subtask: task_id={self.task_id}, subtask_id={self.subtask_id}, state={self.state_enum}"
@@ -425,15 +663,62 @@ class Subtask(Model):
     @classmethod
     def from_db(cls, db: str, field_names: list, values: tuple) -> 'Subtask':
         new = super().from_db(db, field_names, values)
-        new._current_state_name = new.state  # pylint: disable=no-member
+        new._current_state_name = new.state
+        # Subtask stored in the database has already been validated against its related messages.
+        if len(new.get_deferred_fields()) == 0:
+            new._validated_related_message_values = new._get_related_message_values()  # pylint: disable=protected-access
         return new
 
+    def _get_related_message_values(self) -> tuple:
+        """
+        Returns values of all fields which are validated against related messages. Related messages are represented
+        by their ids, so that none of them has to be loaded from the database.
+        """
+        return (
+            tuple(getattr(self, f'{message_name}_id') for message_name in Subtask.MESSAGE_FOR_FIELD),
+            self.result_package_size,
+            self.computation_deadline,
+            self.protocol_version,
+        )
+
+    def _get_deserialized_related_message(self, message_name: str) -> message.Message:
+        # Related message does not have to be loaded from the database if it has already been deserialized.
+        stored_message_id = getattr(self, f'{message_name}_id')
+        deserialized_message_cache = get_deserialized_message_cache()
+        if stored_message_id in deserialized_message_cache:
+            return deserialized_message_cache.get(stored_message_id)
+        return self._deserialize_database_message(getattr(self, message_name))
+
+    def _get_related_message_protocol_versions(self) -> Dict[str, str]:
+        """
+        Returns protocol versions of all related messages. Versions of messages already loaded into memory are taken
+        from them and versions of the remaining ones are fetched in a single query.
+        """
+        protocol_versions = {}
+        message_names_to_fetch = {}
+        for message_name in Subtask.MESSAGE_FOR_FIELD:
+            stored_message_id = getattr(self, f'{message_name}_id')
+            if stored_message_id is None:
+                continue
+            if hasattr(self, Subtask._meta.get_field(message_name).get_cache_name()):
+                protocol_versions[message_name] = getattr(self, message_name).protocol_version
+            else:
+                message_names_to_fetch[stored_message_id] = message_name
+
+        if len(message_names_to_fetch) > 0:
+            for stored_message_id, protocol_version in StoredMessage.objects.filter(
+                pk__in=message_names_to_fetch,
+            ).values_list('pk', 'protocol_version'):
+                protocol_versions[message_names_to_fetch[stored_message_id]] = protocol_version
+
+        return {
+            message_name: protocol_versions[message_name]
+            for message_name in Subtask.MESSAGE_FOR_FIELD
+            if message_name in protocol_versions
+        }
+
     def _deserialize_database_message(self, serialized_message: StoredMessage) -> message.Message:  # pylint: disable=no-self-use
-        if isinstance(serialized_message.data, bytes):
-            deserialized_message = deserialize_message(serialized_message.data)
-        else:
-            deserialized_message = deserialize_message(serialized_message.data.tobytes())  # pylint: disable=no-member
-        return deserialized_message
+        return deserialize_stored_message(serialized_message)
 
     def clean(self) -> None:
         super().clean()
@@ -476,7 +761,7 @@ class Subtask(Model):
             self._current_state_name = self.state
 
         # Both ack_report_computed_task and reject_report_computed_task cannot set at the same time.
-        if self.ack_report_computed_task is not None and self.reject_report_computed_task is not None:
+        if self.ack_report_computed_task_id is not None and self.reject_report_computed_task_id is not None:
             raise ValidationError(
                 'Both ack_report_computed_task and reject_report_computed_task cannot be set at the same time.'
             )
@@ -487,7 +772,7 @@ class Subtask(Model):
 
         # Check if all required related messages are not None in current state.
         for stored_message_name, states in Subtask.REQUIRED_RELATED_MESSAGES_IN_STATES.items():
-            if self.state_enum in states and getattr(self, stored_message_name) is None:
+            if self.state_enum in states and getattr(self, f'{stored_message_name}_id') is None:
                 raise ValidationError({
                     stored_message_name: '{} cannot be None in state {}.'.format(
                         stored_message_name,
@@ -497,7 +782,7 @@ class Subtask(Model):
 
         # Check if all related messages which must be None are None in current state.
         for stored_message_name, states in Subtask.UNSET_RELATED_MESSAGES_IN_STATES.items():
-            if self.state_enum in states and getattr(self, stored_message_name) is not None:
+            if self.state_enum in states and getattr(self, f'{stored_message_name}_id') is not None:
                 raise ValidationError({
                     stored_message_name: '{} must be None in state {}.'.format(
                         stored_message_name,
@@ -505,26 +790,32 @@ class Subtask(Model):
                     )
                 })
 
-        deserialized_report_computed_task = self._deserialize_database_message(self.report_computed_task)
+        # Related messages have to be checked only if something they are checked against has changed since the last
+        # successful validation. This saves loading and deserializing them on every state transition.
+        related_message_values = self._get_related_message_values()
+        if related_message_values != self._validated_related_message_values:
+            self._clean_related_messages()
+            self._validated_related_message_values = related_message_values
+
+    def _clean_related_messages(self) -> None:
+        deserialized_report_computed_task = self._get_deserialized_related_message('report_computed_task')
 
         if not self.result_package_size == deserialized_report_computed_task.size:
             raise ValidationError({
                 'result_package_size': "ReportComputedTask size mismatch"
             })
 
-        deserialized_task_to_compute = self._deserialize_database_message(self.task_to_compute)
+        deserialized_task_to_compute = self._get_deserialized_related_message('task_to_compute')
 
         if not parse_datetime_to_timestamp(self.computation_deadline) == deserialized_task_to_compute.compute_task_def['deadline']:
             raise ValidationError({
                 'computation_deadline': "TaskToCompute deadline mismatch"
             })
 
-        for related_message_name in Subtask.MESSAGE_FOR_FIELD:
-            related_message = getattr(self, related_message_name)
-            assert isinstance(related_message, StoredMessage) or related_message is None
-            if related_message is not None and related_message.protocol_version != self.protocol_version:
+        for related_message_name, protocol_version in self._get_related_message_protocol_versions().items():
+            if protocol_version != self.protocol_version:
                 raise ValidationError(
-                    f'Unsupported Golem Message version. Version in: `{related_message_name}` is {related_message.protocol_version}, '
+                    f'Unsupported Golem Message version. Version in: `{related_message_name}` is {protocol_version}, '
                     f'Version in Concent is {self.protocol_version}'
                 )
 
@@ -568,6 +859,7 @@ class PendingResponse(Model):
     queue                = CharField(max_length = 32, choices = Queue.choices())
 
     # TRUE if the client has already fetched the message.
+    # Undelivered responses are covered by a partial index on (client, created_at), created in a migration with raw SQL.
     delivered            = BooleanField(default = False)
 
     subtask              = ForeignKey(Subtask, blank = True, null = True)
@@ -585,7 +877,7 @@ class PendingResponse(Model):
             })
 
         # subtask must be None if current state is ForcePaymentCommitted
-        if self.response_type == PendingResponse.ResponseType.ForcePaymentCommitted.name and not hasattr(self, 'subtask'):  # pylint: disable=no-member
+        if self.response_type == PendingResponse.ResponseType.ForcePaymentCommitted.name and not hasattr(self, 'subtask'):
             raise ValidationError({
                 'subtask': 'Payment message in queue cannot be associated with a subtask'
             })
@@ -674,26 +966,58 @@ class PendingEthereumTransaction(Model):
     created_at = DateTimeField(auto_now_add=True)
 
 
+class ReleasedNonce(Model):
+    """
+    Represents nonce which was reserved for an Ethereum transaction that has never been sent, while nonces following it
+    had already been reserved. Released nonces are reserved again before any new ones, so that no gaps are left
+    in the sequence of transactions.
+    """
+
+    nonce = DecimalField(max_digits=32, decimal_places=0, unique=True)
+
+    created_at = DateTimeField(auto_now_add=True)
+
+
 class DepositAccountManager(Manager):
 
     def get_or_create_full_clean(self, client: Client, ethereum_address: str) -> 'DepositAccount':
         """
         Returns Model instance.
         Does the same as get_or_create method, but also performs full_clean() on newly created instance.
+        Account is looked up and created if needed in a single statement. Fields other than id, client and
+        ethereum_address are loaded from the database only when accessed.
         """
         assert isinstance(client, Client)
         assert isinstance(ethereum_address, str)
 
-        try:
-            instance = self.get(ethereum_address=ethereum_address)
-        except self.model.DoesNotExist:
-            instance = self.model(
-                client=client,
-                ethereum_address=ethereum_address,
-            )
-            instance.full_clean()
-            instance.save()
-        return instance
+        instance = self.model(
+            client=client,
+            ethereum_address=ethereum_address,
+        )
+        # Client is not validated because it has already been stored. Uniqueness is not validated because
+        # the statement below handles existing accounts.
+        instance.clean_fields(exclude=['client'])
+        instance.clean()
+
+        using = router.db_for_write(self.model)
+        (deposit_account_id, client_id) = _get_or_insert_row(
+            self.model,
+            using,
+            'ethereum_address',
+            {
+                'ethereum_address': ethereum_address,
+                'client': client.pk,
+                'created_at': timezone.now(),
+                'total_claimed': 0,
+            },
+            ['id', 'client'],
+        )
+        return self.model.from_db(using, ['id', 'client_id', 'ethereum_address'], [deposit_account_id, client_id, ethereum_address])
+
+    def add_to_total_claimed(self, deposit_account_id: int, amount: Union[int, Decimal]) -> None:
+        """ Adds given amount, which can be negative, to total_claimed of given account in a single statement. """
+        if amount != 0:
+            self.filter(pk=deposit_account_id).update(total_claimed=F('total_claimed') + amount)
 
 
 class DepositAccount(Model):
@@ -708,6 +1032,21 @@ class DepositAccount(Model):
     )
     created_at = DateTimeField(auto_now_add=True)
 
+    # Sum of amounts of all DepositClaims against this account. It is kept up to date by DepositClaim.save() and
+    # DepositClaim.delete(), so claims must not be created, modified or deleted with QuerySet methods.
+    total_claimed = DecimalField(max_digits=BIG_ENDIAN_INT_MAX_DIGITS, decimal_places=0, default=0)
+
+    def save(self, *args: Any, **kwargs: Any) -> None:  # pylint: disable=arguments-differ
+        # total_claimed is never saved together with other fields of an existing account, because the value loaded
+        # with the account may be outdated by the time it is saved.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != 'total_claimed'
+            ]
+        super().save(*args, **kwargs)
+
 
 class DepositClaim(Model):
     subtask_id = CharField(max_length=MESSAGE_TASK_ID_MAX_LENGTH, blank=True, null=True)
@@ -729,10 +1068,50 @@ class DepositClaim(Model):
     modified_at = DateTimeField(auto_now=True)
     closure_time = DateTimeField(blank=True, null=True)
 
+    # Time when the claim was queued to be paid out together with other claims. It is cleared when the claim is taken
+    # off the queue, right before the transaction paying it out is submitted.
+    finalization_requested_at = DateTimeField(blank=True, null=True)
+
     @property
     def amount_as_int(self) -> int:
         return int(self.amount)
 
+    def save(self, *args: Any, **kwargs: Any) -> None:  # pylint: disable=arguments-differ
+        using = kwargs.get('using') or router.db_for_write(DepositClaim, instance=self)
+        with transaction.atomic(using=using):
+            stored_claim = None if self._state.adding else self._get_stored_payer_and_amount(using)
+            super().save(*args, **kwargs)
+
+            deposit_account_manager = DepositAccount.objects.db_manager(using)
+            if stored_claim is None:
+                deposit_account_manager.add_to_total_claimed(self.payer_deposit_account_id, self.amount)
+            elif stored_claim[0] == self.payer_deposit_account_id:
+                deposit_account_manager.add_to_total_claimed(self.payer_deposit_account_id, self.amount - stored_claim[1])
+            else:
+                deposit_account_manager.add_to_total_claimed(stored_claim[0], -stored_claim[1])
+                deposit_account_manager.add_to_total_claimed(self.payer_deposit_account_id, self.amount)
+
+    def delete(self, *args: Any, **kwargs: Any) -> Tuple[int, Dict[str, int]]:  # pylint: disable=arguments-differ
+        using = kwargs.get('using') or router.db_for_write(DepositClaim, instance=self)
+        with transaction.atomic(using=using):
+            stored_claim = self._get_stored_payer_and_amount(using)
+            result = super().delete(*args, **kwargs)
+            if stored_claim is not None:
+                DepositAccount.objects.db_manager(using).add_to_total_claimed(stored_claim[0], -stored_claim[1])
+        return result
+
+    def _get_stored_payer_and_amount(self, using: str) -> Optional[Tuple[int, Decimal]]:
+        """
+        Returns payer and amount of this claim as currently stored in the database, which is what total_claimed of
+        the payer includes. The instance itself may hold modified or outdated values.
+        """
+        return DepositClaim.objects.using(using).filter(
+            pk=self.pk,
+        ).values_list(
+            'payer_deposit_account_id',
+            'amount',
+        ).first()
+
     class Meta:
         unique_together = ('subtask_id', 'concent_use_case', 'payee_ethereum_address')
 
@@ -756,3 +1135,82 @@ class DepositClaim(Model):
             (self.closure_time is None and self.concent_use_case == ConcentUseCase.FORCED_PAYMENT)
         ):
             raise ValidationError({'closure_time': 'Closure time must be set only in FORCED_PAYMENT use case.'})
+
+
+class PaymentEventIndexState(Model):
+    """
+    Represents the range of blocks whose payment events and timestamps have already been copied to PaymentEvent
+    and BlockTimestamp tables by the payment events indexer. Data from blocks outside of this range must be read
+    from the blockchain.
+
+    There should always be at most one object of this type with id = 0. It is created by the indexer on its first run.
+    """
+
+    first_indexed_block_number = IntegerField()
+    last_indexed_block_number = IntegerField()
+
+    def save(self, *args: Any, **kwargs: Any) -> None:  # pylint: disable=arguments-differ
+        self.pk = 0
+        super().save(*args, **kwargs)
+
+
+class BlockTimestamp(Model):
+    """
+    Represents timestamp of a confirmed block, copied from the blockchain by the payment events indexer
+    together with payment events from the same block. Allows finding the first block mined after given time
+    without querying the Ethereum client.
+    """
+
+    block_number = IntegerField(unique=True)
+    timestamp = BigIntegerField()
+
+    class Meta:
+        indexes = [
+            # Timestamps never decrease with block number, so the first block after given time is the first row
+            # in this index.
+            Index(fields=['timestamp', 'block_number'], name='blocktimestamp_lookup_idx'),
+        ]
+
+
+class PaymentEvent(Model):
+    """
+    Represents a payment event emitted by GNTB or GNTDeposit contract, copied from a confirmed block
+    by the payment events indexer.
+    """
+
+    class EventType(ChoiceEnum):
+        BATCH = 'batch'
+        FORCED_SUBTASK_PAYMENT = 'forced_subtask_payment'
+        SETTLEMENT = 'settlement'
+
+    event_type = CharField(max_length=32, choices=EventType.choices())
+    block_number = IntegerField()
+    tx_hash = CharField(max_length=ETHEREUM_TRANSACTION_HASH_LENGTH + 2)
+
+    # Requestor or sender of the payment.
+    payer_ethereum_address = CharField(
+        max_length=ETHEREUM_ADDRESS_LENGTH,
+        validators=[MinLengthValidator(ETHEREUM_ADDRESS_LENGTH)]
+    )
+
+    # Provider or receiver of the payment.
+    payee_ethereum_address = CharField(
+        max_length=ETHEREUM_ADDRESS_LENGTH,
+        validators=[MinLengthValidator(ETHEREUM_ADDRESS_LENGTH)]
+    )
+
+    amount = DecimalField(max_digits=BIG_ENDIAN_INT_MAX_DIGITS, decimal_places=0)
+
+    # Closure time is stored the same way as in the event. Forced subtask payments do not have it.
+    closure_time = BigIntegerField(blank=True, null=True)
+
+    # Only forced subtask payments have it.
+    subtask_id = CharField(max_length=66, blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            Index(
+                fields=['payer_ethereum_address', 'payee_ethereum_address', 'event_type', 'block_number'],
+                name='paymentevent_lookup_idx',
+            ),
+        ]
@@ -0,0 +1,73 @@
+from contextlib import contextmanager
+from hashlib import sha1
+from logging import getLogger
+from typing import Iterator
+import select
+
+from django.db import connections
+
+from common.logging import log
+
+logger = getLogger(__name__)
+
+
+def get_pending_response_channel_name(client_public_key: bytes) -> str:
+    """
+    Returns name of PostgreSQL notification channel used to notify about new PendingResponses of given client.
+    Public key is hashed because channel names are limited to 63 characters.
+    """
+    assert isinstance(client_public_key, bytes)
+    return f'pending_response_{sha1(client_public_key).hexdigest()}'
+
+
+def notify_about_pending_response(client_public_key: bytes) -> None:
+    """
+    Sends notification about new PendingResponse to the channel of given client.
+    Notifications are delivered only when current transaction is committed.
+    """
+    with connections['control'].cursor() as cursor:
+        cursor.execute('SELECT pg_notify(%s, %s)', [get_pending_response_channel_name(client_public_key), ''])
+
+
+@contextmanager
+def listen_for_pending_responses(client_public_key: bytes) -> Iterator[None]:
+    """
+    Subscribes database connection to the channel of given client for the duration of the block.
+    Must not be used inside a transaction, because notifications are not delivered until it ends.
+    """
+    connection = connections['control']
+    assert not connection.in_atomic_block
+
+    channel_name = get_pending_response_channel_name(client_public_key)
+    with connection.cursor() as cursor:
+        cursor.execute(f'LISTEN "{channel_name}"')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute(f'UNLISTEN "{channel_name}"')
+        # Notifications received but not consumed must not leak to the next request using this connection.
+        # Connection is None if it has been closed in the meantime, in which case there is nothing to clear.
+        if connection.connection is not None:
+            del connection.connection.notifies[:]
+
+
+def wait_for_pending_response_notification(timeout: float) -> bool:
+    """
+    Blocks until a notification is received on any channel the connection listens to or until timeout passes.
+    Returns True if notification was received.
+    """
+    assert timeout > 0
+    database_connection = connections['control'].connection
+
+    if len(database_connection.notifies) == 0:
+        (readable, _, _) = select.select([database_connection], [], [], timeout)
+        if len(readable) > 0:
+            database_connection.poll()
+
+    if len(database_connection.notifies) == 0:
+        return False
+
+    log(logger, f'Received {len(database_connection.notifies)} notification(s) about new pending responses.')
+    del database_connection.notifies[:]
+    return True
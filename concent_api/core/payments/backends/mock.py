@@ -4,6 +4,7 @@ from typing import List
 
 from core.constants import CLIENT_ETH_ADDRESS_WITH_0_DEPOSIT
 from core.payments.backends.sci_backend import TransactionType
+from core.payments.synchronization_status_cache import SynchronizationStatus
 
 
 def get_list_of_payments(
@@ -33,6 +34,18 @@ def get_transaction_count() -> int:
     return 0
 
 
+def get_latest_confirmed_block_number() -> int:
+    return 0
+
+
+def get_synchronization_status() -> SynchronizationStatus:
+    return SynchronizationStatus(is_synchronized=True, lag=0)
+
+
+def index_payment_events() -> int:
+    return 0
+
+
 def get_deposit_value(client_eth_address: str) -> int:  # pylint: disable=unused-argument
     if client_eth_address == CLIENT_ETH_ADDRESS_WITH_0_DEPOSIT:
         return 0
@@ -11,11 +11,17 @@ from golem_sci.implementation import SCIImplementation
 from web3 import Web3
 
 from common.constants import ErrorCode
+from common.helpers import get_current_utc_timestamp
 from core.constants import ETHEREUM_ADDRESS_LENGTH
 from core.constants import PAYMENTS_FROM_BLOCK_SAFETY_MARGIN
+from core.constants import SCI_SYNCHRONIZATION_STATUS_REFRESH_INTERVAL
+from core.constants import SCI_SYNCHRONIZATION_STATUS_TIMEOUT
 from core.exceptions import SCINotSynchronized
+from core.models import PaymentEvent
+from core.payments import payment_events_indexer
 from core.payments.payment_interface import PaymentInterface
-from core.utils import BlocksHelper
+from core.payments.synchronization_status_cache import SynchronizationStatus
+from core.payments.synchronization_status_cache import SynchronizationStatusCache
 from core.validation import validate_uuid
 from core.validation import validate_value_is_int_convertible_and_non_negative
 from core.validation import validate_value_is_int_convertible_and_positive
@@ -27,11 +33,17 @@ class TransactionType(Enum):
     SETTLEMENT = 'settlement'
 
 
+synchronization_status_cache = SynchronizationStatusCache(
+    refresh_interval=SCI_SYNCHRONIZATION_STATUS_REFRESH_INTERVAL,
+    timeout=SCI_SYNCHRONIZATION_STATUS_TIMEOUT,
+)
+
+
 def handle_sci_synchronization(sci_function: Callable) -> Callable:
 
     @wraps(sci_function)
     def wrapper(*args: Any, **kwargs: Any) -> None:
-        if PaymentInterface().is_synchronized():  # type: ignore  # pylint: disable=no-member
+        if synchronization_status_cache.is_synchronized(PaymentInterface().is_synchronized):  # type: ignore  # pylint: disable=no-member
             try:
                 return sci_function(*args, **kwargs)
             except ValueError as exception:
@@ -64,38 +76,75 @@ def get_list_of_payments(
     assert isinstance(transaction_type, Enum) and transaction_type in TransactionType
 
     payment_interface: SCIImplementation = PaymentInterface()
-    payments: list = []
 
-    first_block_after_payment_number = BlocksHelper(payment_interface).get_latest_existing_block_at(min_block_timestamp).number
+    first_block_after_payment_number = payment_events_indexer.get_first_block_number_after(payment_interface, min_block_timestamp)
     latest_block_number = payment_interface.get_latest_confirmed_block_number()  # pylint: disable=no-member
     if latest_block_number - first_block_after_payment_number < payment_interface.REQUIRED_CONFS:  # pylint: disable=no-member
-        return payments
+        return []
+
+    from_block = first_block_after_payment_number
+    if transaction_type == TransactionType.FORCED_SUBTASK_PAYMENT:
+        # We start few blocks before first matching block because forced subtask payments
+        # do not have closure_time so we are relying on blockchain timestamps
+        from_block -= PAYMENTS_FROM_BLOCK_SAFETY_MARGIN
+    to_block = latest_block_number - payment_interface.REQUIRED_CONFS  # pylint: disable=no-member
+
+    # Events from blocks already copied to the database by the payment events indexer are not read from the blockchain.
+    (indexed_payments, first_unindexed_block_number) = payment_events_indexer.get_indexed_payment_events(
+        PaymentEvent.EventType[transaction_type.name],
+        requestor_eth_address,
+        provider_eth_address,
+        from_block,
+        to_block,
+    )
+    payments: list = indexed_payments if indexed_payments is not None else []
+    if first_unindexed_block_number <= to_block:
+        payments += _get_list_of_payments_from_blockchain(
+            payment_interface,
+            requestor_eth_address,
+            provider_eth_address,
+            transaction_type,
+            first_unindexed_block_number,
+            to_block,
+        )
 
+    return payments
+
+
+def _get_list_of_payments_from_blockchain(
+    payment_interface: SCIImplementation,
+    requestor_eth_address: str,
+    provider_eth_address: str,
+    transaction_type: TransactionType,
+    from_block: int,
+    to_block: int,
+) -> list:
     if transaction_type == TransactionType.SETTLEMENT:
-        payments = payment_interface.get_forced_payments(  # pylint: disable=no-member
+        return payment_interface.get_forced_payments(  # pylint: disable=no-member
             requestor_address=Web3.toChecksumAddress(requestor_eth_address),
             provider_address=Web3.toChecksumAddress(provider_eth_address),
-            from_block=first_block_after_payment_number,
-            to_block=latest_block_number - payment_interface.REQUIRED_CONFS,  # pylint: disable=no-member
+            from_block=from_block,
+            to_block=to_block,
         )
     elif transaction_type == TransactionType.BATCH:
-        payments = payment_interface.get_batch_transfers(  # pylint: disable=no-member
+        return payment_interface.get_batch_transfers(  # pylint: disable=no-member
             payer_address=Web3.toChecksumAddress(requestor_eth_address),
             payee_address=Web3.toChecksumAddress(provider_eth_address),
-            from_block=first_block_after_payment_number,
-            to_block=latest_block_number - payment_interface.REQUIRED_CONFS,  # pylint: disable=no-member
+            from_block=from_block,
+            to_block=to_block,
         )
     elif transaction_type == TransactionType.FORCED_SUBTASK_PAYMENT:
-        payments = payment_interface.get_forced_subtask_payments(  # pylint: disable=no-member
+        return payment_interface.get_forced_subtask_payments(  # pylint: disable=no-member
             requestor_address=Web3.toChecksumAddress(requestor_eth_address),
             provider_address=Web3.toChecksumAddress(provider_eth_address),
-            # We start few blocks before first matching block because forced subtask payments
-            # do not have closure_time so we are relying on blockchain timestamps
-            from_block=first_block_after_payment_number - PAYMENTS_FROM_BLOCK_SAFETY_MARGIN,
-            to_block=latest_block_number - payment_interface.REQUIRED_CONFS,  # pylint: disable=no-member
+            from_block=from_block,
+            to_block=to_block,
         )
+    return []
 
-    return payments
+
+def index_payment_events() -> int:
+    return payment_events_indexer.index_payment_events(PaymentInterface())
 
 
 def make_settlement_payment(
@@ -140,6 +189,21 @@ def get_transaction_count() -> int:
     return PaymentInterface().get_transaction_count()  # type: ignore  # pylint: disable=no-member
 
 
+def get_latest_confirmed_block_number() -> int:
+    return PaymentInterface().get_latest_confirmed_block_number()  # type: ignore  # pylint: disable=no-member
+
+
+def get_synchronization_status() -> SynchronizationStatus:
+    payment_interface: SCIImplementation = PaymentInterface()
+    latest_confirmed_block = payment_interface.get_block_by_number(
+        payment_interface.get_latest_confirmed_block_number()  # pylint: disable=no-member
+    )
+    return SynchronizationStatus(
+        is_synchronized=synchronization_status_cache.is_synchronized(payment_interface.is_synchronized),
+        lag=max(get_current_utc_timestamp() - latest_confirmed_block.timestamp, 0),
+    )
+
+
 @handle_sci_synchronization
 def get_deposit_value(client_eth_address: str) -> int:
     assert isinstance(client_eth_address, str) and len(client_eth_address) == ETHEREUM_ADDRESS_LENGTH
@@ -216,7 +280,7 @@ def get_covered_additional_verification_costs(client_eth_address: str, payment_t
 
     payment_interface: SCIImplementation = PaymentInterface()
 
-    first_block_after_payment_number = BlocksHelper(payment_interface).get_latest_existing_block_at(payment_ts).number
+    first_block_after_payment_number = payment_events_indexer.get_first_block_number_after(payment_interface, payment_ts)
 
     return payment_interface.get_covered_additional_verification_costs(  # pylint: disable=no-member
         address=Web3.toChecksumAddress(client_eth_address),
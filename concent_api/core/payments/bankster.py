@@ -1,3 +1,10 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Any
+from typing import Callable
+from typing import Dict
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -5,9 +12,11 @@ from typing import Union
 import logging
 
 from django.conf import settings
+from django.db import connections
 from django.db.models import QuerySet
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
+from django.utils import timezone
 
 from golem_messages.message.concents import SubtaskResultsVerify
 from golem_messages.message.tasks import SubtaskResultsAccepted
@@ -17,20 +26,23 @@ from golem_sci.events import ForcedPaymentEvent
 
 from common.constants import ConcentUseCase
 from common.decorators import non_nesting_atomic
-from common.helpers import deserialize_message
 from common.helpers import ethereum_public_key_to_address
 from common.helpers import parse_timestamp_to_utc_datetime
 from common.logging import log
+from common.logging import LoggingLevel
+from core.constants import BANKSTER_PAYMENT_QUERIES_MAXIMUM_WORKERS
+from core.constants import DEPOSIT_CLAIM_FINALIZATION_BATCH_SIZE
+from core.constants import DEPOSIT_CLAIM_FINALIZATION_MAXIMUM_CONCURRENT_TRANSACTIONS
 from core.constants import ETHEREUM_ADDRESS_LENGTH
 from core.exceptions import BanksterNoUnsettledTasksError
 from core.exceptions import BanksterTooSmallProviderDepositError
 from core.exceptions import BanksterTooSmallRequestorDepositError
 from core.exceptions import BanksterTransactionMismatchError
+from core.message_cache import deserialize_stored_message
 from core.models import Client
 from core.models import DepositAccount
 from core.models import DepositClaim
 from core.models import Subtask
-from core.model_helpers import get_or_create_with_retry
 from core.payments import service
 from core.payments.backends.sci_backend import TransactionType
 from core.utils import adjust_transaction_hash
@@ -41,6 +53,35 @@ from core.validation import validate_uuid
 
 logger = logging.getLogger(__name__)
 
+# Shared by all operations in the process, so that the number of concurrent queries to the payment backend is limited.
+payment_queries_executor = ThreadPoolExecutor(
+    max_workers=BANKSTER_PAYMENT_QUERIES_MAXIMUM_WORKERS,
+    thread_name_prefix='BanksterPaymentQuery',
+)
+
+# Kept apart from queries, so that a burst of transactions being signed does not delay queries made by other operations.
+payment_transactions_executor = ThreadPoolExecutor(
+    max_workers=DEPOSIT_CLAIM_FINALIZATION_MAXIMUM_CONCURRENT_TRANSACTIONS,
+    thread_name_prefix='BanksterPaymentTransaction',
+)
+
+
+def submit_payment_query(function: Callable, **kwargs: Any) -> Future:
+    """ Runs query to the payment backend in a worker thread and returns Future of its result. """
+    return _submit_to_executor(payment_queries_executor, function, **kwargs)
+
+
+def _submit_to_executor(executor: ThreadPoolExecutor, function: Callable, **kwargs: Any) -> Future:
+
+    def run_in_worker_thread() -> Any:
+        try:
+            return function(**kwargs)
+        finally:
+            # Database connections are opened per thread and Django closes only connections of the request thread.
+            connections.close_all()
+
+    return executor.submit(run_in_worker_thread)
+
 
 def claim_deposit(
     subtask_id: str,
@@ -77,16 +118,14 @@ def claim_deposit(
     # Bankster creates Client and DepositAccount objects (if they don't exist yet) for the requestor
     # and also for the provider if there's a non-zero claim against his account.
     # This is done in single database transaction.
-    requestor_client: Client = get_or_create_with_retry(Client, public_key=requestor_public_key)
-    requestor_deposit_account: DepositAccount = get_or_create_with_retry(
-        DepositAccount,
+    requestor_client: Client = Client.objects.get_or_create_full_clean(requestor_public_key)
+    requestor_deposit_account: DepositAccount = DepositAccount.objects.get_or_create_full_clean(
         client=requestor_client,
         ethereum_address=requestor_ethereum_address,
     )
     if is_claim_against_provider:
-        provider_client: Client = get_or_create_with_retry(Client, public_key=provider_public_key)
-        provider_deposit_account: DepositAccount = get_or_create_with_retry(
-            DepositAccount,
+        provider_client: Client = Client.objects.get_or_create_full_clean(provider_public_key)
+        provider_deposit_account: DepositAccount = DepositAccount.objects.get_or_create_full_clean(
             client=provider_client,
             ethereum_address=provider_ethereum_address,
         )
@@ -102,26 +141,18 @@ def claim_deposit(
     # Bankster puts database locks on DepositAccount objects
     # that will be used as payers in newly created DepositClaims.
     with non_nesting_atomic(using='control'):
-        DepositAccount.objects.select_for_update().filter(
-            client=requestor_client,
-            ethereum_address=requestor_ethereum_address,
+        # Accounts are reloaded so that their totals of existing claims are read under the lock.
+        requestor_deposit_account = DepositAccount.objects.select_for_update().get(
+            pk=requestor_deposit_account.pk,
         )
         if is_claim_against_provider:
-            DepositAccount.objects.select_for_update().filter(
-                client=provider_client,
-                ethereum_address=provider_ethereum_address,
+            provider_deposit_account = DepositAccount.objects.select_for_update().get(
+                pk=provider_deposit_account.pk,
             )
 
-        # Bankster sums the amounts of all existing DepositClaims that have the same payer as the one being processed.
-        aggregated_claims_against_requestor = DepositClaim.objects.filter(
-            payer_deposit_account=requestor_deposit_account
-        ).aggregate(
-            sum_of_existing_claims=Coalesce(Sum('amount'), 0)
-        )
-
         # If the existing claims against requestor's deposit are greater or equal to his current deposit,
         # we can't add a new claim.
-        if requestor_deposit <= aggregated_claims_against_requestor['sum_of_existing_claims']:
+        if requestor_deposit <= requestor_deposit_account.total_claimed:
             return (None, None)
 
         # Deposit lock for requestor.
@@ -136,16 +167,9 @@ def claim_deposit(
         claim_against_requestor.save()
 
         if is_claim_against_provider:
-            # Bankster sums the amounts of all existing DepositClaims where the provider is the payer.
-            aggregated_claims_against_provider = DepositClaim.objects.filter(
-                payer_deposit_account=provider_deposit_account
-            ).aggregate(
-                sum_of_existing_claims=Coalesce(Sum('amount'), 0)
-            )
-
             # If the total of existing claims and the current claim is greater or equal to the current deposit,
             # we can't add a new claim.
-            provider_obligations = aggregated_claims_against_provider['sum_of_existing_claims'] + settings.ADDITIONAL_VERIFICATION_COST
+            provider_obligations = provider_deposit_account.total_claimed + settings.ADDITIONAL_VERIFICATION_COST
             if provider_deposit <= provider_obligations:
                 claim_against_requestor.delete()
                 raise BanksterTooSmallProviderDepositError(
@@ -192,21 +216,15 @@ def finalize_payment(deposit_claim: DepositClaim) -> Optional[str]:
 
     # Bankster begins a database transaction and puts a database lock on the DepositAccount object.
     with non_nesting_atomic(using='control'):
-        DepositAccount.objects.select_for_update().get(
+        payer_deposit_account = DepositAccount.objects.select_for_update().get(
             pk=deposit_claim.payer_deposit_account_id
         )
 
-        # Bankster sums the amounts of all existing DepositClaims that have the same payer as the one being processed.
-        aggregated_client_claims = DepositClaim.objects.filter(
-            payer_deposit_account=deposit_claim.payer_deposit_account
-        ).exclude(
-            pk=deposit_claim.pk
-        ).aggregate(
-            sum_of_existing_claims=Coalesce(Sum('amount'), 0)
-        )
-
-        # Bankster subtracts that value from the amount of funds available in the deposit.
-        available_funds_without_claims = available_funds - aggregated_client_claims['sum_of_existing_claims']
+        # Bankster takes the total of all other existing DepositClaims that have the same payer as the one being
+        # processed and subtracts it from the amount of funds available in the deposit.
+        stored_amount = DepositClaim.objects.filter(pk=deposit_claim.pk).values_list('amount', flat=True).first()
+        sum_of_existing_claims = payer_deposit_account.total_claimed - (stored_amount or 0)
+        available_funds_without_claims = available_funds - sum_of_existing_claims
 
         # If the result is negative or zero, Bankster removes the DepositClaim object being processed.
         if available_funds_without_claims <= 0:
@@ -220,39 +238,42 @@ def finalize_payment(deposit_claim: DepositClaim) -> Optional[str]:
             deposit_claim.save()
 
     # If the DepositClaim still exists at this point, Bankster uses SCI to create an Ethereum transaction.
+    (submit_transaction, transaction_arguments) = get_payment_transaction(deposit_claim)
+    ethereum_transaction_hash = submit_transaction(**transaction_arguments)
+
+    store_payment_transaction_hash(deposit_claim, ethereum_transaction_hash)
+    return deposit_claim.tx_hash
+
+
+def get_payment_transaction(deposit_claim: DepositClaim) -> Tuple[Callable[..., str], Dict[str, Any]]:
+    """
+    Returns the payment service function which submits the Ethereum transaction paying out given DepositClaim,
+    together with its arguments. Only calling the function communicates with the Ethereum client.
+    """
     subtask = Subtask.objects.filter(subtask_id=deposit_claim.subtask_id).first()  # pylint: disable=no-member
-    task_to_compute: TaskToCompute = deserialize_message(subtask.task_to_compute.data.tobytes())
+    task_to_compute: TaskToCompute = deserialize_stored_message(subtask.task_to_compute)
     v, r, s = task_to_compute.promissory_note_sig
+    force_subtask_payment_arguments = dict(
+        requestor_eth_address=deposit_claim.payer_deposit_account.ethereum_address,
+        provider_eth_address=deposit_claim.payee_ethereum_address,
+        value=task_to_compute.price,
+        subtask_id=deposit_claim.subtask_id,
+        v=v,
+        r=r,
+        s=s,
+        reimburse_amount=deposit_claim.amount_as_int,
+    )
     if deposit_claim.concent_use_case == ConcentUseCase.FORCED_ACCEPTANCE:
-        ethereum_transaction_hash = service.force_subtask_payment(  # pylint: disable=no-value-for-parameter
-            requestor_eth_address=deposit_claim.payer_deposit_account.ethereum_address,
-            provider_eth_address=deposit_claim.payee_ethereum_address,
-            value=task_to_compute.price,
-            subtask_id=deposit_claim.subtask_id,
-            v=v,
-            r=r,
-            s=s,
-            reimburse_amount=deposit_claim.amount_as_int,
-        )
+        return (service.force_subtask_payment, force_subtask_payment_arguments)
     elif deposit_claim.concent_use_case == ConcentUseCase.ADDITIONAL_VERIFICATION:
-        if subtask is not None:
-            if task_to_compute.requestor_ethereum_address == deposit_claim.payer_deposit_account.ethereum_address:
-                ethereum_transaction_hash = service.force_subtask_payment(  # pylint: disable=no-value-for-parameter
-                    requestor_eth_address=deposit_claim.payer_deposit_account.ethereum_address,
-                    provider_eth_address=deposit_claim.payee_ethereum_address,
-                    value=task_to_compute.price,
-                    subtask_id=deposit_claim.subtask_id,
-                    v=v,
-                    r=r,
-                    s=s,
-                    reimburse_amount=deposit_claim.amount_as_int,
-                )
-            elif task_to_compute.provider_ethereum_address == deposit_claim.payer_deposit_account.ethereum_address:
-                subtask_results_verify: SubtaskResultsVerify = deserialize_message(
-                    subtask.subtask_results_verify.data.tobytes()
-                )
-                (v, r, s) = subtask_results_verify.concent_promissory_note_sig
-                ethereum_transaction_hash = service.cover_additional_verification_cost(  # pylint: disable=no-value-for-parameter
+        if task_to_compute.requestor_ethereum_address == deposit_claim.payer_deposit_account.ethereum_address:
+            return (service.force_subtask_payment, force_subtask_payment_arguments)
+        elif task_to_compute.provider_ethereum_address == deposit_claim.payer_deposit_account.ethereum_address:
+            subtask_results_verify: SubtaskResultsVerify = deserialize_stored_message(subtask.subtask_results_verify)
+            (v, r, s) = subtask_results_verify.concent_promissory_note_sig
+            return (
+                service.cover_additional_verification_cost,
+                dict(
                     provider_eth_address=deposit_claim.payer_deposit_account.ethereum_address,
                     value=subtask_results_verify.task_to_compute.price,
                     subtask_id=deposit_claim.subtask_id,
@@ -260,12 +281,12 @@ def finalize_payment(deposit_claim: DepositClaim) -> Optional[str]:
                     r=r,
                     s=s,
                     reimburse_amount=deposit_claim.amount_as_int,
-                )
-            else:
-                assert False
-    else:
-        assert False
+                ),
+            )
+    assert False
+
 
+def store_payment_transaction_hash(deposit_claim: DepositClaim, ethereum_transaction_hash: str) -> None:
     with non_nesting_atomic(using='control'):
         # The code below is executed in another transaction, so - in theory - deposit_claim object could be modified in
         # the meantime. Here we are working under assumption that it's not the case and it is coder's responsibility to
@@ -280,7 +301,172 @@ def finalize_payment(deposit_claim: DepositClaim) -> Optional[str]:
         callback=lambda _: discard_claim(deposit_claim),
     )
 
-    return deposit_claim.tx_hash
+
+def request_payment_finalization(deposit_claim: DepositClaim) -> None:
+    """
+    Queues DepositClaim to be paid out by `finalize_requested_payments()` together with other claims, instead of
+    submitting a transaction for it right away.
+    """
+    assert isinstance(deposit_claim, DepositClaim)
+
+    # Amount is not changed, so updating the claim with a QuerySet method leaves total_claimed of the payer correct.
+    DepositClaim.objects.filter(
+        pk=deposit_claim.pk,
+        tx_hash__isnull=True,
+        finalization_requested_at__isnull=True,
+    ).update(
+        finalization_requested_at=timezone.now(),
+        modified_at=timezone.now(),
+    )
+
+
+def finalize_requested_payments(batch_size: int = DEPOSIT_CLAIM_FINALIZATION_BATCH_SIZE) -> int:
+    """
+    Pays out up to `batch_size` DepositClaims queued by `request_payment_finalization()`, oldest first.
+
+    Claims are grouped by payer, so that available funds are checked and the DepositAccount is locked once per payer
+    rather than once per claim. Transactions for all claims in the batch are then submitted concurrently, so that
+    signing and sending them overlaps instead of being done one after another. The contract has no calls paying out
+    many subtasks of different providers at once, so each claim is still paid out in its own transaction.
+    Returns the number of submitted transactions.
+    """
+    assert batch_size > 0
+
+    requested_claims = DepositClaim.objects.filter(
+        finalization_requested_at__isnull=False,
+    ).select_related(
+        'payer_deposit_account',
+    ).order_by(
+        'finalization_requested_at',
+        'id',
+    )[:batch_size]
+
+    requested_claim_ids_by_payer: Dict[str, List[int]] = OrderedDict()
+    payer_deposit_account_ids: Dict[str, int] = {}
+    for deposit_claim in requested_claims:
+        payer_ethereum_address = deposit_claim.payer_deposit_account.ethereum_address
+        requested_claim_ids_by_payer.setdefault(payer_ethereum_address, []).append(deposit_claim.pk)
+        payer_deposit_account_ids[payer_ethereum_address] = deposit_claim.payer_deposit_account_id
+
+    # Bankster asks SCI about the amount of funds available in deposits of all payers at once.
+    deposit_value_futures = {
+        payer_ethereum_address: submit_payment_query(
+            service.get_deposit_value,
+            client_eth_address=payer_ethereum_address,
+        )
+        for payer_ethereum_address in requested_claim_ids_by_payer
+    }
+
+    claims_to_pay_by_payer = OrderedDict(
+        (
+            payer_ethereum_address,
+            _reserve_funds_for_requested_claims(
+                payer_deposit_account_ids[payer_ethereum_address],
+                requested_claim_ids,
+                deposit_value_futures[payer_ethereum_address].result(),
+            ),
+        )
+        for payer_ethereum_address, requested_claim_ids in requested_claim_ids_by_payer.items()
+    )
+
+    start = perf_counter()
+    transaction_hash_futures = []
+    for payer_ethereum_address, claims_to_pay in claims_to_pay_by_payer.items():
+        for deposit_claim in claims_to_pay:
+            try:
+                transaction_hash_future = _submit_payment_transaction(deposit_claim)
+            except Exception:  # pylint: disable=broad-except
+                # Nothing has been sent yet, so the claim can be safely queued again.
+                log(
+                    logger,
+                    f'Preparing transaction for DepositClaim {deposit_claim.pk} failed. The claim has been queued again.',
+                    subtask_id=deposit_claim.subtask_id,
+                    logging_level=LoggingLevel.EXCEPTION,
+                )
+                request_payment_finalization(deposit_claim)
+                continue
+            transaction_hash_futures.append((payer_ethereum_address, deposit_claim, transaction_hash_future))
+
+    number_of_submitted_transactions = 0
+    payer_latencies: Dict[str, float] = {}
+    for payer_ethereum_address, deposit_claim, transaction_hash_future in transaction_hash_futures:
+        try:
+            ethereum_transaction_hash = transaction_hash_future.result()
+        except Exception:  # pylint: disable=broad-except
+            # The transaction may have been sent anyway, so the claim is not queued again.
+            log(
+                logger,
+                f'Submitting transaction for DepositClaim {deposit_claim.pk} failed. The claim has to be finalized manually.',
+                subtask_id=deposit_claim.subtask_id,
+                logging_level=LoggingLevel.EXCEPTION,
+            )
+            continue
+        store_payment_transaction_hash(deposit_claim, ethereum_transaction_hash)
+        payer_latencies[payer_ethereum_address] = perf_counter() - start
+        number_of_submitted_transactions += 1
+
+    for payer_ethereum_address, requested_claim_ids in requested_claim_ids_by_payer.items():
+        log(
+            logger,
+            f'Finalized batch of deposit claims against {payer_ethereum_address}. '
+            f'Requested claims: {len(requested_claim_ids)}. '
+            f'Claims paid out: {len(claims_to_pay_by_payer[payer_ethereum_address])}. '
+            f'Latency: {payer_latencies.get(payer_ethereum_address, 0.0):.3f} s.',
+        )
+
+    return number_of_submitted_transactions
+
+
+def _reserve_funds_for_requested_claims(
+    payer_deposit_account_id: int,
+    requested_claim_ids: List[int],
+    available_funds: int,
+) -> List[DepositClaim]:
+    """
+    Takes DepositClaims of a single payer off the finalization queue and lowers their amounts, oldest first,
+    to what can still be paid out of available funds. Claims for which nothing is left are removed.
+    Claims already taken off the queue by another run are skipped. Returns the claims which should be paid out.
+    """
+    # Bankster begins a database transaction and puts a database lock on the DepositAccount object.
+    with non_nesting_atomic(using='control'):
+        payer_deposit_account = DepositAccount.objects.select_for_update().get(pk=payer_deposit_account_id)
+
+        deposit_claims = list(
+            DepositClaim.objects.select_for_update().filter(
+                pk__in=requested_claim_ids,
+                finalization_requested_at__isnull=False,
+                tx_hash__isnull=True,
+            ).order_by(
+                'finalization_requested_at',
+                'id',
+            )
+        )
+
+        # Bankster takes the total of all other existing DepositClaims that have the same payer as the ones being
+        # processed and subtracts it from the amount of funds available in the deposit.
+        sum_of_other_claims = payer_deposit_account.total_claimed - sum(deposit_claim.amount for deposit_claim in deposit_claims)
+        remaining_funds = available_funds - sum_of_other_claims
+
+        claims_to_pay = []
+        for deposit_claim in deposit_claims:
+            if remaining_funds <= 0:
+                deposit_claim.delete()
+                continue
+
+            deposit_claim.amount = min(deposit_claim.amount, remaining_funds)
+            deposit_claim.finalization_requested_at = None
+            deposit_claim.full_clean()
+            deposit_claim.save()
+            remaining_funds -= deposit_claim.amount
+            claims_to_pay.append(deposit_claim)
+
+    return claims_to_pay
+
+
+def _submit_payment_transaction(deposit_claim: DepositClaim) -> Future:
+    # Database is only read here, in the calling thread. Worker threads only communicate with the Ethereum client.
+    (submit_transaction, transaction_arguments) = get_payment_transaction(deposit_claim)
+    return _submit_to_executor(payment_transactions_executor, submit_transaction, **transaction_arguments)
 
 
 def settle_overdue_acceptances(
@@ -306,42 +492,51 @@ def settle_overdue_acceptances(
 
     validate_list_of_transaction_timestamp(acceptances)
 
-    requestor_client: Client = get_or_create_with_retry(Client, public_key=requestor_public_key)
+    requestor_client: Client = Client.objects.get_or_create_full_clean(requestor_public_key)
 
-    requestor_deposit_account: DepositAccount = get_or_create_with_retry(
-        DepositAccount,
+    requestor_deposit_account: DepositAccount = DepositAccount.objects.get_or_create_full_clean(
         client=requestor_client,
         ethereum_address=requestor_ethereum_address
     )
 
+    # Concent defines time T0 equal to oldest payment_ts from passed SubtaskResultAccepted messages from
+    # subtask_results_accepted_list.
+    oldest_payments_ts = min(subtask_results_accepted.payment_ts for subtask_results_accepted in acceptances)
+
+    # Queries to the payment backend are independent from each other and from the state of the database,
+    # so they are run concurrently and before the DepositAccount is locked.
     # Bankster asks SCI about the amount of funds available in requestor's deposit.
-    requestor_deposit_value = service.get_deposit_value(client_eth_address=requestor_ethereum_address)  # pylint: disable=no-value-for-parameter
+    requestor_deposit_value_future = submit_payment_query(
+        service.get_deposit_value,
+        client_eth_address=requestor_ethereum_address,
+    )
+    # Concent gets list of forced payments from payment API where T0 <= payment_ts + PAYMENT_DUE_TIME.
+    list_of_settlement_payments_future = submit_payment_query(
+        service.get_list_of_payments,
+        requestor_eth_address=requestor_ethereum_address,
+        provider_eth_address=provider_ethereum_address,
+        min_block_timestamp=oldest_payments_ts,
+        transaction_type=TransactionType.SETTLEMENT,
+    )
+    # Concent gets list of transactions from payment API where timestamp >= T0.
+    list_of_transactions_future = submit_payment_query(
+        service.get_list_of_payments,
+        requestor_eth_address=requestor_ethereum_address,
+        provider_eth_address=provider_ethereum_address,
+        min_block_timestamp=oldest_payments_ts,
+        transaction_type=TransactionType.BATCH,
+    )
+    requestor_deposit_value = requestor_deposit_value_future.result()
+    list_of_settlement_payments = list_of_settlement_payments_future.result()
+    list_of_transactions = list_of_transactions_future.result()
 
     # Bankster begins a database transaction and puts a database lock on the DepositAccount object.
     with non_nesting_atomic(using='control'):
-        DepositAccount.objects.select_for_update().get(
+        # Account is reloaded so that the total of existing claims is read under the lock.
+        requestor_deposit_account = DepositAccount.objects.select_for_update().get(
             pk=requestor_deposit_account.pk
         )
 
-        # Bankster sums the amounts of all existing DepositClaims that have the same payer as the one being processed.
-        sum_of_existing_requestor_claims = DepositClaim.objects.filter(
-            payer_deposit_account=requestor_deposit_account
-        ).aggregate(
-            sum_of_existing_claims=Coalesce(Sum('amount'), 0)
-        )
-
-        # Concent defines time T0 equal to oldest payment_ts from passed SubtaskResultAccepted messages from
-        # subtask_results_accepted_list.
-        oldest_payments_ts = min(subtask_results_accepted.payment_ts for subtask_results_accepted in acceptances)
-
-        # Concent gets list of forced payments from payment API where T0 <= payment_ts + PAYMENT_DUE_TIME.
-        list_of_settlement_payments = service.get_list_of_payments(  # pylint: disable=no-value-for-parameter
-            requestor_eth_address=requestor_ethereum_address,
-            provider_eth_address=provider_ethereum_address,
-            min_block_timestamp=oldest_payments_ts,
-            transaction_type=TransactionType.SETTLEMENT,
-        )
-
         already_satisfied_claims_without_duplicates = find_unconfirmed_settlement_payments(
             list_of_settlement_payments,
             requestor_deposit_account,
@@ -349,14 +544,6 @@ def settle_overdue_acceptances(
             oldest_payments_ts,
         )
 
-        # Concent gets list of transactions from payment API where timestamp >= T0.
-        list_of_transactions = service.get_list_of_payments(  # pylint: disable=no-value-for-parameter
-            requestor_eth_address=requestor_ethereum_address,
-            provider_eth_address=provider_ethereum_address,
-            min_block_timestamp=oldest_payments_ts,
-            transaction_type=TransactionType.BATCH,
-        )
-
         (_amount_paid, amount_pending) = get_provider_payment_info(
             list_of_settlement_payments=list_of_settlement_payments,
             list_of_transactions=list_of_transactions,
@@ -370,7 +557,7 @@ def settle_overdue_acceptances(
         # If the whole amount can't be paid, Concent lowers it to pay as much as possible.
         requestor_payable_amount = min(
             amount_pending,
-            requestor_deposit_value - sum_of_existing_requestor_claims['sum_of_existing_claims'],
+            requestor_deposit_value - requestor_deposit_account.total_claimed,
         )
 
         logger.info(
@@ -0,0 +1,74 @@
+from threading import Lock
+from time import monotonic
+from typing import Callable
+from typing import Dict
+from typing import Optional
+
+
+class DepositValueCache:
+    """
+    Remembers deposit values read from the blockchain, keyed by client's Ethereum address and the number of the latest
+    confirmed block. All values are discarded as soon as a different block number is seen, so a value is never
+    returned for a block other than the one it was read in. Value of a single deposit can also be discarded
+    explicitly, e.g. when Concent sends a transaction which changes it.
+
+    Checking the number of the latest block requires a request to the Ethereum node too, so the number is remembered
+    for `block_number_timeout` seconds. It should be well below the time between blocks.
+    """
+
+    def __init__(self, block_number_timeout: float) -> None:
+        assert block_number_timeout >= 0
+        self._block_number_timeout = block_number_timeout
+        self._lock = Lock()
+        self._block_number: Optional[int] = None
+        self._block_number_checked_at = 0.0
+        self._deposit_values: Dict[str, int] = {}
+        # Incremented whenever cached values are discarded. Value read from the blockchain before that is not cached.
+        self._version = 0
+
+    def get_deposit_value(
+        self,
+        client_eth_address: str,
+        get_latest_block_number: Callable[[], int],
+        get_deposit_value: Callable[[str], int],
+    ) -> int:
+        address = client_eth_address.lower()
+        block_number = self._get_block_number(get_latest_block_number)
+        with self._lock:
+            if self._block_number == block_number and address in self._deposit_values:
+                return self._deposit_values[address]
+            version = self._version
+
+        deposit_value = get_deposit_value(client_eth_address)
+
+        with self._lock:
+            if self._version == version:
+                self._deposit_values[address] = deposit_value
+        return deposit_value
+
+    def invalidate(self, client_eth_address: str) -> None:
+        with self._lock:
+            self._deposit_values.pop(client_eth_address.lower(), None)
+            self._version += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._block_number = None
+            self._deposit_values.clear()
+            self._version += 1
+
+    def _get_block_number(self, get_latest_block_number: Callable[[], int]) -> int:
+        now = monotonic()
+        with self._lock:
+            if self._block_number is not None and now - self._block_number_checked_at < self._block_number_timeout:
+                return self._block_number
+
+        block_number = get_latest_block_number()
+
+        with self._lock:
+            if block_number != self._block_number:
+                self._block_number = block_number
+                self._deposit_values.clear()
+                self._version += 1
+            self._block_number_checked_at = now
+        return block_number
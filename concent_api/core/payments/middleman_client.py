@@ -0,0 +1,238 @@
+from logging import getLogger
+from queue import Empty
+from queue import Queue
+from typing import Dict
+from typing import List
+from typing import Optional
+import os
+import socket
+import threading
+
+from django.conf import settings
+
+from common.logging import log
+from common.logging import LoggingLevel
+from core.constants import MIDDLEMAN_CLIENT_MAXIMUM_NUMBER_OF_CONNECTIONS
+from core.constants import SCI_CALLBACK_MAXIMUM_TIMEOUT
+from core.exceptions import SCICallbackTimeoutError
+
+from middleman_protocol.constants import FRAME_PAYLOAD_STARTING_BYTE
+from middleman_protocol.constants import FRAME_REQUEST_ID_BYTES_LENGTH
+from middleman_protocol.constants import FRAME_SIGNATURE_BYTES_LENGTH
+from middleman_protocol.message import GolemMessageFrame
+from middleman_protocol.stream import append_frame_separator
+from middleman_protocol.stream import escape_encode_raw_message
+from middleman_protocol.stream import unescape_stream
+
+logger = getLogger(__name__)
+
+
+def get_request_id_from_raw_frame(raw_frame: bytes) -> Optional[int]:
+    """
+    Reads request_id from the header of unescaped frame without verifying its signature or deserializing its payload.
+    Returns None if the frame is too short to contain the header.
+    """
+    if len(raw_frame) < FRAME_PAYLOAD_STARTING_BYTE:
+        return None
+    return int.from_bytes(
+        raw_frame[FRAME_SIGNATURE_BYTES_LENGTH:FRAME_SIGNATURE_BYTES_LENGTH + FRAME_REQUEST_ID_BYTES_LENGTH],
+        byteorder='big',
+    )
+
+
+def get_payload_type_from_raw_frame(raw_frame: bytes) -> Optional[int]:
+    """
+    Reads payload type from the header of unescaped frame without verifying its signature or deserializing its payload.
+    Returns None if the frame is too short to contain the header.
+    """
+    if len(raw_frame) < FRAME_PAYLOAD_STARTING_BYTE:
+        return None
+    return raw_frame[FRAME_SIGNATURE_BYTES_LENGTH + FRAME_REQUEST_ID_BYTES_LENGTH]
+
+
+class MiddleManConnection:
+    """
+    Single long-lived connection to MiddleMan. Requests from many threads can be sent over it at the same time,
+    because MiddleMan responds to each frame with a frame carrying the same request_id. A reader thread splits
+    the incoming stream into frames and hands each of them over to the request waiting for it.
+    If the connection breaks, all requests waiting for responses fail and the connection is not used anymore.
+    """
+
+    def __init__(self, address: str, port: int) -> None:
+        self._pending_responses: Dict[int, Queue] = {}
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+        self.is_open = True
+
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, True)
+        self._socket.settimeout(SCI_CALLBACK_MAXIMUM_TIMEOUT)
+        try:
+            self._socket.connect((address, port))
+        except Exception:
+            self._socket.close()
+            raise
+        # The connection stays idle between requests, so only waiting for a particular response is limited in time.
+        self._socket.settimeout(None)
+
+        self._reader = threading.Thread(target=self._read_responses, name='MiddleManConnectionReader', daemon=True)
+        self._reader.start()
+
+    @property
+    def number_of_pending_requests(self) -> int:
+        return len(self._pending_responses)
+
+    def send_request(self, middleman_message: GolemMessageFrame, private_key: bytes, timeout: float) -> bytes:
+        """ Sends Frame to MiddleMan and waits for the response with the same request_id. Returns raw Frame as bytes. """
+        response_queue: Queue = Queue(maxsize=1)
+        with self._lock:
+            if not self.is_open:
+                raise SCICallbackTimeoutError('Connection with MiddleMan has been closed.')
+            assert middleman_message.request_id not in self._pending_responses
+            self._pending_responses[middleman_message.request_id] = response_queue
+
+        try:
+            raw_request = append_frame_separator(escape_encode_raw_message(middleman_message.serialize(private_key=private_key)))
+            try:
+                with self._send_lock:
+                    self._socket.sendall(raw_request)
+            except OSError as exception:
+                # Part of the frame may have been sent, so the stream cannot be used for other frames anymore.
+                self.close()
+                raise SCICallbackTimeoutError() from exception
+
+            try:
+                raw_response = response_queue.get(timeout=timeout)
+            except Empty as exception:
+                raise SCICallbackTimeoutError() from exception
+        finally:
+            with self._lock:
+                self._pending_responses.pop(middleman_message.request_id, None)
+
+        if raw_response is None:
+            raise SCICallbackTimeoutError('Connection with MiddleMan has been closed before the response was received.')
+        return raw_response
+
+    def close(self) -> None:
+        with self._lock:
+            if not self.is_open:
+                return
+            self.is_open = False
+            pending_responses = list(self._pending_responses.values())
+            self._pending_responses.clear()
+
+        # Shutting the socket down wakes up the reader thread if it is blocked on receiving data.
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._socket.close()
+
+        for response_queue in pending_responses:
+            response_queue.put(None)
+
+    def _read_responses(self) -> None:
+        try:
+            for raw_response in unescape_stream(connection=self._socket):
+                if raw_response is None:
+                    log(logger, 'Received frame with broken escaping from MiddleMan. Ignoring it.', logging_level=LoggingLevel.WARNING)
+                    continue
+
+                request_id = get_request_id_from_raw_frame(raw_response)
+                with self._lock:
+                    response_queue = self._pending_responses.pop(request_id, None)  # type: ignore
+
+                if response_queue is None:
+                    log(
+                        logger,
+                        f'Received response from MiddleMan with request_id {request_id} which no request is waiting for. Ignoring it.',
+                        logging_level=LoggingLevel.WARNING,
+                    )
+                    continue
+                response_queue.put(raw_response)
+        except OSError:
+            pass
+        finally:
+            self.close()
+
+
+class MiddleManClient:
+    """
+    Thread-safe client which keeps up to `maximum_number_of_connections` connections to MiddleMan open and spreads
+    concurrent requests among them. A new connection is opened only when all open connections have requests
+    waiting for responses. Connections inherited from the parent process after fork are not used.
+    """
+
+    def __init__(self, maximum_number_of_connections: int = MIDDLEMAN_CLIENT_MAXIMUM_NUMBER_OF_CONNECTIONS) -> None:
+        assert maximum_number_of_connections > 0
+        self.maximum_number_of_connections = maximum_number_of_connections
+        self._connections: List[MiddleManConnection] = []
+        # Connections are opened outside of the lock, so that requests can use already open connections in the
+        # meantime. Slots reserved for them count towards the maximum number of connections.
+        self._number_of_connections_being_opened = 0
+        self._lock = threading.Lock()
+        self._connection_added = threading.Condition(self._lock)
+        self._pid = os.getpid()
+
+    def send_request(self, middleman_message: GolemMessageFrame) -> bytes:
+        """ Sends Frame to MiddleMan through MiddleMan Protocol and receives response. Returns raw Frame as bytes. """
+        assert isinstance(middleman_message, GolemMessageFrame)
+
+        return self._get_connection().send_request(
+            middleman_message,
+            private_key=settings.CONCENT_PRIVATE_KEY,
+            timeout=SCI_CALLBACK_MAXIMUM_TIMEOUT,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            connections = self._connections
+            self._connections = []
+        for connection in connections:
+            connection.close()
+
+    def _get_connection(self) -> MiddleManConnection:
+        with self._connection_added:
+            while True:
+                if self._pid != os.getpid():
+                    # Reader threads do not survive fork, so sockets shared with the parent process must not be read here.
+                    self._connections = []
+                    self._number_of_connections_being_opened = 0
+                    self._pid = os.getpid()
+
+                self._connections = [connection for connection in self._connections if connection.is_open]
+                number_of_connections = len(self._connections) + self._number_of_connections_being_opened
+                least_busy_connection = min(
+                    self._connections,
+                    key=lambda connection: connection.number_of_pending_requests,
+                    default=None,
+                )
+                if least_busy_connection is not None and (
+                    least_busy_connection.number_of_pending_requests == 0 or
+                    number_of_connections >= self.maximum_number_of_connections
+                ):
+                    return least_busy_connection
+                if number_of_connections < self.maximum_number_of_connections:
+                    self._number_of_connections_being_opened += 1
+                    break
+                # All slots are taken by connections which are being opened.
+                self._connection_added.wait()
+
+        connection: Optional[MiddleManConnection] = None
+        try:
+            connection = MiddleManConnection(settings.MIDDLEMAN_ADDRESS, settings.MIDDLEMAN_PORT)
+        except socket.timeout as exception:
+            raise SCICallbackTimeoutError('Connecting to MiddleMan has timed out.') from exception
+        finally:
+            with self._connection_added:
+                self._number_of_connections_being_opened -= 1
+                if connection is not None:
+                    self._connections.append(connection)
+                # Requests waiting for a slot are woken up also if opening failed, so that one of them can try again.
+                self._connection_added.notify_all()
+        assert connection is not None
+        return connection
+
+
+middleman_client = MiddleManClient()
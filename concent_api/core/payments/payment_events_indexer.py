@@ -0,0 +1,217 @@
+from logging import getLogger
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from django.db.models import Max
+
+from common.decorators import non_nesting_atomic
+from common.logging import log
+from core.constants import PAYMENT_EVENTS_INDEXER_INITIAL_BLOCK_RANGE
+from core.constants import PAYMENT_EVENTS_INDEXER_MAXIMUM_BLOCK_RANGE
+from core.models import BlockTimestamp
+from core.models import PaymentEvent
+from core.models import PaymentEventIndexState
+from core.utils import BlocksHelper
+
+logger = getLogger(__name__)
+
+
+# Maps event type to the name of SCI method which lists events of this type and to the names of event attributes
+# holding the payer and the payee.
+SCI_EVENT_SOURCES: Dict[PaymentEvent.EventType, Tuple[str, str, str]] = {
+    PaymentEvent.EventType.BATCH:                  ('get_batch_transfers',         'sender',    'receiver'),
+    PaymentEvent.EventType.FORCED_SUBTASK_PAYMENT: ('get_forced_subtask_payments', 'requestor', 'provider'),
+    PaymentEvent.EventType.SETTLEMENT:             ('get_forced_payments',         'requestor', 'provider'),
+}
+
+
+def get_latest_indexable_block_number(payment_interface: Any) -> int:
+    """ Returns number of the latest block which has enough confirmations to be indexed. """
+    return payment_interface.get_latest_confirmed_block_number() - payment_interface.REQUIRED_CONFS
+
+
+def index_payment_events(
+    payment_interface: Any,
+    maximum_block_range: int = PAYMENT_EVENTS_INDEXER_MAXIMUM_BLOCK_RANGE,
+) -> int:
+    """
+    Copies payment events and block timestamps from blocks following the last indexed block, up to the latest block
+    with enough confirmations, to the database. Blocks are processed in ranges of at most `maximum_block_range` blocks and each
+    range is stored together with the new high-water mark in a single transaction, so that an interrupted run
+    does not leave the index with missing or duplicated events. Returns the number of indexed blocks.
+
+    The Ethereum client is queried before the index state is locked, so that the lock is held only while storing
+    the results. If the state is locked by another run, this one ends right away instead of waiting for it.
+    """
+    assert maximum_block_range > 0
+
+    latest_indexable_block_number = get_latest_indexable_block_number(payment_interface)
+    number_of_indexed_blocks = 0
+
+    while True:
+        (from_block, to_block) = _get_block_range_to_index(
+            PaymentEventIndexState.objects.filter(pk=0).first(),
+            latest_indexable_block_number,
+            maximum_block_range,
+        )
+        if to_block < from_block:
+            break
+
+        payment_events = _get_payment_events_from_blockchain(payment_interface, from_block, to_block)
+        block_timestamps = _get_block_timestamps_from_blockchain(payment_interface, from_block, to_block)
+
+        with non_nesting_atomic(using='control'):
+            # Locking the state prevents concurrent runs of the indexer from storing the same events twice.
+            index_state = PaymentEventIndexState.objects.select_for_update(skip_locked=True).filter(pk=0).first()
+            if index_state is None and PaymentEventIndexState.objects.filter(pk=0).exists():
+                log(logger, 'Payment events are being indexed by another run of the indexer. Skipping.')
+                break
+
+            if _get_block_range_to_index(index_state, latest_indexable_block_number, maximum_block_range)[0] != from_block:
+                # Another run has indexed these blocks in the meantime.
+                continue
+
+            if index_state is None:
+                index_state = PaymentEventIndexState(
+                    first_indexed_block_number=from_block,
+                    last_indexed_block_number=from_block - 1,
+                )
+            PaymentEvent.objects.bulk_create(payment_events)
+            BlockTimestamp.objects.bulk_create(block_timestamps)
+
+            index_state.last_indexed_block_number = to_block
+            index_state.full_clean()
+            index_state.save()
+
+        log(
+            logger,
+            f'Indexed {len(payment_events)} payment events from blocks {from_block} to {to_block}.',
+        )
+        number_of_indexed_blocks += to_block - from_block + 1
+
+    return number_of_indexed_blocks
+
+
+def _get_block_range_to_index(
+    index_state: Optional[PaymentEventIndexState],
+    latest_indexable_block_number: int,
+    maximum_block_range: int,
+) -> Tuple[int, int]:
+    """ Returns the first and the last block of the next range to index. The range is empty if there is nothing to index. """
+    if index_state is None:
+        from_block = max(latest_indexable_block_number - PAYMENT_EVENTS_INDEXER_INITIAL_BLOCK_RANGE + 1, 0)
+    else:
+        from_block = index_state.last_indexed_block_number + 1
+    return (from_block, min(from_block + maximum_block_range - 1, latest_indexable_block_number))
+
+
+def get_indexed_payment_events(
+    event_type: PaymentEvent.EventType,
+    payer_ethereum_address: str,
+    payee_ethereum_address: str,
+    from_block: int,
+    to_block: int,
+) -> Tuple[Optional[List[PaymentEvent]], int]:
+    """
+    Returns indexed payment events of given type between given addresses from blocks in range
+    [from_block, to_block] and number of the first block from this range which has not been indexed yet.
+    Returns None instead of the list if the beginning of the range is not covered by the index, in which case
+    all events have to be read from the blockchain.
+    """
+    index_state = PaymentEventIndexState.objects.filter(pk=0).first()
+    if index_state is None or from_block < index_state.first_indexed_block_number:
+        return (None, from_block)
+
+    payment_events = list(
+        PaymentEvent.objects.filter(
+            event_type=event_type.name,
+            payer_ethereum_address=payer_ethereum_address.lower(),
+            payee_ethereum_address=payee_ethereum_address.lower(),
+            block_number__gte=from_block,
+            block_number__lte=min(to_block, index_state.last_indexed_block_number),
+        ).order_by('block_number', 'id')
+    )
+    return (payment_events, max(from_block, index_state.last_indexed_block_number + 1))
+
+
+def get_first_block_number_after(payment_interface: Any, timestamp: int) -> int:
+    """
+    Returns number of the block with smallest number for which `block.timestamp > timestamp` is satisfied or if
+    such block doesn't exist, number of the latest confirmed block. Indexed block timestamps are used where possible
+    and the Ethereum client is searched only if the block may be outside of the indexed range.
+    """
+    first_block_number_after = BlockTimestamp.objects.filter(
+        timestamp__gt=timestamp,
+    ).order_by(
+        'timestamp',
+        'block_number',
+    ).values_list('block_number', flat=True).first()
+
+    if first_block_number_after is None:
+        # All indexed blocks are older, so only blocks after the last indexed one have to be searched.
+        last_indexed_block_number = BlockTimestamp.objects.aggregate(Max('block_number'))['block_number__max']
+        return BlocksHelper(payment_interface).get_latest_existing_block_at(
+            timestamp,
+            last_indexed_block_number if last_indexed_block_number is not None else -1,
+        ).number
+
+    if first_block_number_after == 0 or BlockTimestamp.objects.filter(block_number=first_block_number_after - 1).exists():
+        return first_block_number_after
+
+    # Blocks preceding the first indexed block may be newer than given timestamp as well.
+    return BlocksHelper(payment_interface).get_latest_existing_block_at(timestamp).number
+
+
+def _get_block_timestamps_from_blockchain(payment_interface: Any, from_block: int, to_block: int) -> List[BlockTimestamp]:
+    return [
+        BlockTimestamp(
+            block_number=block_number,
+            timestamp=payment_interface.get_block_by_number(block_number).timestamp,
+        )
+        for block_number in range(from_block, to_block + 1)
+    ]
+
+
+def _get_payment_events_from_blockchain(payment_interface: Any, from_block: int, to_block: int) -> List[PaymentEvent]:
+    """
+    Reads payment events of all types between all addresses from given range of blocks. Blocks of the events
+    are taken from transaction receipts, because events returned by SCI do not contain them.
+    """
+    block_numbers: Dict[str, int] = {}
+    payment_events = []
+
+    for event_type, (sci_method_name, payer_attribute_name, payee_attribute_name) in SCI_EVENT_SOURCES.items():
+        # Passing None as an address matches events with any address.
+        sci_events = getattr(payment_interface, sci_method_name)(
+            None,
+            None,
+            from_block=from_block,
+            to_block=to_block,
+        )
+        for sci_event in sci_events:
+            if sci_event.tx_hash not in block_numbers:
+                block_numbers[sci_event.tx_hash] = payment_interface.get_transaction_receipt(sci_event.tx_hash).block_number
+            payment_events.append(
+                PaymentEvent(
+                    event_type=event_type.name,
+                    block_number=block_numbers[sci_event.tx_hash],
+                    tx_hash=sci_event.tx_hash,
+                    payer_ethereum_address=getattr(sci_event, payer_attribute_name).lower(),
+                    payee_ethereum_address=getattr(sci_event, payee_attribute_name).lower(),
+                    amount=sci_event.amount,
+                    closure_time=getattr(sci_event, 'closure_time', None),
+                    subtask_id=_get_subtask_id(sci_event),
+                )
+            )
+
+    return payment_events
+
+
+def _get_subtask_id(sci_event: Any) -> Optional[str]:
+    subtask_id = getattr(sci_event, 'subtask_id', None)
+    if isinstance(subtask_id, bytes):
+        return '0x' + subtask_id.hex()
+    return subtask_id
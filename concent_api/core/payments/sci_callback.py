@@ -1,6 +1,3 @@
-from contextlib import closing
-import socket
-
 from bitcoin import ecdsa_raw_verify
 from ethereum.utils import sha3
 from ethereum.transactions import UnsignedTransaction
@@ -13,7 +10,6 @@ from django.conf import settings
 
 from common.helpers import generate_ethereum_address_from_ethereum_public_key_bytes
 from common.helpers import RequestIDGenerator
-from core.constants import SCI_CALLBACK_MAXIMUM_TIMEOUT
 from core.decorators import retry_middleman_connection_if_not_pass_timeout
 from core.exceptions import SCICallbackFrameError
 from core.exceptions import SCICallbackPayloadError
@@ -21,15 +17,24 @@ from core.exceptions import SCICallbackPayloadSignatureError
 from core.exceptions import SCICallbackRequestIdError
 from core.exceptions import SCICallbackTimeoutError
 from core.exceptions import SCICallbackTransactionSignatureError
+from core.payments.middleman_client import get_payload_type_from_raw_frame
+from core.payments.middleman_client import middleman_client
 
 from middleman_protocol.concent_golem_messages.message import SignedTransaction
 from middleman_protocol.concent_golem_messages.message import TransactionRejected
 from middleman_protocol.concent_golem_messages.message import TransactionSigningRequest
+from middleman_protocol.constants import ErrorCode
+from middleman_protocol.constants import PayloadType
 from middleman_protocol.exceptions import MiddlemanProtocolError
 from middleman_protocol.message import ErrorFrame
 from middleman_protocol.message import GolemMessageFrame
-from middleman_protocol.stream import send_over_stream
-from middleman_protocol.stream import unescape_stream
+
+# MiddleMan responds with ErrorFrame with one of these codes when Signing Service has not responded to the request.
+# The request may succeed if it is sent again, like when no response is received at all.
+MIDDLEMAN_ERROR_CODES_TO_RETRY = {
+    ErrorCode.ConnectionTimeout,
+    ErrorCode.MessageLost,
+}
 
 
 def sci_callback(transaction: Transaction) -> Transaction:
@@ -90,31 +95,40 @@ def create_transaction_signing_request(transaction: Transaction) -> TransactionS
 @retry_middleman_connection_if_not_pass_timeout
 def send_request_to_middleman(middleman_message: GolemMessageFrame) -> bytes:
     """
-    Opens socket connection to Middleman, sends Frame to MiddleMan through MiddleMan Protocol and receive response.
+    Sends Frame to MiddleMan through MiddleMan Protocol over a connection shared with other requests
+    and receives response.
 
     Returns raw Frame as bytes.
     """
 
     assert isinstance(middleman_message, GolemMessageFrame)
 
-    with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as client_socket:
-        client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
-        client_socket.connect((settings.MIDDLEMAN_ADDRESS, settings.MIDDLEMAN_PORT))
-        client_socket.settimeout(SCI_CALLBACK_MAXIMUM_TIMEOUT)
-
-        # Send the TransactionSigningRequest.
-        try:
-            send_over_stream(
-                connection=client_socket,
-                raw_message=middleman_message,
-                private_key=settings.CONCENT_PRIVATE_KEY,
-            )
-
-            # Read the response and close the connection.
-            return next(unescape_stream(connection=client_socket))
-        # Connection with Middleman times out before a complete response is received.
-        except socket.timeout as exception:
-            raise SCICallbackTimeoutError() from exception
+    raw_response = middleman_client.send_request(middleman_message)
+
+    # Only ErrorFrames have to be inspected here, so other responses are deserialized and verified only once,
+    # in deserialize_response_and_handle_errors().
+    if get_payload_type_from_raw_frame(raw_response) != PayloadType.ERROR:
+        return raw_response
+
+    try:
+        deserialized_message = GolemMessageFrame.deserialize(
+            raw_message=raw_response,
+            public_key=settings.CONCENT_PUBLIC_KEY,
+        )
+    # Invalid responses are handled in deserialize_response_and_handle_errors().
+    except (MiddlemanProtocolError, MessageError):
+        return raw_response
+
+    if (
+        isinstance(deserialized_message, ErrorFrame) and
+        deserialized_message.request_id == middleman_message.request_id and
+        deserialized_message.payload[0] in MIDDLEMAN_ERROR_CODES_TO_RETRY
+    ):
+        raise SCICallbackTimeoutError(
+            f'MiddleMan has not received response from Signing Service: {deserialized_message.payload[1]}'
+        )
+
+    return raw_response
 
 
 def deserialize_response_and_handle_errors(raw_response: bytes, request_id: int) -> SignedTransaction:
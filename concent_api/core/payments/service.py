@@ -6,7 +6,13 @@ import importlib
 from django.conf import settings
 from ethereum.transactions import Transaction
 
+from core.constants import DEPOSIT_VALUE_CACHE_BLOCK_NUMBER_TIMEOUT
 from core.payments.backends.sci_backend import TransactionType
+from core.payments.deposit_value_cache import DepositValueCache
+from core.payments.synchronization_status_cache import SynchronizationStatus
+
+# Deposit values are read several times while handling a single request, often for the same clients.
+deposit_value_cache = DepositValueCache(block_number_timeout=DEPOSIT_VALUE_CACHE_BLOCK_NUMBER_TIMEOUT)
 
 
 def _add_backend(func: Callable) -> Callable:
@@ -51,17 +57,20 @@ def make_settlement_payment(
     s: List[bytes],
     reimburse_amount: int,
 ) -> Transaction:
-    return backend.make_settlement_payment(
-        requestor_eth_address=requestor_eth_address,
-        provider_eth_address=provider_eth_address,
-        value=value,
-        subtask_ids=subtask_ids,
-        closure_time=closure_time,
-        v=v,
-        r=r,
-        s=s,
-        reimburse_amount=reimburse_amount,
-    )
+    try:
+        return backend.make_settlement_payment(
+            requestor_eth_address=requestor_eth_address,
+            provider_eth_address=provider_eth_address,
+            value=value,
+            subtask_ids=subtask_ids,
+            closure_time=closure_time,
+            v=v,
+            r=r,
+            s=s,
+            reimburse_amount=reimburse_amount,
+        )
+    finally:
+        deposit_value_cache.invalidate(requestor_eth_address)
 
 
 @_add_backend
@@ -69,9 +78,27 @@ def get_transaction_count(backend: Any) -> int:
     return backend.get_transaction_count()
 
 
+@_add_backend
+def get_synchronization_status(backend: Any) -> SynchronizationStatus:
+    """
+    Reports whether the Ethereum node is synchronized, according to the status cached by the backend,
+    and how many seconds ago the latest confirmed block was mined.
+    """
+    return backend.get_synchronization_status()
+
+
+@_add_backend
+def index_payment_events(backend: Any) -> int:
+    return backend.index_payment_events()
+
+
 @_add_backend
 def get_deposit_value(backend: Any, client_eth_address: str) -> int:
-    return backend.get_deposit_value(client_eth_address)
+    return deposit_value_cache.get_deposit_value(
+        client_eth_address,
+        get_latest_block_number=backend.get_latest_confirmed_block_number,
+        get_deposit_value=backend.get_deposit_value,
+    )
 
 
 @_add_backend
@@ -86,16 +113,19 @@ def force_subtask_payment(
     s: bytes,
     reimburse_amount: int,
 ) -> str:
-    return backend.force_subtask_payment(
-        requestor_eth_address=requestor_eth_address,
-        provider_eth_address=provider_eth_address,
-        value=value,
-        subtask_id=subtask_id,
-        v=v,
-        r=r,
-        s=s,
-        reimburse_amount=reimburse_amount,
-    )
+    try:
+        return backend.force_subtask_payment(
+            requestor_eth_address=requestor_eth_address,
+            provider_eth_address=provider_eth_address,
+            value=value,
+            subtask_id=subtask_id,
+            v=v,
+            r=r,
+            s=s,
+            reimburse_amount=reimburse_amount,
+        )
+    finally:
+        deposit_value_cache.invalidate(requestor_eth_address)
 
 
 @_add_backend
@@ -109,15 +139,18 @@ def cover_additional_verification_cost(
     s: bytes,
     reimburse_amount: int,
 ) -> Transaction:
-    return backend.cover_additional_verification_cost(
-        provider_eth_address=provider_eth_address,
-        value=value,
-        subtask_id=subtask_id,
-        v=v,
-        r=r,
-        s=s,
-        reimburse_amount=reimburse_amount,
-    )
+    try:
+        return backend.cover_additional_verification_cost(
+            provider_eth_address=provider_eth_address,
+            value=value,
+            subtask_id=subtask_id,
+            v=v,
+            r=r,
+            s=s,
+            reimburse_amount=reimburse_amount,
+        )
+    finally:
+        deposit_value_cache.invalidate(provider_eth_address)
 
 
 @_add_backend
@@ -1,6 +1,8 @@
-import logging
 from typing import Callable
 from typing import List
+from typing import Optional
+import logging
+import threading
 
 from eth_utils import encode_hex
 from ethereum.transactions import Transaction
@@ -10,6 +12,7 @@ from golem_sci.transactionsstorage import TransactionsStorage
 from common.decorators import non_nesting_atomic
 from core.models import GlobalTransactionState
 from core.models import PendingEthereumTransaction
+from core.models import ReleasedNonce
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +21,18 @@ class DatabaseTransactionsStorage(TransactionsStorage):
     """
     Concent custom implementation of TransactionsStorage interface used to store Ethereum transaction data into
     database using Django models.
+
+    Nonces are reserved in a short transaction holding the lock on GlobalTransactionState, and transactions are signed
+    and saved after the lock is released, so that several threads or processes can wait for signatures at the same
+    time. A reserved nonce whose transaction is never saved or is reverted is released, to be reserved again
+    before any new nonce. One instance is shared by all threads of the process.
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        # Nonce of the last transaction saved by each thread. It is the one reverted by revert_last_tx().
+        self._last_saved_nonce = threading.local()
+
     def init(self, network_nonce: int) -> None:
         if not self._is_storage_initialized():
             self._init_with_nonce(network_nonce)
@@ -35,6 +48,8 @@ class DatabaseTransactionsStorage(TransactionsStorage):
                 global_transaction_state.nonce = network_nonce
                 global_transaction_state.full_clean()
                 global_transaction_state.save()
+                # Nonces below the network nonce have already been used by transactions on the blockchain.
+                ReleasedNonce.objects.filter(nonce__lt=network_nonce).delete()
 
     def _is_storage_initialized(self) -> bool:
         """
@@ -93,10 +108,10 @@ class DatabaseTransactionsStorage(TransactionsStorage):
         Sets the next nonce for the transaction, invokes the callback for
         signing and saves it to the storage.
         """
-        tx.nonce = self._get_nonce()
+        tx.nonce = self._reserve_nonce()
 
-        with non_nesting_atomic(using='control'):
-            global_transaction_state = self._get_locked_global_transaction_state()
+        try:
+            # Signing may require a round-trip to the Signing Service, so it is done without holding any lock.
             sign_tx(tx)
             logger.info(
                 'Saving transaction %s, nonce=%d',
@@ -104,23 +119,63 @@ class DatabaseTransactionsStorage(TransactionsStorage):
                 tx.nonce,
             )
 
-            pending_ethereum_transaction = PendingEthereumTransaction(
-                nonce=tx.nonce,
-                gasprice=tx.gasprice,
-                startgas=tx.startgas,
-                value=tx.value,
-                v=tx.v,
-                r=tx.r,
-                s=tx.s,
-                data=tx.data,
-                to=tx.to,
-            )
-            pending_ethereum_transaction.full_clean()
-            pending_ethereum_transaction.save()
+            with non_nesting_atomic(using='control'):
+                pending_ethereum_transaction = PendingEthereumTransaction(
+                    nonce=tx.nonce,
+                    gasprice=tx.gasprice,
+                    startgas=tx.startgas,
+                    value=tx.value,
+                    v=tx.v,
+                    r=tx.r,
+                    s=tx.s,
+                    data=tx.data,
+                    to=tx.to,
+                )
+                pending_ethereum_transaction.full_clean()
+                pending_ethereum_transaction.save()
+        except BaseException:
+            self._release_nonce(tx.nonce)
+            raise
+
+        self._last_saved_nonce.value = tx.nonce
+
+    @non_nesting_atomic(using='control')
+    def _reserve_nonce(self) -> int:
+        """ Returns the lowest released nonce or, if there is none, the next unused nonce. """
+        global_transaction_state = self._get_locked_global_transaction_state()
+
+        released_nonce = ReleasedNonce.objects.order_by('nonce').first()
+        if released_nonce is not None:
+            released_nonce.delete()
+            return int(released_nonce.nonce)
+
+        nonce = int(global_transaction_state.nonce)
+        global_transaction_state.nonce += 1
+        global_transaction_state.full_clean()
+        global_transaction_state.save()
+        return nonce
+
+    @non_nesting_atomic(using='control')
+    def _release_nonce(self, nonce: int) -> None:
+        self._release_nonce_under_lock(self._get_locked_global_transaction_state(), nonce)
+
+    @staticmethod
+    def _release_nonce_under_lock(global_transaction_state: GlobalTransactionState, nonce: int) -> None:
+        """
+        Makes reserved nonce available again. If it is the last reserved nonce, the next unused nonce is lowered instead,
+        also below any released nonces directly preceding it, so that released nonces do not accumulate at the end.
+        """
+        if nonce != global_transaction_state.nonce - 1:
+            released_nonce = ReleasedNonce(nonce=nonce)
+            released_nonce.full_clean()
+            released_nonce.save()
+            return
 
-            global_transaction_state.nonce += 1
-            global_transaction_state.full_clean()
-            global_transaction_state.save()
+        global_transaction_state.nonce -= 1
+        while ReleasedNonce.objects.filter(nonce=global_transaction_state.nonce - 1).delete()[0] > 0:
+            global_transaction_state.nonce -= 1
+        global_transaction_state.full_clean()
+        global_transaction_state.save()
 
     @non_nesting_atomic(using='control')
     def remove_tx(self, nonce: int) -> None:
@@ -139,32 +194,34 @@ class DatabaseTransactionsStorage(TransactionsStorage):
         except PendingEthereumTransaction.DoesNotExist:
             logger.error(f'Trying to remove PendingEthereumTransaction with nonce {nonce} but it does not exist.')
 
-    @non_nesting_atomic(using='control')
     def revert_last_tx(self) -> None:
         """
         Remove the last transaction that was added.
         This shouldn't be ever called if everything is being used correctly,
         i.e. we don't try to send invalid transactions.
+
+        Transactions are saved concurrently, so the last transaction saved by the calling thread is reverted.
+        If the thread has not saved any, the transaction with the highest nonce is reverted.
         """
-        global_transaction_state = self._get_locked_global_transaction_state()
+        nonce: Optional[int] = getattr(self._last_saved_nonce, 'value', None)
+        self._last_saved_nonce.value = None
 
-        try:
-            pending_ethereum_transaction = PendingEthereumTransaction.objects.get(
-                nonce=global_transaction_state.nonce - 1
-            )
-            pending_ethereum_transaction.delete()
+        with non_nesting_atomic(using='control'):
+            global_transaction_state = self._get_locked_global_transaction_state()
+            if nonce is None:
+                nonce = int(global_transaction_state.nonce) - 1
 
-            global_transaction_state.nonce -= 1
-            global_transaction_state.full_clean()
-            global_transaction_state.save()
+            if PendingEthereumTransaction.objects.filter(nonce=nonce).delete()[0] == 0:
+                logger.error(
+                    f'Trying to revert last PendingEthereumTransaction with nonce {nonce} but it does not exist.'
+                )
+                return
 
-            logger.info(
-                f'Successfully reverted last PendingEthereumTransaction with nonce {pending_ethereum_transaction.nonce}.'
-            )
-        except PendingEthereumTransaction.DoesNotExist:
-            logger.error(
-                f'Trying to revert last PendingEthereumTransaction with nonce {global_transaction_state.nonce - 1} but it does not exist.'
-            )
+            self._release_nonce_under_lock(global_transaction_state, nonce)
+
+        logger.info(
+            f'Successfully reverted last PendingEthereumTransaction with nonce {nonce}.'
+        )
 
     @staticmethod
     def _get_locked_global_transaction_state() -> GlobalTransactionState:
@@ -0,0 +1,89 @@
+from logging import getLogger
+from threading import Lock
+from threading import Thread
+from time import monotonic
+from typing import Callable
+from typing import NamedTuple
+from typing import Optional
+
+from common.logging import log
+from common.logging import LoggingLevel
+
+logger = getLogger(__name__)
+
+
+SynchronizationStatus = NamedTuple(
+    "SynchronizationStatus",
+    [
+        ("is_synchronized", bool),
+        # Number of seconds since the latest confirmed block was mined.
+        ("lag", int),
+    ]
+)
+
+
+class SynchronizationStatusCache:
+    """
+    Remembers whether the Ethereum node used by SCI is synchronized, so that the check, which requires several
+    requests to the node, does not have to be made before every SCI function.
+
+    Positive status is used for `timeout` seconds. Once it is older than `refresh_interval` seconds, it is refreshed
+    in a background thread while callers keep using it, so a node which falls behind is noticed after at most
+    `refresh_interval` seconds plus the duration of a single check. Negative status is never used, so that requests
+    are not rejected for longer than the node actually needs to catch up.
+    """
+
+    def __init__(self, refresh_interval: float, timeout: float) -> None:
+        assert 0 <= refresh_interval <= timeout
+        self._refresh_interval = refresh_interval
+        self._timeout = timeout
+        self._lock = Lock()
+        self._is_synchronized: Optional[bool] = None
+        self._checked_at = 0.0
+        self._is_refreshing = False
+
+    def is_synchronized(self, check_synchronization: Callable[[], bool]) -> bool:
+        now = monotonic()
+        with self._lock:
+            if self._is_synchronized and now - self._checked_at < self._timeout:
+                if now - self._checked_at >= self._refresh_interval and not self._is_refreshing:
+                    self._is_refreshing = True
+                    Thread(
+                        target=self._refresh_in_background,
+                        args=(check_synchronization,),
+                        name='SynchronizationStatusRefresher',
+                        daemon=True,
+                    ).start()
+                return True
+
+        return self._refresh(check_synchronization)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._is_synchronized = None
+            self._checked_at = 0.0
+
+    def _refresh(self, check_synchronization: Callable[[], bool]) -> bool:
+        checked_at = monotonic()
+        is_synchronized = bool(check_synchronization())
+
+        with self._lock:
+            # Result of a check started earlier than the one already stored is out of date.
+            if checked_at >= self._checked_at:
+                self._is_synchronized = is_synchronized
+                self._checked_at = checked_at
+        return is_synchronized
+
+    def _refresh_in_background(self, check_synchronization: Callable[[], bool]) -> None:
+        try:
+            self._refresh(check_synchronization)
+        except Exception as exception:  # pylint: disable=broad-except
+            # Callers check the status themselves once the cached one times out.
+            log(
+                logger,
+                f'Refreshing SCI synchronization status failed: {exception}',
+                logging_level=LoggingLevel.WARNING,
+            )
+        finally:
+            with self._lock:
+                self._is_refreshing = False
@@ -0,0 +1,91 @@
+from hashlib import sha1
+from typing import Callable
+from typing import Dict
+from typing import Optional
+from typing import TypeVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+
+from core.constants import RECEIVE_CACHE_HITS_KEY
+from core.constants import RECEIVE_CACHE_INVALIDATION_TIMEOUT
+from core.constants import RECEIVE_CACHE_MISSES_KEY
+from core.constants import RECEIVE_CACHE_TIMEOUT
+
+T = TypeVar('T')
+
+# Values stored in the cache under the key of a client.
+NOTHING_PENDING = True
+INVALIDATED = False
+
+
+def _get_receive_cache() -> Optional[BaseCache]:
+    if settings.RECEIVE_CACHE_ALIAS is None:
+        return None
+    return caches[settings.RECEIVE_CACHE_ALIAS]
+
+
+def _get_receive_cache_key(client_public_key: bytes) -> str:
+    assert isinstance(client_public_key, bytes)
+    return f'receive_nothing_pending_{sha1(client_public_key).hexdigest()}'
+
+
+def _increment_counter(cache: BaseCache, key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Counter does not exist yet or has been evicted. If many processes create it at once, some hits can be lost.
+        cache.add(key, 1, timeout=None)
+
+
+def call_unless_nothing_pending(client_public_key: bytes, function: Callable[[], Optional[T]]) -> Optional[T]:
+    """
+    Returns None without calling the function if the client is remembered as having no pending messages.
+    Otherwise calls the function, which is expected to return a pending message or None if there are none, and
+    remembers the client if it returned None.
+    """
+    cache = _get_receive_cache()
+    if cache is None:
+        return function()
+
+    cache_key = _get_receive_cache_key(client_public_key)
+    cached_value = cache.get(cache_key)
+    if cached_value is NOTHING_PENDING:
+        _increment_counter(cache, RECEIVE_CACHE_HITS_KEY)
+        return None
+
+    _increment_counter(cache, RECEIVE_CACHE_MISSES_KEY)
+    result = function()
+    # If the entry was invalidated in the meantime, add() does not overwrite it. Entry invalidated before this request
+    # started is left to expire, because this request might have been started before the new message was committed.
+    if result is None and cached_value is None:
+        cache.add(cache_key, NOTHING_PENDING, timeout=RECEIVE_CACHE_TIMEOUT)
+    return result
+
+
+def invalidate_receive_cache(client_public_key: bytes) -> None:
+    """
+    Makes sure that the client is not remembered as having no pending messages. Must be called after a new message
+    for the client is committed to the database. Subtasks that time out are handled by the sweeper, which queues
+    messages with store_pending_message() and thus invalidates the cache as well.
+    """
+    cache = _get_receive_cache()
+    if cache is None:
+        return
+
+    cache.set(_get_receive_cache_key(client_public_key), INVALIDATED, timeout=RECEIVE_CACHE_INVALIDATION_TIMEOUT)
+
+
+def get_receive_cache_statistics() -> Dict[str, int]:
+    cache = _get_receive_cache()
+    if cache is None:
+        return {}
+
+    hits = cache.get(RECEIVE_CACHE_HITS_KEY, 0)
+    misses = cache.get(RECEIVE_CACHE_MISSES_KEY, 0)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'requests': hits + misses,
+    }
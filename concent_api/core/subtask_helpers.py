@@ -1,11 +1,16 @@
 from base64 import b64encode
 from logging import getLogger
 from typing import List
+from typing import NamedTuple
+from typing import Optional
+from typing import Tuple
 from typing import Union
+import datetime
 
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Q
+from django.db.models import QuerySet
 
 from golem_messages.message import Message
 from golem_messages.message.concents import ForcePayment
@@ -14,15 +19,18 @@ from golem_messages.message.tasks import SubtaskResultsAccepted
 from common.constants import ConcentUseCase
 from common.constants import ErrorCode
 from common.decorators import non_nesting_atomic
-from common.helpers import deserialize_message
 from common.helpers import get_current_utc_timestamp
 from common.helpers import parse_timestamp_to_utc_datetime
 from common.logging import log
+from common.logging import LoggingLevel
+from core.constants import TIMED_OUT_SUBTASKS_SWEEPER_BATCH_SIZE
 from core.exceptions import UnsupportedProtocolVersion
+from core.models import Client
 from core.models import DepositClaim
 from core.models import PendingResponse
 from core.models import Subtask
 from core.model_helpers import get_one_or_none
+from core.message_cache import deserialize_stored_message
 from core.payments import bankster
 from core.transfer_operations import store_pending_message
 from core.transfer_operations import verify_file_status
@@ -33,6 +41,19 @@ from core.validation import is_golem_message_signed_with_key
 logger = getLogger(__name__)
 
 
+# Position of the last subtask looked at by update_batch_of_timed_out_subtasks(): its (next_deadline, subtask_id).
+SubtaskSweepPosition = Tuple[datetime.datetime, str]
+
+TimedOutSubtasksBatch = NamedTuple(
+    "TimedOutSubtasksBatch",
+    [
+        ("number_of_processed_subtasks", int),
+        # None if there were no subtasks left to look at.
+        ("last_position", Optional[SubtaskSweepPosition]),
+    ]
+)
+
+
 def _update_timed_out_subtask(subtask: Subtask) -> None:
     """
     Function called for timed out subtasks - checks state and changes it from one of actives to one of passives
@@ -68,7 +89,7 @@ def _update_timed_out_subtask(subtask: Subtask) -> None:
             subtask=subtask,
         )
     elif subtask.state == Subtask.SubtaskState.FORCING_ACCEPTANCE.name:  # pylint: disable=no-member
-        task_to_compute = deserialize_message(subtask.task_to_compute.data.tobytes())
+        task_to_compute = deserialize_stored_message(subtask.task_to_compute)
         update_subtask_state(
             subtask=subtask,
             state=Subtask.SubtaskState.ACCEPTED.name,  # pylint: disable=no-member
@@ -115,7 +136,7 @@ def _update_timed_out_subtask(subtask: Subtask) -> None:
             subtask=subtask,
         )
     elif subtask.state == Subtask.SubtaskState.ADDITIONAL_VERIFICATION.name:  # pylint: disable=no-member
-        task_to_compute = deserialize_message(subtask.task_to_compute.data.tobytes())
+        task_to_compute = deserialize_stored_message(subtask.task_to_compute)
         update_subtask_state(
             subtask=subtask,
             state=Subtask.SubtaskState.ACCEPTED.name,  # pylint: disable=no-member
@@ -212,30 +233,113 @@ def pre_process_message_related_subtasks(
             update_subtasks_states(subtask, client_public_key)
 
 
+def _get_subtasks_to_update_query_set() -> QuerySet:
+    """
+    Returns active subtasks which are past their deadline or which are waiting only for the information that the result
+    has been uploaded to the storage cluster. Subtasks are ordered by deadline, so that the index on `next_deadline` can
+    be used and the most overdue subtasks are processed first.
+    """
+    return Subtask.objects.filter(
+        Q(next_deadline__lte=parse_timestamp_to_utc_datetime(get_current_utc_timestamp())) |
+        Q(state=Subtask.SubtaskState.FORCING_RESULT_TRANSFER.name, result_upload_finished=True),  # pylint: disable=no-member
+        state__in=[state.name for state in Subtask.ACTIVE_STATES],
+    ).order_by('next_deadline')
+
+
+def _update_locked_subtask(subtask: Subtask, client_public_key: bytes) -> None:
+    # Subtask may have been updated between selecting and locking it, so its state has to be checked again.
+    if subtask.state_enum not in Subtask.ACTIVE_STATES:
+        return
+
+    verify_file_status(subtask=subtask, client_public_key=client_public_key)
+
+    # Subtask may change it's state to passive (RESULT UPLOADED) in verify_file_status. In this case there
+    # is no need to call _update_timed_out_subtask any more. Next_deadline will be set to None, so it is
+    # necessary to check it before checking if deadline is exceeded.
+    if subtask.next_deadline is not None and subtask.next_deadline <= parse_timestamp_to_utc_datetime(get_current_utc_timestamp()):
+        _update_timed_out_subtask(subtask)
+
+
 def update_all_timed_out_subtasks_of_a_client(client_public_key: bytes) -> None:
     """
-    Function looks for all subtasks in active state of client. All found subtasks are processed in separate transactions,
-    locked in database, file status is verified (check additional conditions in verify_file_status) and subtask's state
-    is updated in _update_timed_out_subtask
+    Function looks for subtasks of client which are timed out or which have their result already uploaded. All found
+    subtasks are processed in separate transactions, locked in database, file status is verified (check additional
+    conditions in verify_file_status) and subtask's state is updated in _update_timed_out_subtask.
+    Subtasks locked by another transaction (e.g. by the timed out subtasks sweeper) are skipped.
     """
 
-    encoded_client_public_key = b64encode(client_public_key)
+    # Client is looked up in a subquery instead of a join so that the partial indexes on active subtasks of
+    # a requestor/provider can be used.
+    client_ids = Client.objects.filter(public_key=b64encode(client_public_key)).values('pk')
 
-    clients_subtask_list = Subtask.objects.filter(
-        Q(requestor__public_key=encoded_client_public_key) | Q(provider__public_key=encoded_client_public_key),
-        state__in=[state.name for state in Subtask.ACTIVE_STATES],
+    clients_subtask_ids = list(
+        _get_subtasks_to_update_query_set().filter(
+            Q(requestor__in=client_ids) | Q(provider__in=client_ids),
+        ).values_list('subtask_id', flat=True)
     )
-    # Check if files are uploaded for all clients subtasks. It is checked for all clients subtasks, not only timeouted.
-    for subtask in clients_subtask_list:
+    for subtask_id in clients_subtask_ids:
         with non_nesting_atomic(using='control'):
-            Subtask.objects.select_for_update().filter(subtask_id=subtask.subtask_id)
-            verify_file_status(subtask=subtask, client_public_key=client_public_key)
+            subtask = get_one_or_none(
+                model_or_query_set=Subtask.objects.select_for_update(skip_locked=True),
+                subtask_id=subtask_id,
+            )
+            if subtask is not None:
+                _update_locked_subtask(subtask, client_public_key)
+
 
-            # Subtask may change it's state to passive (RESULT UPLOADED) in verify_file_status. In this case there
-            # is no need to call _update_timed_out_subtask any more. Next_deadline will be set to None, so it is
-            # necessary to check it before checking if deadline is exceeded.
-            if subtask.next_deadline is not None and subtask.next_deadline <= parse_timestamp_to_utc_datetime(get_current_utc_timestamp()):
-                _update_timed_out_subtask(subtask)
+def update_batch_of_timed_out_subtasks(
+    batch_size: int = TIMED_OUT_SUBTASKS_SWEEPER_BATCH_SIZE,
+    after: Optional[SubtaskSweepPosition] = None,
+) -> TimedOutSubtasksBatch:
+    """
+    Function looks for at most `batch_size` subtasks which are timed out or which have their result already uploaded,
+    ordered by deadline and placed after position `after`, if given. All found subtasks are processed in separate
+    transactions, like in update_all_timed_out_subtasks_of_a_client(), so that no lock is held while waiting for other
+    subtasks' file status. Rows already locked by another transaction are skipped, so that many sweepers and client
+    requests can work at the same time without waiting for each other. Subtask whose update fails is logged and skipped,
+    so that it does not stop other subtasks from being updated.
+    Returns number of successfully processed subtasks and position of the last subtask found, which should be passed
+    as `after` to get the next batch. Subtasks which failed or were skipped are not looked at again in the same sweep.
+    """
+    assert isinstance(batch_size, int) and batch_size > 0
+
+    subtasks_to_update = _get_subtasks_to_update_query_set()
+    if after is not None:
+        (after_next_deadline, after_subtask_id) = after
+        subtasks_to_update = subtasks_to_update.filter(
+            Q(next_deadline__gt=after_next_deadline) |
+            Q(next_deadline=after_next_deadline, subtask_id__gt=after_subtask_id)
+        )
+    positions: List[SubtaskSweepPosition] = list(
+        subtasks_to_update.order_by('next_deadline', 'subtask_id').values_list('next_deadline', 'subtask_id')[:batch_size]
+    )
+
+    number_of_processed_subtasks = 0
+    for (_next_deadline, subtask_id) in positions:
+        try:
+            with non_nesting_atomic(using='control'):
+                subtask = get_one_or_none(
+                    model_or_query_set=Subtask.objects.select_for_update(skip_locked=True),
+                    subtask_id=subtask_id,
+                )
+                if subtask is None:
+                    continue
+                _update_locked_subtask(subtask, subtask.requestor.public_key_bytes)
+        except Exception:  # pylint: disable=broad-except
+            # Changes made to this subtask have been rolled back, so it will be selected again by the next sweep.
+            log(
+                logger,
+                'Updating timed out subtask failed. Skipping it.',
+                subtask_id=subtask_id,
+                logging_level=LoggingLevel.EXCEPTION,
+            )
+            continue
+        number_of_processed_subtasks += 1
+
+    return TimedOutSubtasksBatch(
+        number_of_processed_subtasks=number_of_processed_subtasks,
+        last_position=positions[-1] if len(positions) > 0 else None,
+    )
 
 
 def update_subtask_state(subtask: Subtask, state: str, next_deadline: Union[int, float, None] = None) -> None:
@@ -305,7 +409,7 @@ def finalize_deposit_claim(
     )
 
     if deposit_claim is not None:
-        bankster.finalize_payment(deposit_claim)
+        bankster.request_payment_finalization(deposit_claim)
 
 
 def delete_deposit_claim(
@@ -11,22 +11,27 @@ from common.constants import ConcentUseCase
 from common.decorators import log_task_errors
 from common.decorators import non_nesting_atomic
 from common.decorators import provides_concent_feature
-from common.helpers import deserialize_message
 from common.helpers import get_current_utc_timestamp
 from common.helpers import parse_datetime_to_timestamp
 from common.helpers import parse_timestamp_to_utc_datetime
 from conductor import tasks
 from core.constants import VerificationResult
 from core.exceptions import SubtaskStatusError
+from core.message_cache import deserialize_stored_message
 from core.models import PendingResponse
 from core.models import Subtask
+from core.payments import bankster
+from core.payments import service
 from core.subtask_helpers import delete_deposit_claim
 from core.subtask_helpers import finalize_deposit_claim
 from core.subtask_helpers import update_subtask_state
+from core.subtask_helpers import update_batch_of_timed_out_subtasks
 from core.transfer_operations import store_pending_message
 from core.utils import calculate_concent_verification_time
 from .constants import CELERY_LOCKED_SUBTASK_DELAY
+from .constants import DEPOSIT_CLAIM_FINALIZATION_BATCH_SIZE
 from .constants import MAXIMUM_VERIFICATION_RESULT_TASK_RETRIES
+from .constants import TIMED_OUT_SUBTASKS_SWEEPER_BATCH_SIZE
 from .constants import VERIFICATION_RESULT_SUBTASK_STATE_ACCEPTED_LOG_MESSAGE
 from .constants import VERIFICATION_RESULT_SUBTASK_STATE_FAILED_LOG_MESSAGE
 from .constants import VERIFICATION_RESULT_SUBTASK_STATE_UNEXPECTED_LOG_MESSAGE
@@ -50,7 +55,7 @@ def upload_finished(subtask_id: str) -> None:
         )
         return
 
-    report_computed_task = deserialize_message(subtask.report_computed_task.data.tobytes())
+    report_computed_task = deserialize_stored_message(subtask.report_computed_task)
 
     # Check subtask state, if it's VERIFICATION FILE TRANSFER, proceed with the task.
     if subtask.state_enum == Subtask.SubtaskState.VERIFICATION_FILE_TRANSFER:
@@ -216,7 +221,7 @@ def verification_result(
     # If the time is already past next_deadline for the subtask (SubtaskResultsRejected.timestamp + AVCT)
     # worker ignores worker's message and processes the timeout.
     if subtask.next_deadline < parse_timestamp_to_utc_datetime(get_current_utc_timestamp()):
-        task_to_compute = deserialize_message(subtask.task_to_compute.data.tobytes())
+        task_to_compute = deserialize_stored_message(subtask.task_to_compute)
         # Worker makes a payment from requestor's deposit just like in the forced acceptance use case.
 
         update_subtask_state(
@@ -260,7 +265,7 @@ def verification_result(
                 subtask=subtask,
             )
 
-        task_to_compute = deserialize_message(subtask.task_to_compute.data.tobytes())
+        task_to_compute = deserialize_stored_message(subtask.task_to_compute)
 
         # Worker changes subtask state to FAILED
         subtask.state = Subtask.SubtaskState.FAILED.name  # pylint: disable=no-member
@@ -293,7 +298,7 @@ def verification_result(
                 f'Verification_result_task processing error result with: RESULT {result_enum.name}. ERROR MESSAGE {error_message}. ERROR CODE {error_code}',
                 subtask_id=subtask_id,
             )
-        task_to_compute = deserialize_message(subtask.task_to_compute.data.tobytes())
+        task_to_compute = deserialize_stored_message(subtask.task_to_compute)
 
         # Worker adds SubtaskResultsSettled to provider's and requestor's receive queues (both out-of-band)
         for public_key in [subtask.provider.public_key_bytes, subtask.requestor.public_key_bytes]:
@@ -396,3 +401,68 @@ def result_upload_finished(self: Task, subtask_id: str) -> None:
     subtask.result_upload_finished = True
     subtask.full_clean()
     subtask.save()
+
+
+@shared_task
+@provides_concent_feature('concent-worker')
+@log_task_errors
+def update_timed_out_subtasks() -> None:
+    """
+    Periodic task which moves timed out subtasks to passive states, so that clients do not have to trigger it
+    by calling `receive` endpoint. Subtasks are processed in batches until there is nothing left to update.
+    """
+    number_of_updated_subtasks = 0
+    # Batches are selected past the last subtask of the previous one, so that subtasks which could not be updated
+    # do not keep being selected again until the next sweep.
+    last_position = None
+    while True:
+        batch = update_batch_of_timed_out_subtasks(TIMED_OUT_SUBTASKS_SWEEPER_BATCH_SIZE, after=last_position)
+        if batch.last_position is None:
+            break
+        number_of_updated_subtasks += batch.number_of_processed_subtasks
+        last_position = batch.last_position
+
+    if number_of_updated_subtasks > 0:
+        logging.log(
+            logger,
+            f'update_timed_out_subtasks processed {number_of_updated_subtasks} subtasks.',
+        )
+
+
+@shared_task
+@provides_concent_feature('concent-worker')
+@log_task_errors
+def index_payment_events() -> None:
+    """
+    Periodic task which copies payment events from confirmed blocks to the database, so that payments can be listed
+    without querying the Ethereum client over a range of blocks.
+    """
+    number_of_indexed_blocks = service.index_payment_events()  # pylint: disable=no-value-for-parameter
+
+    if number_of_indexed_blocks > 0:
+        logging.log(
+            logger,
+            f'index_payment_events processed {number_of_indexed_blocks} blocks.',
+        )
+
+
+@shared_task
+@provides_concent_feature('concent-worker')
+@log_task_errors
+def finalize_requested_payments() -> None:
+    """
+    Periodic task which pays out deposit claims queued for finalization since its previous run. Claims are paid out
+    in batches until the queue is empty.
+    """
+    number_of_submitted_transactions = 0
+    while True:
+        number_of_transactions_in_batch = bankster.finalize_requested_payments(DEPOSIT_CLAIM_FINALIZATION_BATCH_SIZE)
+        number_of_submitted_transactions += number_of_transactions_in_batch
+        if number_of_transactions_in_batch < DEPOSIT_CLAIM_FINALIZATION_BATCH_SIZE:
+            break
+
+    if number_of_submitted_transactions > 0:
+        logging.log(
+            logger,
+            f'finalize_requested_payments submitted {number_of_submitted_transactions} transactions.',
+        )
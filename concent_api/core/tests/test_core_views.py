@@ -1,3 +1,6 @@
+from struct import calcsize
+from struct import unpack
+
 import mock
 from freezegun import freeze_time
 from django.conf import settings
@@ -17,12 +20,16 @@ from common.constants import ErrorCode
 from common.helpers import get_current_utc_timestamp
 from common.helpers import parse_timestamp_to_utc_datetime
 from common.testing_helpers import generate_ecc_key_pair
+from core.constants import RECEIVE_BATCH_MAXIMUM_SIZE
+from core.constants import RECEIVE_BATCH_MESSAGE_LENGTH_FORMAT
+from core.constants import RECEIVE_LONG_POLL_MAXIMUM_TIMEOUT
 from core.message_handlers import store_subtask
 from core.models import Client
 from core.models import StoredMessage
 from core.models import PendingResponse
 from core.models import Subtask
 from core.tests.utils import ConcentIntegrationTestCase
+from core.transfer_operations import store_pending_message
 from core.utils import hex_to_bytes_convert
 
 (CONCENT_PRIVATE_KEY, CONCENT_PUBLIC_KEY) = generate_ecc_key_pair()
@@ -1148,3 +1155,191 @@ class ConcentProtocolVersionTest(ConcentIntegrationTestCase):
                 status=204,
                 key=self.PROVIDER_PRIVATE_KEY,
             )
+
+
+@override_settings(
+    CONCENT_PRIVATE_KEY=CONCENT_PRIVATE_KEY,
+    CONCENT_PUBLIC_KEY=CONCENT_PUBLIC_KEY,
+    CONCENT_MESSAGING_TIME=3600,
+)
+class CoreViewReceiveBatchTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.subtask_ids = []
+        for _ in range(3):
+            compute_task_def = self._get_deserialized_compute_task_def(
+                kwargs={'deadline': get_current_utc_timestamp() + 100}
+            )
+            task_to_compute = self._get_deserialized_task_to_compute(
+                compute_task_def=compute_task_def,
+            )
+            report_computed_task = self._get_deserialized_report_computed_task(
+                task_to_compute=task_to_compute,
+            )
+            subtask = store_subtask(
+                task_id=compute_task_def['task_id'],
+                subtask_id=compute_task_def['subtask_id'],
+                provider_public_key=self.PROVIDER_PUBLIC_KEY,
+                requestor_public_key=self.REQUESTOR_PUBLIC_KEY,
+                state=Subtask.SubtaskState.FORCING_REPORT,
+                next_deadline=int(compute_task_def['deadline']) + settings.CONCENT_MESSAGING_TIME,
+                task_to_compute=task_to_compute,
+                report_computed_task=report_computed_task,
+            )
+            store_pending_message(
+                response_type=PendingResponse.ResponseType.ForceReportComputedTask,
+                client_public_key=self.REQUESTOR_PUBLIC_KEY,
+                queue=PendingResponse.Queue.Receive,
+                subtask=subtask,
+            )
+            self.subtask_ids.append(subtask.subtask_id)
+
+    def _split_batch_response(self, content):
+        messages = []
+        while len(content) > 0:
+            (message_length,) = unpack(RECEIVE_BATCH_MESSAGE_LENGTH_FORMAT, content[:calcsize(RECEIVE_BATCH_MESSAGE_LENGTH_FORMAT)])
+            content = content[calcsize(RECEIVE_BATCH_MESSAGE_LENGTH_FORMAT):]
+            messages.append(
+                load(
+                    content[:message_length],
+                    self.REQUESTOR_PRIVATE_KEY,
+                    CONCENT_PUBLIC_KEY,
+                    check_time=False,
+                )
+            )
+            content = content[message_length:]
+        return messages
+
+    def test_receive_batch_should_return_all_pending_messages_in_order_they_were_added_to_queue(self):
+        response = self.send_request(
+            url='core:receive_batch',
+            data=self._create_client_auth_message(self.REQUESTOR_PRIVATE_KEY, self.REQUESTOR_PUBLIC_KEY),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        decoded_messages = self._split_batch_response(response.content)
+        self.assertEqual(len(decoded_messages), 3)
+        for decoded_message, subtask_id in zip(decoded_messages, self.subtask_ids):
+            self.assertIsInstance(decoded_message, message.concents.ForceReportComputedTask)
+            self.assertEqual(decoded_message.subtask_id, subtask_id)
+        self.assertFalse(PendingResponse.objects.filter(delivered=False).exists())
+
+    def test_receive_batch_should_return_at_most_requested_number_of_messages(self):
+        response = self.send_request(
+            url='core:receive_batch',
+            data=self._create_client_auth_message(self.REQUESTOR_PRIVATE_KEY, self.REQUESTOR_PUBLIC_KEY),
+            HTTP_CONCENT_BATCH_SIZE='2',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        decoded_messages = self._split_batch_response(response.content)
+        self.assertEqual([decoded_message.subtask_id for decoded_message in decoded_messages], self.subtask_ids[:2])
+        self.assertEqual(PendingResponse.objects.filter(delivered=False).count(), 1)
+
+    def test_receive_batch_should_return_http_400_if_batch_size_is_invalid(self):
+        for batch_size in ['0', '-1', 'abc', str(RECEIVE_BATCH_MAXIMUM_SIZE + 1)]:
+            response = self.send_request(
+                url='core:receive_batch',
+                data=self._create_client_auth_message(self.REQUESTOR_PRIVATE_KEY, self.REQUESTOR_PUBLIC_KEY),
+                HTTP_CONCENT_BATCH_SIZE=batch_size,
+            )
+
+            self._test_400_response(response, error_code=ErrorCode.HEADER_BATCH_SIZE_INVALID)
+        self.assertEqual(PendingResponse.objects.filter(delivered=False).count(), 3)
+
+    def test_receive_batch_should_return_http_204_if_no_messages_in_database(self):
+        response = self.send_request(
+            url='core:receive_batch',
+            data=self._create_client_auth_message(self.PROVIDER_PRIVATE_KEY, self.PROVIDER_PUBLIC_KEY),
+        )
+
+        self._test_204_response(response)
+
+
+class CoreViewReceiveLongPollTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        compute_task_def = self._get_deserialized_compute_task_def(
+            kwargs={'deadline': get_current_utc_timestamp() + 100}
+        )
+        task_to_compute = self._get_deserialized_task_to_compute(
+            compute_task_def=compute_task_def,
+        )
+        report_computed_task = self._get_deserialized_report_computed_task(
+            task_to_compute=task_to_compute,
+        )
+        self.subtask = store_subtask(
+            task_id=compute_task_def['task_id'],
+            subtask_id=compute_task_def['subtask_id'],
+            provider_public_key=self.PROVIDER_PUBLIC_KEY,
+            requestor_public_key=self.REQUESTOR_PUBLIC_KEY,
+            state=Subtask.SubtaskState.FORCING_REPORT,
+            next_deadline=int(compute_task_def['deadline']) + settings.CONCENT_MESSAGING_TIME,
+            task_to_compute=task_to_compute,
+            report_computed_task=report_computed_task,
+        )
+
+    def _store_pending_message_for_requestor(self, *_args):
+        store_pending_message(
+            response_type=PendingResponse.ResponseType.ForceReportComputedTask,
+            client_public_key=self.REQUESTOR_PUBLIC_KEY,
+            queue=PendingResponse.Queue.Receive,
+            subtask=self.subtask,
+        )
+        return True
+
+    def test_receive_should_return_message_queued_while_waiting_for_it(self):
+        with mock.patch('core.views.listen_for_pending_responses') as listen_for_pending_responses_mock, \
+                mock.patch('core.views.wait_for_pending_response_notification') as wait_for_pending_response_notification_mock:
+            wait_for_pending_response_notification_mock.side_effect = self._store_pending_message_for_requestor
+            response = self.send_request(
+                url='core:receive',
+                data=self._create_client_auth_message(self.REQUESTOR_PRIVATE_KEY, self.REQUESTOR_PUBLIC_KEY),
+                HTTP_CONCENT_LONG_POLL_TIMEOUT='10',
+            )
+
+        listen_for_pending_responses_mock.assert_called_once_with(self.REQUESTOR_PUBLIC_KEY)
+        wait_for_pending_response_notification_mock.assert_called_once_with(10)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(
+            load(response.content, self.REQUESTOR_PRIVATE_KEY, CONCENT_PUBLIC_KEY, check_time=False),
+            message.concents.ForceReportComputedTask,
+        )
+        self.assertFalse(PendingResponse.objects.filter(delivered=False).exists())
+
+    def test_receive_should_not_wait_if_message_is_already_pending(self):
+        self._store_pending_message_for_requestor()
+
+        with mock.patch('core.views.listen_for_pending_responses'), \
+                mock.patch('core.views.wait_for_pending_response_notification') as wait_for_pending_response_notification_mock:
+            response = self.send_request(
+                url='core:receive',
+                data=self._create_client_auth_message(self.REQUESTOR_PRIVATE_KEY, self.REQUESTOR_PUBLIC_KEY),
+                HTTP_CONCENT_LONG_POLL_TIMEOUT='10',
+            )
+
+        wait_for_pending_response_notification_mock.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+
+    def test_receive_should_return_http_204_if_no_message_was_queued_before_timeout(self):
+        with mock.patch('core.views.listen_for_pending_responses'), \
+                mock.patch('core.views.wait_for_pending_response_notification', return_value=False):
+            response = self.send_request(
+                url='core:receive',
+                data=self._create_client_auth_message(self.REQUESTOR_PRIVATE_KEY, self.REQUESTOR_PUBLIC_KEY),
+                HTTP_CONCENT_LONG_POLL_TIMEOUT='10',
+            )
+
+        self._test_204_response(response)
+
+    def test_receive_should_return_http_400_if_long_poll_timeout_is_invalid(self):
+        for long_poll_timeout in ['0', '-1', 'abc', str(RECEIVE_LONG_POLL_MAXIMUM_TIMEOUT + 1)]:
+            response = self.send_request(
+                url='core:receive',
+                data=self._create_client_auth_message(self.REQUESTOR_PRIVATE_KEY, self.REQUESTOR_PUBLIC_KEY),
+                HTTP_CONCENT_LONG_POLL_TIMEOUT=long_poll_timeout,
+            )
+
+            self._test_400_response(response, error_code=ErrorCode.HEADER_LONG_POLL_TIMEOUT_INVALID)
@@ -0,0 +1,60 @@
+import threading
+import time
+
+import psycopg2
+from assertpy import assert_that
+from django.db import connections
+from django.test import TransactionTestCase
+
+from core.notifications import get_pending_response_channel_name
+from core.notifications import listen_for_pending_responses
+from core.notifications import wait_for_pending_response_notification
+
+CLIENT_PUBLIC_KEY = b'a' * 64
+OTHER_CLIENT_PUBLIC_KEY = b'b' * 64
+
+
+class PendingResponseNotificationsTest(TransactionTestCase):
+
+    multi_db = True
+
+    def _notify_from_another_connection(self, client_public_key, delay):  # pylint: disable=no-self-use
+        """ Sends notification from a separate database connection after `delay` seconds, like another request would. """
+        def notify():
+            time.sleep(delay)
+            connection = psycopg2.connect(**connections['control'].get_connection_params())
+            try:
+                connection.autocommit = True
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT pg_notify(%s, %s)', [get_pending_response_channel_name(client_public_key), ''])
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=notify, daemon=True)
+        thread.start()
+        return thread
+
+    def test_that_waiting_ends_when_notification_is_sent_from_another_connection(self):
+        with listen_for_pending_responses(CLIENT_PUBLIC_KEY):
+            notifying_thread = self._notify_from_another_connection(CLIENT_PUBLIC_KEY, delay=0.2)
+            start = time.monotonic()
+            is_notified = wait_for_pending_response_notification(timeout=10)
+            waiting_time = time.monotonic() - start
+        notifying_thread.join()
+
+        assert_that(is_notified).is_true()
+        assert_that(waiting_time).is_less_than(5)
+
+    def test_that_notification_sent_to_another_client_does_not_end_waiting(self):
+        with listen_for_pending_responses(CLIENT_PUBLIC_KEY):
+            notifying_thread = self._notify_from_another_connection(OTHER_CLIENT_PUBLIC_KEY, delay=0)
+            notifying_thread.join()
+            is_notified = wait_for_pending_response_notification(timeout=0.5)
+
+        assert_that(is_notified).is_false()
+
+    def test_that_closing_connection_while_listening_does_not_raise_error(self):  # pylint: disable=no-self-use
+        with listen_for_pending_responses(CLIENT_PUBLIC_KEY):
+            connections['control'].close()
+
+        assert_that(connections['control'].is_usable()).is_true()
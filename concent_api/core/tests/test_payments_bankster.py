@@ -17,9 +17,13 @@ from core.models import Client
 from core.models import DepositAccount
 from core.models import DepositClaim
 from core.models import Subtask
+from core.payments.backends.sci_backend import TransactionType
 from core.payments.bankster import claim_deposit
 from core.payments.bankster import discard_claim
 from core.payments.bankster import finalize_payment
+from core.payments.bankster import finalize_requested_payments
+from core.payments.bankster import get_payment_transaction
+from core.payments.bankster import request_payment_finalization
 from core.payments.bankster import settle_overdue_acceptances
 from core.tests.utils import ConcentIntegrationTestCase
 from core.utils import get_current_utc_timestamp
@@ -287,6 +291,83 @@ class FinalizePaymentBanksterTest(ConcentIntegrationTestCase):
             deposit_claim.save()
         return deposit_claim, task_to_compute
 
+    def request_finalization_of_all_deposit_claims(self):  # pylint: disable=no-self-use
+        deposit_claims = list(DepositClaim.objects.order_by('id'))
+        for deposit_claim in deposit_claims:
+            request_payment_finalization(deposit_claim)
+        return deposit_claims
+
+    def test_that_requested_deposit_claims_are_paid_out_with_mock_payment_backend(self):
+        self.create_n_deposits_with_subtasks(2)
+        deposit_claims = self.request_finalization_of_all_deposit_claims()
+
+        number_of_submitted_transactions = finalize_requested_payments()
+
+        self.assertEqual(number_of_submitted_transactions, 3)
+        for deposit_claim in deposit_claims:
+            deposit_claim.refresh_from_db()
+            self.assertIsNotNone(deposit_claim.tx_hash)
+            self.assertIsNone(deposit_claim.finalization_requested_at)
+        self.assertEqual(finalize_requested_payments(), 0)
+
+    def test_that_deposit_claims_not_requested_for_finalization_are_not_paid_out(self):
+        with mock.patch('core.payments.service.force_subtask_payment', return_value=MOCK_TRANSACTION_HASH) as force_subtask_payment:
+            number_of_submitted_transactions = finalize_requested_payments()
+
+        self.assertEqual(number_of_submitted_transactions, 0)
+        force_subtask_payment.assert_not_called()
+        self.assertIsNone(DepositClaim.objects.get(pk=self.deposit_claim.pk).tx_hash)
+
+    def test_that_requested_deposit_claims_are_lowered_oldest_first_to_available_funds(self):
+        self.create_n_deposits_with_subtasks(2)
+        [oldest_claim, middle_claim, newest_claim] = self.request_finalization_of_all_deposit_claims()
+
+        with mock.patch('core.payments.service.get_deposit_value', return_value=3) as get_deposit_value:
+            with mock.patch(
+                'core.payments.service.force_subtask_payment',
+                side_effect=[64 * 'A', 64 * 'B'],
+            ) as force_subtask_payment:
+                number_of_submitted_transactions = finalize_requested_payments()
+
+        self.assertEqual(number_of_submitted_transactions, 2)
+        get_deposit_value.assert_called_once_with(client_eth_address=self.deposit_account.ethereum_address)
+        self.assertEqual(
+            sorted(call[1]['reimburse_amount'] for call in force_subtask_payment.call_args_list),
+            [1, 2],
+        )
+        self.assertEqual(DepositClaim.objects.get(pk=oldest_claim.pk).amount, 2)
+        self.assertEqual(DepositClaim.objects.get(pk=middle_claim.pk).amount, 1)
+        self.assertFalse(DepositClaim.objects.filter(pk=newest_claim.pk).exists())
+        self.assertEqual(DepositAccount.objects.get(pk=self.deposit_account.pk).total_claimed, 3)
+
+    def test_that_deposit_claim_whose_transaction_cannot_be_prepared_is_queued_again_and_others_are_paid_out(self):
+        self.create_n_deposits_with_subtasks(2)
+        [oldest_claim, failing_claim, newest_claim] = self.request_finalization_of_all_deposit_claims()
+
+        def get_payment_transaction_failing_for_one_claim(deposit_claim):
+            if deposit_claim.pk == failing_claim.pk:
+                raise ValueError('TaskToCompute cannot be deserialized')
+            return get_payment_transaction(deposit_claim)
+
+        with mock.patch(
+            'core.payments.bankster.get_payment_transaction',
+            side_effect=get_payment_transaction_failing_for_one_claim,
+        ):
+            number_of_submitted_transactions = finalize_requested_payments()
+
+        self.assertEqual(number_of_submitted_transactions, 2)
+        for deposit_claim in [oldest_claim, newest_claim]:
+            deposit_claim.refresh_from_db()
+            self.assertIsNotNone(deposit_claim.tx_hash)
+            self.assertIsNone(deposit_claim.finalization_requested_at)
+        failing_claim.refresh_from_db()
+        self.assertIsNone(failing_claim.tx_hash)
+        self.assertIsNotNone(failing_claim.finalization_requested_at)
+
+        self.assertEqual(finalize_requested_payments(), 1)
+        failing_claim.refresh_from_db()
+        self.assertIsNotNone(failing_claim.tx_hash)
+
 
 class SettleOverdueAcceptancesBanksterTest(ConcentIntegrationTestCase):
 
@@ -354,13 +435,14 @@ class SettleOverdueAcceptancesBanksterTest(ConcentIntegrationTestCase):
                 ) as self.get_deposit_value_mock:
                     with mock.patch(
                         'core.payments.bankster.service.get_list_of_payments',
-                        side_effect=[
-                            (
+                        # Lists are fetched concurrently, so they are returned by transaction type rather than in order of calls.
+                        side_effect=lambda transaction_type, **_kwargs: {
+                            TransactionType.SETTLEMENT: (
                                 get_list_of_payments_return_value if get_list_of_payments_return_value is not None
                                 else self._get_list_of_settlement_transactions()
                             ),
-                            self._get_list_of_batch_transactions()
-                        ],
+                            TransactionType.BATCH: self._get_list_of_batch_transactions(),
+                        }[transaction_type],
                     ) as self.get_list_of_payments_mock:
                         claim_against_requestor = settle_overdue_acceptances(
                             requestor_ethereum_address=self.task_to_compute.requestor_ethereum_address,
@@ -632,7 +714,7 @@ class SettleOverdueAcceptancesBanksterTest(ConcentIntegrationTestCase):
         with self.assertRaises(BanksterTransactionMismatchError):
             self.call_settle_overdue_acceptances_with_mocked_sci_functions()
 
-        self.assert_mocked_sci_functions_were_called(get_list_of_payments_call_count=1)
+        self.assert_mocked_sci_functions_were_called()
 
 
 class DiscardClaimBanksterTest(ConcentIntegrationTestCase):
@@ -5,6 +5,7 @@ from ethereum.transactions import Transaction
 
 from core.models import GlobalTransactionState
 from core.models import PendingEthereumTransaction
+from core.models import ReleasedNonce
 from core.payments.storage import DatabaseTransactionsStorage
 
 
@@ -148,6 +149,54 @@ class DatabaseTransactionsStorageTest(TestCase):
                 getattr(all_transactions[0], field)
             )
 
+    def test_that_nonce_reserved_for_transaction_which_failed_to_be_signed_is_released(self):
+        current_nonce = self.global_transaction_state.nonce
+
+        def failing_sign(_tx):
+            raise RuntimeError()
+
+        with self.assertRaises(RuntimeError):
+            self.storage.set_nonce_sign_and_save_tx(failing_sign, self._create_transaction())
+
+        self.assertEqual(PendingEthereumTransaction.objects.count(), 0)
+        self.assertEqual(ReleasedNonce.objects.count(), 0)
+        self.global_transaction_state.refresh_from_db()
+        self.assertEqual(self.global_transaction_state.nonce, current_nonce)
+
+    def test_that_released_nonce_followed_by_reserved_nonce_is_reserved_again_before_new_nonces(self):
+        current_nonce = int(self.global_transaction_state.nonce)
+        released_nonce = self.storage._reserve_nonce()
+        self.storage._reserve_nonce()
+
+        self.storage._release_nonce(released_nonce)
+        transaction = self._create_transaction()
+        self.storage.set_nonce_sign_and_save_tx(_sign, transaction)
+
+        self.assertEqual(released_nonce, current_nonce)
+        self.assertEqual(transaction.nonce, current_nonce)
+        self.assertEqual(ReleasedNonce.objects.count(), 0)
+        self.global_transaction_state.refresh_from_db()
+        self.assertEqual(self.global_transaction_state.nonce, current_nonce + 2)
+
+    def test_that_revert_last_tx_should_release_nonce_of_transaction_saved_by_calling_thread(self):
+        current_nonce = int(self.global_transaction_state.nonce)
+        self.storage.set_nonce_sign_and_save_tx(_sign, self._create_transaction())
+        # Another worker reserves the following nonce in the meantime.
+        self.storage._reserve_nonce()
+
+        self.storage.revert_last_tx()
+
+        self.assertEqual(PendingEthereumTransaction.objects.count(), 0)
+        self.assertEqual(list(ReleasedNonce.objects.values_list('nonce', flat=True)), [current_nonce])
+        self.global_transaction_state.refresh_from_db()
+        self.assertEqual(self.global_transaction_state.nonce, current_nonce + 2)
+
+        self.storage._release_nonce(current_nonce + 1)
+
+        self.assertEqual(ReleasedNonce.objects.count(), 0)
+        self.global_transaction_state.refresh_from_db()
+        self.assertEqual(self.global_transaction_state.nonce, current_nonce)
+
     def test_that_remove_tx_should_remove_transaction_with_given_nonce(self):
         pending_transaction_1 = self._create_pending_ethereum_transaction()
         pending_transaction_2 = self._create_pending_ethereum_transaction()
@@ -0,0 +1,118 @@
+import mock
+from assertpy import assert_that
+from django.test import override_settings
+
+from core.payments import service
+from core.payments.deposit_value_cache import DepositValueCache
+from core.tests.utils import ConcentIntegrationTestCase
+
+REQUESTOR_ETHEREUM_ADDRESS = '0x' + 'a' * 40
+PROVIDER_ETHEREUM_ADDRESS = '0x' + 'b' * 40
+
+
+class TestDepositValueCache:
+
+    def setup_method(self):
+        self.cache = DepositValueCache(block_number_timeout=10)  # pylint: disable=attribute-defined-outside-init
+        self.get_latest_block_number = mock.Mock(return_value=1)  # pylint: disable=attribute-defined-outside-init
+        self.get_deposit_value = mock.Mock(return_value=100)  # pylint: disable=attribute-defined-outside-init
+
+    def _get_deposit_value(self, client_eth_address=REQUESTOR_ETHEREUM_ADDRESS):
+        return self.cache.get_deposit_value(client_eth_address, self.get_latest_block_number, self.get_deposit_value)
+
+    def test_that_block_number_is_not_checked_again_before_timeout(self):
+        with mock.patch('core.payments.deposit_value_cache.monotonic', side_effect=[100.0, 109.0, 110.0]):
+            self._get_deposit_value()
+            self._get_deposit_value()
+            assert_that(self.get_latest_block_number.call_count).is_equal_to(1)
+
+            self._get_deposit_value()
+            assert_that(self.get_latest_block_number.call_count).is_equal_to(2)
+
+        assert_that(self.get_deposit_value.call_count).is_equal_to(1)
+
+    def test_that_value_read_before_invalidation_is_not_cached(self):
+        def get_deposit_value_and_invalidate(client_eth_address):
+            self.cache.invalidate(client_eth_address)
+            return 100
+        self.get_deposit_value.side_effect = get_deposit_value_and_invalidate
+
+        self._get_deposit_value()
+        self._get_deposit_value()
+
+        assert_that(self.get_deposit_value.call_count).is_equal_to(2)
+
+    def test_that_addresses_differing_only_in_case_share_cached_value(self):
+        self._get_deposit_value(REQUESTOR_ETHEREUM_ADDRESS.upper().replace('0X', '0x'))
+        self._get_deposit_value(REQUESTOR_ETHEREUM_ADDRESS)
+
+        assert_that(self.get_deposit_value.call_count).is_equal_to(1)
+
+
+@override_settings(
+    PAYMENT_BACKEND='core.payments.backends.mock',
+)
+class ServiceGetDepositValueTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Block number is checked on every call, so that the tests do not depend on time.
+        self.deposit_value_cache = DepositValueCache(block_number_timeout=0)
+        patcher = mock.patch('core.payments.service.deposit_value_cache', self.deposit_value_cache)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_that_deposit_value_is_read_from_blockchain_once_per_block(self):
+        with mock.patch('core.payments.backends.mock.get_latest_confirmed_block_number', return_value=5), \
+                mock.patch('core.payments.backends.mock.get_deposit_value', return_value=1000) as get_deposit_value:
+            first_deposit_value = service.get_deposit_value(client_eth_address=REQUESTOR_ETHEREUM_ADDRESS)  # pylint: disable=no-value-for-parameter
+            second_deposit_value = service.get_deposit_value(client_eth_address=REQUESTOR_ETHEREUM_ADDRESS)  # pylint: disable=no-value-for-parameter
+            service.get_deposit_value(client_eth_address=PROVIDER_ETHEREUM_ADDRESS)  # pylint: disable=no-value-for-parameter
+
+        self.assertEqual(first_deposit_value, 1000)
+        self.assertEqual(second_deposit_value, 1000)
+        self.assertEqual(
+            get_deposit_value.call_args_list,
+            [mock.call(REQUESTOR_ETHEREUM_ADDRESS), mock.call(PROVIDER_ETHEREUM_ADDRESS)],
+        )
+
+    def test_that_deposit_value_read_in_previous_block_is_never_returned(self):
+        blocks = [5, 5, 6, 6, 7]
+        deposit_values_in_blocks = {5: 1000, 6: 400, 7: 0}
+        current_block = {}
+
+        def get_latest_confirmed_block_number():
+            current_block['number'] = blocks.pop(0)
+            return current_block['number']
+
+        def get_deposit_value(_client_eth_address):
+            return deposit_values_in_blocks[current_block['number']]
+
+        with mock.patch('core.payments.backends.mock.get_latest_confirmed_block_number', side_effect=get_latest_confirmed_block_number), \
+                mock.patch('core.payments.backends.mock.get_deposit_value', side_effect=get_deposit_value) as get_deposit_value_mock:
+            deposit_values = [
+                service.get_deposit_value(client_eth_address=REQUESTOR_ETHEREUM_ADDRESS)  # pylint: disable=no-value-for-parameter
+                for _ in range(5)
+            ]
+
+        self.assertEqual(deposit_values, [1000, 1000, 400, 400, 0])
+        self.assertEqual(get_deposit_value_mock.call_count, 3)
+
+    def test_that_deposit_value_is_read_again_after_concent_sends_transaction_using_deposit(self):
+        with mock.patch('core.payments.backends.mock.get_latest_confirmed_block_number', return_value=5), \
+                mock.patch('core.payments.backends.mock.get_deposit_value', side_effect=[1000, 900]) as get_deposit_value:
+            service.get_deposit_value(client_eth_address=REQUESTOR_ETHEREUM_ADDRESS)  # pylint: disable=no-value-for-parameter
+            service.force_subtask_payment(  # pylint: disable=no-value-for-parameter
+                requestor_eth_address=REQUESTOR_ETHEREUM_ADDRESS,
+                provider_eth_address=PROVIDER_ETHEREUM_ADDRESS,
+                value=100,
+                subtask_id='1',
+                v=27,
+                r=b'1' * 32,
+                s=b'2' * 32,
+                reimburse_amount=100,
+            )
+            deposit_value = service.get_deposit_value(client_eth_address=REQUESTOR_ETHEREUM_ADDRESS)  # pylint: disable=no-value-for-parameter
+
+        self.assertEqual(deposit_value, 900)
+        self.assertEqual(get_deposit_value.call_count, 2)
@@ -0,0 +1,151 @@
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+import socket
+import threading
+
+from assertpy import assert_that
+from golem_messages.message import Ping
+import mock
+import pytest
+
+from middleman_protocol.constants import ErrorCode
+from middleman_protocol.constants import PayloadType
+from middleman_protocol.message import ErrorFrame
+from middleman_protocol.message import GolemMessageFrame
+from middleman_protocol.stream import escape_decode_raw_message
+from middleman_protocol.stream import remove_frame_separator
+from common.testing_helpers import generate_ecc_key_pair
+from core.exceptions import SCICallbackTimeoutError
+from core.payments.middleman_client import get_payload_type_from_raw_frame
+from core.payments.middleman_client import get_request_id_from_raw_frame
+from core.payments.middleman_client import MiddleManClient
+
+(MIDDLEMAN_PRIVATE_KEY, _) = generate_ecc_key_pair()
+
+
+class FakeMiddleMan:
+    """
+    Stands in for the stream of a single MiddleMan connection. Responds to each received frame with a frame
+    carrying the same request_id, but only after `number_of_requests_to_collect` requests have been received and
+    in reverse order, so that responses arrive in a different order than requests.
+    """
+
+    def __init__(self, number_of_requests_to_collect):
+        self.number_of_requests_to_collect = number_of_requests_to_collect
+        self.received_request_ids = []
+        self.condition = threading.Condition()
+
+    def sendall(self, data):
+        raw_frame = escape_decode_raw_message(remove_frame_separator(data))
+        with self.condition:
+            self.received_request_ids.append(get_request_id_from_raw_frame(raw_frame))
+            self.condition.notify_all()
+
+    def unescape_stream(self, connection):  # pylint: disable=unused-argument
+        with self.condition:
+            self.condition.wait_for(lambda: len(self.received_request_ids) >= self.number_of_requests_to_collect, timeout=5)
+            request_ids = list(self.received_request_ids)
+        for request_id in reversed(request_ids):
+            yield GolemMessageFrame(payload=Ping(), request_id=request_id).serialize(private_key=MIDDLEMAN_PRIVATE_KEY)
+
+
+class TestMiddleManClient:
+
+    def test_that_request_id_is_read_from_raw_frame(self):  # pylint: disable=no-self-use
+        raw_frame = GolemMessageFrame(payload=Ping(), request_id=123456).serialize(private_key=MIDDLEMAN_PRIVATE_KEY)
+
+        assert_that(get_request_id_from_raw_frame(raw_frame)).is_equal_to(123456)
+        assert_that(get_request_id_from_raw_frame(raw_frame[:10])).is_none()
+
+    def test_that_payload_type_is_read_from_raw_frame(self):  # pylint: disable=no-self-use
+        raw_golem_message_frame = GolemMessageFrame(payload=Ping(), request_id=1).serialize(private_key=MIDDLEMAN_PRIVATE_KEY)
+        raw_error_frame = ErrorFrame(payload=(ErrorCode.MessageLost, 'error'), request_id=1).serialize(private_key=MIDDLEMAN_PRIVATE_KEY)
+
+        assert_that(get_payload_type_from_raw_frame(raw_golem_message_frame)).is_equal_to(PayloadType.GOLEM_MESSAGE)
+        assert_that(get_payload_type_from_raw_frame(raw_error_frame)).is_equal_to(PayloadType.ERROR)
+        assert_that(get_payload_type_from_raw_frame(raw_error_frame[:10])).is_none()
+
+    def test_that_concurrent_requests_share_connection_and_receive_their_own_responses(self):  # pylint: disable=no-self-use
+        fake_middleman = FakeMiddleMan(number_of_requests_to_collect=3)
+        client = MiddleManClient(maximum_number_of_connections=1)
+
+        with mock.patch('core.payments.middleman_client.socket.socket.connect') as connect_mock:
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=fake_middleman.sendall):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=fake_middleman.unescape_stream):
+                    with ThreadPoolExecutor(max_workers=3) as executor:
+                        raw_responses = list(executor.map(
+                            lambda request_id: client.send_request(GolemMessageFrame(payload=Ping(), request_id=request_id)),
+                            [1, 2, 3],
+                        ))
+        client.close()
+
+        assert_that(connect_mock.call_count).is_equal_to(1)
+        assert_that([get_request_id_from_raw_frame(raw_response) for raw_response in raw_responses]).is_equal_to([1, 2, 3])
+
+    def test_that_waiting_requests_fail_when_connection_is_closed(self):  # pylint: disable=no-self-use
+        fake_middleman = FakeMiddleMan(number_of_requests_to_collect=2)
+        client = MiddleManClient(maximum_number_of_connections=1)
+
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=fake_middleman.sendall):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=fake_middleman.unescape_stream):
+                    with ThreadPoolExecutor(max_workers=1) as executor:
+                        future = executor.submit(client.send_request, GolemMessageFrame(payload=Ping(), request_id=1))
+                        with fake_middleman.condition:
+                            fake_middleman.condition.wait_for(lambda: fake_middleman.received_request_ids, timeout=5)
+                        client.close()
+
+                        with pytest.raises(SCICallbackTimeoutError):
+                            future.result(timeout=5)
+
+    def test_that_connect_timeout_is_reported_as_sci_callback_timeout_and_frees_connection_slot(self):  # pylint: disable=no-self-use
+        client = MiddleManClient(maximum_number_of_connections=1)
+        stop_reading = threading.Event()
+
+        def unescape_stream(connection):  # pylint: disable=unused-argument
+            stop_reading.wait(timeout=5)
+            yield from []
+
+        with mock.patch('core.payments.middleman_client.socket.socket.connect', side_effect=[socket.timeout, None]):
+            with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=unescape_stream):
+                with pytest.raises(SCICallbackTimeoutError):
+                    client._get_connection()  # pylint: disable=protected-access
+
+                connection = client._get_connection()  # pylint: disable=protected-access
+        stop_reading.set()
+        client.close()
+
+        assert_that(connection).is_not_none()
+
+    def test_that_open_connection_can_be_used_while_another_one_is_being_opened(self):  # pylint: disable=no-self-use
+        client = MiddleManClient(maximum_number_of_connections=2)
+        stop_reading = threading.Event()
+        second_connect_started = threading.Event()
+        finish_second_connect = threading.Event()
+
+        def connect(_address):
+            if connect_mock.call_count == 2:
+                second_connect_started.set()
+                finish_second_connect.wait(timeout=5)
+
+        def unescape_stream(connection):  # pylint: disable=unused-argument
+            stop_reading.wait(timeout=5)
+            yield from []
+
+        with mock.patch('core.payments.middleman_client.socket.socket.connect', side_effect=connect) as connect_mock:
+            with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=unescape_stream):
+                first_connection = client._get_connection()  # pylint: disable=protected-access
+                # The only open connection is busy, so the next request opens another one.
+                first_connection._pending_responses[1] = Queue()  # pylint: disable=protected-access
+
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    opening_future = executor.submit(client._get_connection)  # pylint: disable=protected-access
+                    assert_that(second_connect_started.wait(timeout=5)).is_true()
+
+                    reusing_future = executor.submit(client._get_connection)  # pylint: disable=protected-access
+                    assert_that(reusing_future.result(timeout=1)).is_same_as(first_connection)
+
+                    finish_second_connect.set()
+                    assert_that(opening_future.result(timeout=5)).is_not_same_as(first_connection)
+        stop_reading.set()
+        client.close()
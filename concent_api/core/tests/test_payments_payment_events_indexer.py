@@ -0,0 +1,241 @@
+from types import SimpleNamespace
+
+import mock
+from assertpy import assert_that
+
+from core.models import BlockTimestamp
+from core.models import PaymentEvent
+from core.models import PaymentEventIndexState
+from core.payments.backends import sci_backend
+from core.payments.payment_events_indexer import get_first_block_number_after
+from core.payments.payment_events_indexer import get_indexed_payment_events
+from core.payments.payment_events_indexer import index_payment_events
+from core.tests.utils import ConcentIntegrationTestCase
+
+REQUESTOR_ETHEREUM_ADDRESS = '0x' + 'a' * 40
+PROVIDER_ETHEREUM_ADDRESS = '0x' + 'b' * 40
+OTHER_ETHEREUM_ADDRESS = '0x' + 'c' * 40
+
+# Blocks are mined every BLOCK_TIME seconds, starting with block 0 at timestamp 0.
+BLOCK_TIME = 15
+
+
+class FakeSCI:
+    """
+    Emits synthetic payment events placed in given blocks and records ranges of blocks and single blocks
+    it was asked about.
+    Addresses set to None match any address, like in event filters of the real SCI. Addresses are compared
+    case-insensitively, because SCI receives them in checksum format.
+    """
+
+    REQUIRED_CONFS = 2
+
+    def __init__(self, latest_confirmed_block_number, events):
+        self.latest_confirmed_block_number = latest_confirmed_block_number
+        self.events = events
+        self.requested_block_ranges = []
+        self.requested_block_numbers = []
+
+    def is_synchronized(self):  # pylint: disable=no-self-use
+        return True
+
+    def get_latest_confirmed_block_number(self):
+        return self.latest_confirmed_block_number
+
+    def get_block_by_number(self, block_number):
+        self.requested_block_numbers.append(block_number)
+        return SimpleNamespace(number=block_number, timestamp=block_number * BLOCK_TIME)
+
+    def get_transaction_receipt(self, tx_hash):
+        [block_number] = {block_number for (_, block_number, event) in self.events if event.tx_hash == tx_hash}
+        return SimpleNamespace(block_number=block_number)
+
+    def get_forced_payments(self, requestor_address, provider_address, from_block, to_block):
+        return self._get_events('forced_payment', 'requestor', requestor_address, 'provider', provider_address, from_block, to_block)
+
+    def get_batch_transfers(self, payer_address, payee_address, from_block, to_block):
+        return self._get_events('batch_transfer', 'sender', payer_address, 'receiver', payee_address, from_block, to_block)
+
+    def get_forced_subtask_payments(self, requestor_address, provider_address, from_block, to_block):
+        return self._get_events('forced_subtask_payment', 'requestor', requestor_address, 'provider', provider_address, from_block, to_block)
+
+    def _get_events(self, event_name, payer_attribute_name, payer_address, payee_attribute_name, payee_address, from_block, to_block):  # pylint: disable=too-many-arguments
+        self.requested_block_ranges.append((event_name, from_block, to_block))
+        return [
+            event for (name, block_number, event) in self.events
+            if (
+                name == event_name and
+                from_block <= block_number <= to_block and
+                (payer_address is None or payer_address.lower() == getattr(event, payer_attribute_name)) and
+                (payee_address is None or payee_address.lower() == getattr(event, payee_attribute_name))
+            )
+        ]
+
+
+def _forced_payment(block_number, tx_hash, amount, requestor=REQUESTOR_ETHEREUM_ADDRESS, provider=PROVIDER_ETHEREUM_ADDRESS):
+    return ('forced_payment', block_number, SimpleNamespace(requestor=requestor, provider=provider, amount=amount, closure_time=1000, tx_hash=tx_hash))
+
+
+def _batch_transfer(block_number, tx_hash, amount, sender=REQUESTOR_ETHEREUM_ADDRESS, receiver=PROVIDER_ETHEREUM_ADDRESS):
+    return ('batch_transfer', block_number, SimpleNamespace(sender=sender, receiver=receiver, amount=amount, closure_time=1000, tx_hash=tx_hash))
+
+
+def _forced_subtask_payment(block_number, tx_hash, amount):
+    return ('forced_subtask_payment', block_number, SimpleNamespace(requestor=REQUESTOR_ETHEREUM_ADDRESS, provider=PROVIDER_ETHEREUM_ADDRESS, amount=amount, subtask_id=b'\x01' * 32, tx_hash=tx_hash))
+
+
+class PaymentEventsIndexerTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.fake_sci = FakeSCI(
+            latest_confirmed_block_number=12,
+            events=[
+                _forced_payment(3, '0x01', 100),
+                _batch_transfer(4, '0x02', 200),
+                _batch_transfer(4, '0x02', 300, receiver=OTHER_ETHEREUM_ADDRESS),
+                _forced_subtask_payment(7, '0x03', 400),
+                _forced_payment(11, '0x04', 500),
+            ],
+        )
+
+    def test_that_events_from_confirmed_blocks_are_stored_with_block_numbers_from_transaction_receipts(self):
+        number_of_indexed_blocks = index_payment_events(self.fake_sci)
+
+        assert_that(number_of_indexed_blocks).is_equal_to(11)
+        assert_that(PaymentEventIndexState.objects.get().last_indexed_block_number).is_equal_to(10)
+        assert_that(
+            list(PaymentEvent.objects.order_by('amount').values_list('event_type', 'block_number', 'payee_ethereum_address', 'amount'))
+        ).is_equal_to([
+            (PaymentEvent.EventType.SETTLEMENT.name, 3, PROVIDER_ETHEREUM_ADDRESS, 100),  # pylint: disable=no-member
+            (PaymentEvent.EventType.BATCH.name, 4, PROVIDER_ETHEREUM_ADDRESS, 200),  # pylint: disable=no-member
+            (PaymentEvent.EventType.BATCH.name, 4, OTHER_ETHEREUM_ADDRESS, 300),  # pylint: disable=no-member
+            (PaymentEvent.EventType.FORCED_SUBTASK_PAYMENT.name, 7, PROVIDER_ETHEREUM_ADDRESS, 400),  # pylint: disable=no-member
+        ])
+        assert_that(PaymentEvent.objects.get(amount=400).subtask_id).is_equal_to('0x' + '01' * 32)
+        assert_that(PaymentEvent.objects.get(amount=400).closure_time).is_none()
+
+    def test_that_blocks_are_indexed_in_limited_ranges_and_only_once(self):
+        index_payment_events(self.fake_sci, maximum_block_range=4)
+
+        assert_that(
+            sorted({(from_block, to_block) for (_, from_block, to_block) in self.fake_sci.requested_block_ranges})
+        ).is_equal_to([(0, 3), (4, 7), (8, 10)])
+
+        self.fake_sci.latest_confirmed_block_number = 15
+        self.fake_sci.requested_block_ranges = []
+        number_of_indexed_blocks = index_payment_events(self.fake_sci, maximum_block_range=4)
+
+        assert_that(number_of_indexed_blocks).is_equal_to(3)
+        assert_that(
+            {(from_block, to_block) for (_, from_block, to_block) in self.fake_sci.requested_block_ranges}
+        ).is_equal_to({(11, 13)})
+        assert_that(PaymentEvent.objects.count()).is_equal_to(5)
+
+    def test_that_indexer_ends_without_storing_anything_if_index_state_is_locked_by_another_run(self):
+        PaymentEventIndexState(first_indexed_block_number=0, last_indexed_block_number=2).save()
+
+        # Rows locked by another transaction are skipped, so the locked state is not returned.
+        with mock.patch.object(
+            PaymentEventIndexState.objects,
+            'select_for_update',
+            return_value=PaymentEventIndexState.objects.none(),
+        ):
+            number_of_indexed_blocks = index_payment_events(self.fake_sci)
+
+        assert_that(number_of_indexed_blocks).is_equal_to(0)
+        assert_that(PaymentEventIndexState.objects.get().last_indexed_block_number).is_equal_to(2)
+        assert_that(PaymentEvent.objects.count()).is_equal_to(0)
+        assert_that(BlockTimestamp.objects.count()).is_equal_to(0)
+
+    def test_that_blocks_indexed_by_another_run_while_querying_blockchain_are_not_stored_again(self):
+        get_block_by_number = self.fake_sci.get_block_by_number
+
+        def get_block_by_number_while_another_run_indexes_first_range(block_number):
+            if not PaymentEventIndexState.objects.exists():
+                index_payment_events(FakeSCI(self.fake_sci.latest_confirmed_block_number, self.fake_sci.events), maximum_block_range=4)
+            return get_block_by_number(block_number)
+
+        self.fake_sci.get_block_by_number = get_block_by_number_while_another_run_indexes_first_range
+        number_of_indexed_blocks = index_payment_events(self.fake_sci, maximum_block_range=4)
+
+        assert_that(number_of_indexed_blocks).is_equal_to(0)
+        assert_that(PaymentEventIndexState.objects.get().last_indexed_block_number).is_equal_to(10)
+        assert_that(PaymentEvent.objects.count()).is_equal_to(4)
+        assert_that(BlockTimestamp.objects.count()).is_equal_to(11)
+
+    def test_that_range_starting_before_first_indexed_block_is_not_served_from_index(self):
+        PaymentEventIndexState(first_indexed_block_number=5, last_indexed_block_number=10).save()
+
+        (indexed_payments, first_unindexed_block_number) = get_indexed_payment_events(
+            PaymentEvent.EventType.SETTLEMENT,  # pylint: disable=no-member
+            REQUESTOR_ETHEREUM_ADDRESS,
+            PROVIDER_ETHEREUM_ADDRESS,
+            4,
+            10,
+        )
+
+        assert_that(indexed_payments).is_none()
+        assert_that(first_unindexed_block_number).is_equal_to(4)
+
+    def _get_list_of_payments(self, transaction_type, min_block_timestamp):
+        with mock.patch('core.payments.payment_interface.PaymentInterface.__new__', return_value=self.fake_sci):
+            return sci_backend.get_list_of_payments(
+                REQUESTOR_ETHEREUM_ADDRESS,
+                PROVIDER_ETHEREUM_ADDRESS,
+                min_block_timestamp,
+                transaction_type,
+            )
+
+    def test_that_indexed_payments_are_listed_without_querying_blockchain(self):
+        index_payment_events(self.fake_sci)
+        self.fake_sci.requested_block_ranges = []
+        self.fake_sci.requested_block_numbers = []
+
+        payments = self._get_list_of_payments(sci_backend.TransactionType.BATCH, 3 * BLOCK_TIME)
+
+        assert_that([payment.amount for payment in payments]).is_equal_to([200])
+        assert_that(self.fake_sci.requested_block_ranges).is_empty()
+        assert_that(self.fake_sci.requested_block_numbers).is_empty()
+
+    def test_that_payments_from_blocks_not_indexed_yet_are_read_from_blockchain(self):
+        index_payment_events(self.fake_sci)
+        self.fake_sci.latest_confirmed_block_number = 15
+        self.fake_sci.requested_block_ranges = []
+
+        payments = self._get_list_of_payments(sci_backend.TransactionType.SETTLEMENT, BLOCK_TIME)
+
+        assert_that([payment.amount for payment in payments]).is_equal_to([100, 500])
+        assert_that(self.fake_sci.requested_block_ranges).is_equal_to([('forced_payment', 11, 13)])
+
+    def test_that_block_timestamps_are_indexed_together_with_payment_events(self):
+        index_payment_events(self.fake_sci)
+
+        assert_that(
+            list(BlockTimestamp.objects.order_by('block_number').values_list('block_number', 'timestamp'))
+        ).is_equal_to([(block_number, block_number * BLOCK_TIME) for block_number in range(11)])
+
+    def test_that_first_block_after_indexed_timestamp_is_found_without_querying_blockchain(self):
+        index_payment_events(self.fake_sci)
+        self.fake_sci.requested_block_numbers = []
+
+        assert_that(get_first_block_number_after(self.fake_sci, 3 * BLOCK_TIME + 1)).is_equal_to(4)
+        assert_that(get_first_block_number_after(self.fake_sci, 0)).is_equal_to(1)
+        assert_that(self.fake_sci.requested_block_numbers).is_empty()
+
+    def test_that_only_blocks_after_last_indexed_block_are_searched_for_newer_timestamp(self):
+        index_payment_events(self.fake_sci)
+        self.fake_sci.latest_confirmed_block_number = 20
+        self.fake_sci.requested_block_numbers = []
+
+        assert_that(get_first_block_number_after(self.fake_sci, 14 * BLOCK_TIME)).is_equal_to(15)
+        assert_that(get_first_block_number_after(self.fake_sci, 30 * BLOCK_TIME)).is_equal_to(20)
+        assert_that(min(self.fake_sci.requested_block_numbers)).is_greater_than(10)
+
+    def test_that_blockchain_is_searched_for_timestamp_older_than_indexed_blocks(self):
+        BlockTimestamp.objects.bulk_create([
+            BlockTimestamp(block_number=block_number, timestamp=block_number * BLOCK_TIME) for block_number in range(5, 11)
+        ])
+
+        assert_that(get_first_block_number_after(self.fake_sci, 2 * BLOCK_TIME)).is_equal_to(3)
+        assert_that(self.fake_sci.requested_block_numbers).is_not_empty()
@@ -38,6 +38,7 @@ class SCIBackendTest(ConcentIntegrationTestCase):
         self.deposit_value = 1000
         self.transaction_value = 100
         self.gnt_deposit = '0xcfB81A6EE3ae6aD4Ac59ddD21fB4589055c13DaD'
+        sci_backend.synchronization_status_cache.clear()
 
     def test_that_if_number_of_blocks_from_timestamp_is_smaller_than_required_confs_empty_list_is_returned(self):
         with mock.patch(
@@ -50,7 +51,7 @@ class SCIBackendTest(ConcentIntegrationTestCase):
             )
         ):
             with mock.patch(
-                'core.payments.backends.sci_backend.BlocksHelper.get_latest_existing_block_at',
+                'core.payments.payment_events_indexer.BlocksHelper.get_latest_existing_block_at',
                 return_value=mock.MagicMock(number=self.last_block + self.required_confs),
             ):
                 list_of_payments = sci_backend.get_list_of_payments(
@@ -76,7 +77,7 @@ class SCIBackendTest(ConcentIntegrationTestCase):
             )
         ) as new_sci_rpc_mock:
             with mock.patch(
-                'core.payments.backends.sci_backend.BlocksHelper.get_latest_existing_block_at',
+                'core.payments.payment_events_indexer.BlocksHelper.get_latest_existing_block_at',
                 return_value=mock.MagicMock(number=self.last_block),
             ) as get_latest_existing_block_at_mock:
                 list_of_payments = sci_backend.get_list_of_payments(
@@ -113,7 +114,7 @@ class SCIBackendTest(ConcentIntegrationTestCase):
             )
         ) as new_sci_rpc_mock:
             with mock.patch(
-                'core.payments.backends.sci_backend.BlocksHelper.get_latest_existing_block_at',
+                'core.payments.payment_events_indexer.BlocksHelper.get_latest_existing_block_at',
                 return_value=mock.MagicMock(number=self.last_block),
             ) as get_latest_existing_block_at_mock:
                 list_of_payments = sci_backend.get_list_of_payments(
@@ -150,7 +151,7 @@ class SCIBackendTest(ConcentIntegrationTestCase):
             )
         ) as new_sci_rpc:
             with mock.patch(
-                'core.payments.backends.sci_backend.BlocksHelper.get_latest_existing_block_at',
+                'core.payments.payment_events_indexer.BlocksHelper.get_latest_existing_block_at',
                 return_value=mock.MagicMock(number=self.last_block),
             ) as get_latest_existing_block_at:
                 list_of_payments = sci_backend.get_list_of_payments(
@@ -402,6 +403,47 @@ class SCIBackendTest(ConcentIntegrationTestCase):
             with self.assertRaises(SCINotSynchronized):
                 dummy_handle_exception_if_sci_not_synchronized()
 
+    def test_that_handle_sci_synchronization_does_not_check_synchronization_again_while_status_is_cached(self):
+
+        @handle_sci_synchronization
+        def dummy_sci_function():
+            return None
+
+        with mock.patch(
+            'core.payments.payment_interface.PaymentInterface.__new__',
+            return_value=mock.Mock(
+                is_synchronized=mock.Mock(
+                    return_value=True,
+                ),
+            )
+        ) as new_sci_rpc:
+            dummy_sci_function()
+            dummy_sci_function()
+
+        self.assertEqual(new_sci_rpc.return_value.is_synchronized.call_count, 1)
+
+    def test_that_get_synchronization_status_reports_seconds_since_latest_confirmed_block(self):
+        with mock.patch(
+            'core.payments.payment_interface.PaymentInterface.__new__',
+            return_value=mock.Mock(
+                is_synchronized=mock.Mock(
+                    return_value=True,
+                ),
+                get_latest_confirmed_block_number=mock.Mock(
+                    return_value=self.block_number,
+                ),
+                get_block_by_number=mock.Mock(
+                    return_value=mock.MagicMock(timestamp=self.current_time - 30),
+                ),
+            )
+        ) as new_sci_rpc:
+            with mock.patch('core.payments.backends.sci_backend.get_current_utc_timestamp', return_value=self.current_time):
+                synchronization_status = sci_backend.get_synchronization_status()
+
+        self.assertTrue(synchronization_status.is_synchronized)
+        self.assertEqual(synchronization_status.lag, 30)
+        new_sci_rpc.return_value.get_block_by_number.assert_called_once_with(self.block_number)
+
     def test_handle_sci_synchronization_returns_empty_list_on_specific_value_error(self):
 
         @handle_sci_synchronization
@@ -466,7 +508,7 @@ class SCIBackendTest(ConcentIntegrationTestCase):
             ),
         ) as new_sci_rpc:
             with mock.patch(
-                'core.payments.backends.sci_backend.BlocksHelper.get_latest_existing_block_at',
+                'core.payments.payment_events_indexer.BlocksHelper.get_latest_existing_block_at',
                 return_value=mock.MagicMock(number=self.last_block),
             ) as get_latest_existing_block_at:
                 list_of_payments = sci_backend.get_covered_additional_verification_costs(
@@ -1,4 +1,5 @@
 import socket
+import threading
 
 from django.test import override_settings
 from django.test import TestCase
@@ -24,7 +25,9 @@ from core.exceptions import SCICallbackPayloadSignatureError
 from core.exceptions import SCICallbackRequestIdError
 from core.exceptions import SCICallbackTimeoutError
 from core.exceptions import SCICallbackTransactionSignatureError
+from core.payments.middleman_client import middleman_client
 from core.payments.sci_callback import sci_callback
+from core.payments.sci_callback import send_request_to_middleman
 
 
 (CONCENT_PRIVATE_KEY, CONCENT_PUBLIC_KEY) = generate_ecc_key_pair()
@@ -59,12 +62,31 @@ class SCICallbackTest(TestCase):
             request_id=self.request_id,
         ).serialize(private_key=CONCENT_PRIVATE_KEY)
 
+        # Response is yielded only after the request is sent, like it would be by MiddleMan.
+        self.frame_sent = threading.Event()
+
         def iterator(connection):  # pylint: disable=unused-argument
+            self.frame_sent.wait(timeout=5)
             yield self.frame
 
         self.frame_iterator = iterator
+        middleman_client.close()
         self.middleman_message = GolemMessageFrame(payload=Ping(), request_id=self.request_id)
 
+    def tearDown(self):
+        middleman_client.close()
+        super().tearDown()
+
+    def _get_sendall(self, number_of_timeouts=0):
+        remaining_timeouts = [socket.timeout] * number_of_timeouts
+
+        def sendall(_data):
+            if remaining_timeouts:
+                raise remaining_timeouts.pop()
+            self.frame_sent.set()
+
+        return sendall
+
     def _create_transaction_signing_request(self):  # pylint: disable=no-self-use
         transaction_siging_request = TransactionSigningRequest(
             nonce=99,
@@ -101,9 +123,9 @@ class SCICallbackTest(TestCase):
         )
 
     def test_that_sci_callback_should_sign_transaction(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     signed_transaction = sci_callback(self.transaction)
 
         self.assertEqual(signed_transaction.v, self.v)
@@ -111,9 +133,9 @@ class SCICallbackTest(TestCase):
         self.assertEqual(signed_transaction.s, self.s)
 
     def test_that_sci_callback_should_sign_transaction_after_two_retries(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream', side_effect=[socket.timeout, socket.timeout, None]):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall(number_of_timeouts=2)):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     signed_transaction = sci_callback(self.transaction)
 
             self.assertEqual(signed_transaction.v, self.v)
@@ -121,23 +143,23 @@ class SCICallbackTest(TestCase):
             self.assertEqual(signed_transaction.s, self.s)
 
     def test_that_sci_callback_should_raise_exception_on_timeout(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream', side_effect=socket.timeout):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=socket.timeout):
                 with self.assertRaises(SCICallbackTimeoutError):
                     sci_callback(self.transaction)
 
     def test_that_sci_callback_should_raise_exception_on_receiving_invalid_middleman_protocol_message(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     with mock.patch('middleman_protocol.message.AbstractFrame.deserialize', side_effect=MiddlemanProtocolError):
                         with self.assertRaises(SCICallbackFrameError):
                             sci_callback(self.transaction)
 
     def test_that_sci_callback_should_raise_exception_on_receiving_invalid_golem_message(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     with mock.patch('middleman_protocol.message.AbstractFrame.deserialize', side_effect=MessageError):
                         with self.assertRaises(SCICallbackPayloadError):
                             sci_callback(self.transaction)
@@ -146,9 +168,9 @@ class SCICallbackTest(TestCase):
         wrong_signed_golem_message = self._create_signed_transaction()
         wrong_signed_golem_message.sign_message(DIFFERENT_CONCENT_PRIVATE_KEY)
 
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     with mock.patch(
                         'middleman_protocol.message.AbstractFrame.deserialize',
                         return_value=GolemMessageFrame(payload=wrong_signed_golem_message, request_id=self.request_id),
@@ -157,9 +179,9 @@ class SCICallbackTest(TestCase):
                             sci_callback(self.transaction)
 
     def test_that_sci_callback_should_raise_exception_when_messages_request_ids_do_not_match(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     with mock.patch(
                         'middleman_protocol.message.AbstractFrame.deserialize',
                         return_value=GolemMessageFrame(payload=self._create_signed_transaction(), request_id=self.request_id + 1),
@@ -168,9 +190,9 @@ class SCICallbackTest(TestCase):
                             sci_callback(self.transaction)
 
     def test_that_sci_callback_should_raise_exception_when_response_is_error_frame(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     with mock.patch(
                         'middleman_protocol.message.AbstractFrame.deserialize',
                         return_value=ErrorFrame(payload=(ErrorCode.UnexpectedMessage, 'error'), request_id=self.request_id),
@@ -178,10 +200,52 @@ class SCICallbackTest(TestCase):
                         with self.assertRaises(SCICallbackPayloadError):
                             sci_callback(self.transaction)
 
+    def test_that_request_is_sent_again_when_middleman_responds_that_signing_service_has_not_responded(self):
+        for error_code in [ErrorCode.ConnectionTimeout, ErrorCode.MessageLost]:
+            with self.subTest(error_code=error_code):
+                error_frame = ErrorFrame(
+                    payload=(error_code, 'error'),
+                    request_id=self.request_id,
+                ).serialize(private_key=CONCENT_PRIVATE_KEY)
+
+                with mock.patch(
+                    'core.payments.sci_callback.middleman_client.send_request',
+                    side_effect=[error_frame, self.frame],
+                ) as send_request:
+                    raw_response = send_request_to_middleman(self.middleman_message)
+
+                self.assertEqual(raw_response, self.frame)
+                self.assertEqual(send_request.call_count, 2)
+
+    def test_that_request_is_not_sent_again_when_middleman_responds_with_other_error_frame(self):
+        error_frame = ErrorFrame(
+            payload=(ErrorCode.UnexpectedMessage, 'error'),
+            request_id=self.request_id,
+        ).serialize(private_key=CONCENT_PRIVATE_KEY)
+
+        with mock.patch('core.payments.sci_callback.middleman_client.send_request', return_value=error_frame) as send_request:
+            raw_response = send_request_to_middleman(self.middleman_message)
+
+        self.assertEqual(raw_response, error_frame)
+        self.assertEqual(send_request.call_count, 1)
+
+    def test_that_response_which_is_not_error_frame_is_deserialized_only_once(self):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
+                    with mock.patch(
+                        'middleman_protocol.message.AbstractFrame.deserialize',
+                        wraps=GolemMessageFrame.deserialize,
+                    ) as deserialize:
+                        signed_transaction = sci_callback(self.transaction)
+
+        self.assertEqual(signed_transaction.v, self.v)
+        self.assertEqual(deserialize.call_count, 1)
+
     def test_that_sci_callback_should_raise_exception_when_response_is_transaction_rejected(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     with mock.patch(
                         'middleman_protocol.message.AbstractFrame.deserialize',
                         return_value=GolemMessageFrame(
@@ -193,9 +257,9 @@ class SCICallbackTest(TestCase):
                             sci_callback(self.transaction)
 
     def test_that_sci_callback_should_raise_exception_when_response_is_not_signed_transaction_golem_message(self):
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     with mock.patch(
                         'middleman_protocol.message.AbstractFrame.deserialize',
                         return_value=GolemMessageFrame(payload=Ping(), request_id=self.request_id),
@@ -208,9 +272,9 @@ class SCICallbackTest(TestCase):
         wrong_signed_transaction.v = self.v - 10
         wrong_signed_transaction.sign_message(SIGNING_SERVICE_PRIVATE_KEY)
 
-        with mock.patch('core.payments.sci_callback.socket.socket.connect'):
-            with mock.patch('core.payments.sci_callback.send_over_stream'):
-                with mock.patch('core.payments.sci_callback.unescape_stream', side_effect=self.frame_iterator):
+        with mock.patch('core.payments.middleman_client.socket.socket.connect'):
+            with mock.patch('core.payments.middleman_client.socket.socket.sendall', side_effect=self._get_sendall()):
+                with mock.patch('core.payments.middleman_client.unescape_stream', side_effect=self.frame_iterator):
                     with mock.patch(
                         'middleman_protocol.message.AbstractFrame.deserialize',
                         return_value=GolemMessageFrame(payload=wrong_signed_transaction, request_id=self.request_id),
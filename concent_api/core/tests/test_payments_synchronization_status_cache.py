@@ -0,0 +1,53 @@
+import mock
+from assertpy import assert_that
+
+from core.payments.synchronization_status_cache import SynchronizationStatusCache
+
+
+class TestSynchronizationStatusCache:
+
+    def setup_method(self):
+        self.cache = SynchronizationStatusCache(refresh_interval=5, timeout=15)  # pylint: disable=attribute-defined-outside-init
+        self.check_synchronization = mock.Mock(return_value=True)  # pylint: disable=attribute-defined-outside-init
+
+    def test_that_positive_status_is_used_until_refresh_interval_passes(self):
+        with mock.patch('core.payments.synchronization_status_cache.monotonic', side_effect=[100.0, 100.0, 104.0]):
+            with mock.patch('core.payments.synchronization_status_cache.Thread') as thread_mock:
+                assert_that(self.cache.is_synchronized(self.check_synchronization)).is_true()
+                assert_that(self.cache.is_synchronized(self.check_synchronization)).is_true()
+
+        assert_that(self.check_synchronization.call_count).is_equal_to(1)
+        thread_mock.assert_not_called()
+
+    def test_that_status_older_than_refresh_interval_is_used_while_being_refreshed_in_background(self):
+        with mock.patch('core.payments.synchronization_status_cache.monotonic', side_effect=[100.0, 100.0, 106.0, 107.0, 108.0, 108.0]):
+            with mock.patch('core.payments.synchronization_status_cache.Thread') as thread_mock:
+                self.cache.is_synchronized(self.check_synchronization)
+                self.check_synchronization.return_value = False
+
+                assert_that(self.cache.is_synchronized(self.check_synchronization)).is_true()
+                assert_that(self.check_synchronization.call_count).is_equal_to(1)
+                assert_that(thread_mock.call_count).is_equal_to(1)
+
+                thread_mock.call_args[1]['target'](*thread_mock.call_args[1]['args'])
+
+                assert_that(self.cache.is_synchronized(self.check_synchronization)).is_false()
+                assert_that(self.check_synchronization.call_count).is_equal_to(3)
+
+    def test_that_status_is_checked_by_caller_after_timeout(self):
+        with mock.patch('core.payments.synchronization_status_cache.monotonic', side_effect=[100.0, 100.0, 115.0, 115.0]):
+            with mock.patch('core.payments.synchronization_status_cache.Thread') as thread_mock:
+                self.cache.is_synchronized(self.check_synchronization)
+                self.cache.is_synchronized(self.check_synchronization)
+
+        assert_that(self.check_synchronization.call_count).is_equal_to(2)
+        thread_mock.assert_not_called()
+
+    def test_that_negative_status_is_not_cached(self):
+        self.check_synchronization.return_value = False
+
+        assert_that(self.cache.is_synchronized(self.check_synchronization)).is_false()
+        self.check_synchronization.return_value = True
+        assert_that(self.cache.is_synchronized(self.check_synchronization)).is_true()
+
+        assert_that(self.check_synchronization.call_count).is_equal_to(2)
@@ -0,0 +1,117 @@
+import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import override_settings
+from django.test import TestCase
+from golem_messages import message
+
+from common.helpers import get_current_utc_timestamp
+from core.message_handlers import store_subtask
+from core.models import PendingResponse
+from core.models import Subtask
+from core.receive_cache import call_unless_nothing_pending
+from core.receive_cache import get_receive_cache_statistics
+from core.receive_cache import invalidate_receive_cache
+from core.tests.utils import ConcentIntegrationTestCase
+from core.transfer_operations import store_pending_message
+
+
+@override_settings(RECEIVE_CACHE_ALIAS='default')
+class ReceiveCacheTest(TestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client_public_key = b'x' * 64
+
+    def test_that_function_is_not_called_again_if_it_returned_none(self):
+        function = mock.Mock(return_value=None)
+
+        self.assertIsNone(call_unless_nothing_pending(self.client_public_key, function))
+        self.assertIsNone(call_unless_nothing_pending(self.client_public_key, function))
+
+        function.assert_called_once_with()
+        self.assertEqual(get_receive_cache_statistics(), {'hits': 1, 'misses': 1, 'requests': 2})
+
+    def test_that_function_is_called_again_if_it_returned_message(self):
+        function = mock.Mock(return_value=mock.sentinel.message)
+
+        self.assertEqual(call_unless_nothing_pending(self.client_public_key, function), mock.sentinel.message)
+        self.assertEqual(call_unless_nothing_pending(self.client_public_key, function), mock.sentinel.message)
+
+        self.assertEqual(function.call_count, 2)
+        self.assertEqual(get_receive_cache_statistics(), {'hits': 0, 'misses': 2, 'requests': 2})
+
+    def test_that_client_is_not_remembered_as_having_nothing_pending_after_invalidation(self):
+        function = mock.Mock(return_value=None)
+
+        call_unless_nothing_pending(self.client_public_key, function)
+        invalidate_receive_cache(self.client_public_key)
+        call_unless_nothing_pending(self.client_public_key, function)
+        call_unless_nothing_pending(self.client_public_key, function)
+
+        self.assertEqual(function.call_count, 3)
+
+    def test_that_cache_is_not_used_if_receive_cache_alias_is_not_set(self):
+        function = mock.Mock(return_value=None)
+
+        with override_settings(RECEIVE_CACHE_ALIAS=None):
+            call_unless_nothing_pending(self.client_public_key, function)
+            call_unless_nothing_pending(self.client_public_key, function)
+
+            self.assertEqual(get_receive_cache_statistics(), {})
+        self.assertEqual(function.call_count, 2)
+
+
+@override_settings(RECEIVE_CACHE_ALIAS='default')
+class ReceiveCacheIntegrationTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def _send_receive_request(self):
+        return self.send_request(
+            url='core:receive',
+            data=self._create_client_auth_message(self.REQUESTOR_PRIVATE_KEY, self.REQUESTOR_PUBLIC_KEY),
+        )
+
+    def test_that_receive_returns_message_stored_after_client_was_remembered_as_having_nothing_pending(self):
+        compute_task_def = self._get_deserialized_compute_task_def(
+            kwargs={'deadline': get_current_utc_timestamp() + 100}
+        )
+        task_to_compute = self._get_deserialized_task_to_compute(
+            compute_task_def=compute_task_def,
+        )
+        subtask = store_subtask(
+            task_id=compute_task_def['task_id'],
+            subtask_id=compute_task_def['subtask_id'],
+            provider_public_key=self.PROVIDER_PUBLIC_KEY,
+            requestor_public_key=self.REQUESTOR_PUBLIC_KEY,
+            state=Subtask.SubtaskState.FORCING_REPORT,
+            next_deadline=int(compute_task_def['deadline']) + settings.CONCENT_MESSAGING_TIME,
+            task_to_compute=task_to_compute,
+            report_computed_task=self._get_deserialized_report_computed_task(task_to_compute=task_to_compute),
+        )
+
+        self._test_204_response(self._send_receive_request())
+        with mock.patch('core.views.handle_messages_from_database') as handle_messages_from_database_mock:
+            self._test_204_response(self._send_receive_request())
+        handle_messages_from_database_mock.assert_not_called()
+
+        # Test case runs in a transaction which is never committed, so on_commit() callbacks have to be run immediately.
+        with mock.patch('django.db.transaction.on_commit', side_effect=lambda function, using: function()):
+            store_pending_message(
+                response_type=PendingResponse.ResponseType.ForceReportComputedTask,
+                client_public_key=self.REQUESTOR_PUBLIC_KEY,
+                queue=PendingResponse.Queue.Receive,
+                subtask=subtask,
+            )
+
+        self._test_response(
+            self._send_receive_request(),
+            status=200,
+            key=self.REQUESTOR_PRIVATE_KEY,
+            message_type=message.concents.ForceReportComputedTask,
+        )
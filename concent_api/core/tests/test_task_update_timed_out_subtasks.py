@@ -0,0 +1,135 @@
+import mock
+
+from django.conf import settings
+from django.test import override_settings
+from freezegun import freeze_time
+
+from core.message_handlers import store_subtask
+from core.models import PendingResponse
+from core.models import Subtask
+from core.subtask_helpers import update_batch_of_timed_out_subtasks
+from core.tasks import update_timed_out_subtasks
+from core.tests.utils import ConcentIntegrationTestCase
+from core.transfer_operations import verify_file_status
+
+
+@override_settings(
+    CONCENT_MESSAGING_TIME=10,
+)
+class UpdateTimedOutSubtasksTaskTest(ConcentIntegrationTestCase):
+
+    multi_db = True
+
+    def setUp(self):
+        super().setUp()
+        self.subtasks = [self._store_subtask_in_forcing_report_state() for _ in range(3)]
+
+    def _store_subtask_in_forcing_report_state(self, deadline="2019-01-01 10:00:00"):
+        compute_task_def = self._get_deserialized_compute_task_def(
+            kwargs={'deadline': deadline},
+        )
+        task_to_compute = self._get_deserialized_task_to_compute(
+            timestamp="2019-01-01 09:00:00",
+            compute_task_def=compute_task_def,
+        )
+        report_computed_task = self._get_deserialized_report_computed_task(
+            timestamp="2019-01-01 09:30:00",
+            task_to_compute=task_to_compute,
+        )
+        with freeze_time("2019-01-01 09:30:00"):
+            return store_subtask(
+                task_id=compute_task_def['task_id'],
+                subtask_id=compute_task_def['subtask_id'],
+                provider_public_key=self.PROVIDER_PUBLIC_KEY,
+                requestor_public_key=self.REQUESTOR_PUBLIC_KEY,
+                state=Subtask.SubtaskState.FORCING_REPORT,
+                next_deadline=int(compute_task_def['deadline']) + settings.CONCENT_MESSAGING_TIME,
+                task_to_compute=task_to_compute,
+                report_computed_task=report_computed_task,
+            )
+
+    def test_that_subtasks_before_deadline_are_not_updated(self):
+        with freeze_time("2019-01-01 10:00:00"):
+            update_timed_out_subtasks()
+
+        for subtask in self.subtasks:
+            subtask.refresh_from_db()
+            self.assertEqual(subtask.state_enum, Subtask.SubtaskState.FORCING_REPORT)
+        self.assertEqual(PendingResponse.objects.count(), 0)
+
+    def test_that_timed_out_subtasks_are_updated_without_client_calling_receive(self):
+        with freeze_time("2019-01-01 10:00:11"):
+            update_timed_out_subtasks()
+
+        for subtask in self.subtasks:
+            subtask.refresh_from_db()
+            self.assertEqual(subtask.state_enum, Subtask.SubtaskState.REPORTED)
+            self.assertIsNone(subtask.next_deadline)
+            self.assertEqual(
+                set(PendingResponse.objects.filter(subtask=subtask).values_list('response_type', flat=True)),
+                {
+                    PendingResponse.ResponseType.ForceReportComputedTaskResponse.name,  # pylint: disable=no-member
+                    PendingResponse.ResponseType.VerdictReportComputedTask.name,  # pylint: disable=no-member
+                }
+            )
+
+    def test_that_update_batch_of_timed_out_subtasks_processes_at_most_batch_size_subtasks(self):
+        with freeze_time("2019-01-01 10:00:11"):
+            first_batch = update_batch_of_timed_out_subtasks(batch_size=2)
+            self.assertEqual(first_batch.number_of_processed_subtasks, 2)
+            self.assertEqual(
+                Subtask.objects.filter(state=Subtask.SubtaskState.REPORTED.name).count(),  # pylint: disable=no-member
+                2,
+            )
+            second_batch = update_batch_of_timed_out_subtasks(batch_size=2, after=first_batch.last_position)
+            self.assertEqual(second_batch.number_of_processed_subtasks, 1)
+            third_batch = update_batch_of_timed_out_subtasks(batch_size=2, after=second_batch.last_position)
+            self.assertEqual(third_batch.number_of_processed_subtasks, 0)
+            self.assertIsNone(third_batch.last_position)
+
+        self.assertFalse(Subtask.objects.filter(state=Subtask.SubtaskState.FORCING_REPORT.name).exists())  # pylint: disable=no-member
+
+    def test_that_subtask_whose_update_fails_does_not_stop_other_subtasks_from_being_updated(self):
+        failing_subtask_id = self.subtasks[0].subtask_id
+
+        def verify_file_status_failing_for_one_subtask(subtask, client_public_key):
+            if subtask.subtask_id == failing_subtask_id:
+                raise ValueError('File status cannot be verified')
+            verify_file_status(subtask=subtask, client_public_key=client_public_key)
+
+        with freeze_time("2019-01-01 10:00:11"):
+            with mock.patch(
+                'core.subtask_helpers.verify_file_status',
+                side_effect=verify_file_status_failing_for_one_subtask,
+            ):
+                self.assertEqual(update_batch_of_timed_out_subtasks(batch_size=3).number_of_processed_subtasks, 2)
+
+        for subtask in self.subtasks:
+            subtask.refresh_from_db()
+        self.assertEqual(self.subtasks[0].state_enum, Subtask.SubtaskState.FORCING_REPORT)
+        self.assertFalse(PendingResponse.objects.filter(subtask=self.subtasks[0]).exists())
+        for subtask in self.subtasks[1:]:
+            self.assertEqual(subtask.state_enum, Subtask.SubtaskState.REPORTED)
+
+    def test_that_subtasks_which_keep_failing_do_not_stop_sweeper_from_reaching_subtasks_with_later_deadline(self):
+        failing_subtask_ids = {subtask.subtask_id for subtask in self.subtasks}
+        healthy_subtask = self._store_subtask_in_forcing_report_state(deadline="2019-01-01 10:00:01")
+
+        def verify_file_status_failing_for_some_subtasks(subtask, client_public_key):
+            if subtask.subtask_id in failing_subtask_ids:
+                raise ValueError('File status cannot be verified')
+            verify_file_status(subtask=subtask, client_public_key=client_public_key)
+
+        with freeze_time("2019-01-01 10:00:11"):
+            with mock.patch('core.tasks.TIMED_OUT_SUBTASKS_SWEEPER_BATCH_SIZE', len(self.subtasks) - 1):
+                with mock.patch(
+                    'core.subtask_helpers.verify_file_status',
+                    side_effect=verify_file_status_failing_for_some_subtasks,
+                ):
+                    update_timed_out_subtasks()
+
+        healthy_subtask.refresh_from_db()
+        self.assertEqual(healthy_subtask.state_enum, Subtask.SubtaskState.REPORTED)
+        for subtask in self.subtasks:
+            subtask.refresh_from_db()
+            self.assertEqual(subtask.state_enum, Subtask.SubtaskState.FORCING_REPORT)
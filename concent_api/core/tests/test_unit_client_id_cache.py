@@ -0,0 +1,90 @@
+import pytest
+from assertpy import assert_that
+from django.core.exceptions import ValidationError
+
+from core.client_id_cache import ClientIdCache
+from core.client_id_cache import client_id_cache
+from core.models import Client
+from core.models import DepositAccount
+from core.tests.utils import ConcentIntegrationTestCase
+
+
+class TestClientIdCache:
+
+    def test_that_added_id_is_returned(self):  # pylint: disable=no-self-use
+        cache = ClientIdCache()
+        cache.add(b'public key', 1)
+
+        assert_that(cache.get(b'public key')).is_equal_to(1)
+        assert_that(cache.get(b'other public key')).is_none()
+
+    def test_that_least_recently_used_id_is_evicted_when_cache_is_full(self):  # pylint: disable=no-self-use
+        cache = ClientIdCache(maximum_size=2)
+        cache.add(b'first', 1)
+        cache.add(b'second', 2)
+        cache.get(b'first')
+        cache.add(b'third', 3)
+
+        assert_that(cache.get(b'first')).is_equal_to(1)
+        assert_that(cache.get(b'second')).is_none()
+        assert_that(cache.get(b'third')).is_equal_to(3)
+        assert_that(len(cache)).is_equal_to(2)
+
+
+class ClientAndDepositAccountUpsertTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        client_id_cache.clear()
+        self.task_to_compute = self._get_deserialized_task_to_compute()
+
+    def tearDown(self):
+        client_id_cache.clear()
+        super().tearDown()
+
+    def test_that_existing_client_is_returned_instead_of_creating_new_one(self):
+        client = Client.objects.get_or_create_full_clean(self.REQUESTOR_PUBLIC_KEY)
+        same_client = Client.objects.get_or_create_full_clean(self.REQUESTOR_PUBLIC_KEY)
+
+        self.assertEqual(client.pk, same_client.pk)
+        self.assertEqual(same_client.public_key_bytes, self.REQUESTOR_PUBLIC_KEY)
+        self.assertEqual(Client.objects.count(), 1)
+
+    def test_that_client_is_not_cached_before_transaction_is_committed(self):
+        Client.objects.get_or_create_full_clean(self.REQUESTOR_PUBLIC_KEY)
+
+        self.assertIsNone(client_id_cache.get(self.REQUESTOR_PUBLIC_KEY))
+
+    def test_that_cached_client_is_returned_without_querying_database(self):
+        client = Client.objects.get_or_create_full_clean(self.REQUESTOR_PUBLIC_KEY)
+        client_id_cache.add(self.REQUESTOR_PUBLIC_KEY, client.pk)
+
+        with self.assertNumQueries(0, using='control'):
+            cached_client = Client.objects.get_or_create_full_clean(self.REQUESTOR_PUBLIC_KEY)
+
+        self.assertEqual(cached_client.pk, client.pk)
+
+    def test_that_existing_deposit_account_is_returned_instead_of_creating_new_one(self):
+        client = Client.objects.get_or_create_full_clean(self.REQUESTOR_PUBLIC_KEY)
+
+        deposit_account = DepositAccount.objects.get_or_create_full_clean(
+            client=client,
+            ethereum_address=self.task_to_compute.requestor_ethereum_address,
+        )
+        same_deposit_account = DepositAccount.objects.get_or_create_full_clean(
+            client=client,
+            ethereum_address=self.task_to_compute.requestor_ethereum_address,
+        )
+
+        self.assertEqual(deposit_account.pk, same_deposit_account.pk)
+        self.assertEqual(same_deposit_account.client_id, client.pk)
+        self.assertEqual(same_deposit_account.total_claimed, 0)
+        self.assertEqual(DepositAccount.objects.count(), 1)
+
+    def test_that_deposit_account_with_invalid_ethereum_address_is_not_created(self):
+        client = Client.objects.get_or_create_full_clean(self.REQUESTOR_PUBLIC_KEY)
+
+        with pytest.raises(ValidationError):
+            DepositAccount.objects.get_or_create_full_clean(client=client, ethereum_address='0x123')
+
+        self.assertEqual(DepositAccount.objects.count(), 0)
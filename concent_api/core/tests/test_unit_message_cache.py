@@ -0,0 +1,83 @@
+import mock
+from assertpy import assert_that
+from golem_messages.factories import tasks
+
+from core.message_cache import DeserializedMessageCache
+from core.message_cache import deserialize_stored_message
+from core.message_cache import get_deserialized_message_cache
+from core.message_cache import reset_deserialized_message_cache
+from core.message_handlers import store_message
+from core.models import StoredMessage
+from core.tests.utils import ConcentIntegrationTestCase
+
+
+class TestDeserializedMessageCache:
+
+    def test_that_least_recently_used_message_is_evicted_when_cache_is_full(self):  # pylint: disable=no-self-use
+        cache = DeserializedMessageCache(maximum_size=2)
+        cache.add(1, mock.sentinel.first_message)
+        cache.add(2, mock.sentinel.second_message)
+        cache.get(1)
+        cache.add(3, mock.sentinel.third_message)
+
+        assert_that(cache).does_not_contain(2)
+        assert_that(cache.get(1)).is_equal_to(mock.sentinel.first_message)
+        assert_that(cache.get(3)).is_equal_to(mock.sentinel.third_message)
+        assert_that(len(cache)).is_equal_to(2)
+
+    def test_that_hits_and_misses_are_counted(self):  # pylint: disable=no-self-use
+        cache = DeserializedMessageCache()
+        cache.add(1, mock.sentinel.message)
+
+        cache.get(1)
+        cache.get(1)
+        cache.get(1)
+        cache.get(2)
+
+        assert_that(cache.hits).is_equal_to(3)
+        assert_that(cache.misses).is_equal_to(1)
+        assert_that(cache.hit_rate).is_equal_to(0.75)
+
+    def test_that_clear_removes_messages_and_resets_counters(self):  # pylint: disable=no-self-use
+        cache = DeserializedMessageCache()
+        cache.add(1, mock.sentinel.message)
+        cache.get(1)
+
+        cache.clear()
+
+        assert_that(len(cache)).is_equal_to(0)
+        assert_that(cache.hits).is_equal_to(0)
+        assert_that(cache.misses).is_equal_to(0)
+
+
+class DeserializeStoredMessageTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        reset_deserialized_message_cache('test')
+        task_to_compute = tasks.TaskToComputeFactory()
+        self.stored_message = store_message(task_to_compute, task_to_compute.task_id, task_to_compute.subtask_id)
+
+    def tearDown(self):
+        reset_deserialized_message_cache('test')
+        super().tearDown()
+
+    def test_that_stored_message_is_not_deserialized_after_being_stored(self):
+        with mock.patch('core.message_cache.deserialize_message') as deserialize_message_mock:
+            deserialized_message = deserialize_stored_message(StoredMessage.objects.get(pk=self.stored_message.pk))
+
+        deserialize_message_mock.assert_not_called()
+        self.assertEqual(deserialized_message.subtask_id, self.stored_message.subtask_id)
+
+    def test_that_stored_message_is_deserialized_only_once(self):
+        reset_deserialized_message_cache('test')
+        stored_message = StoredMessage.objects.get(pk=self.stored_message.pk)
+
+        first_deserialized_message = deserialize_stored_message(stored_message)
+        with mock.patch('core.message_cache.deserialize_message') as deserialize_message_mock:
+            second_deserialized_message = deserialize_stored_message(stored_message)
+
+        deserialize_message_mock.assert_not_called()
+        self.assertIs(first_deserialized_message, second_deserialized_message)
+        self.assertEqual(get_deserialized_message_cache().hits, 1)
+        self.assertEqual(get_deserialized_message_cache().misses, 1)
@@ -0,0 +1,88 @@
+from copy import copy
+
+from assertpy import assert_that
+from golem_messages.factories import tasks
+
+from core.message_compression import compress_message_data
+from core.message_compression import decompress_message_data
+from core.message_compression import train_compression_dictionary
+from core.message_handlers import store_message
+from core.models import MessageCompressionDictionary
+from core.models import StoredMessage
+from core.models import StoredMessageData
+from core.tests.utils import ConcentIntegrationTestCase
+
+
+def _get_serialized_tasks_to_compute(number):
+    return [copy(tasks.TaskToComputeFactory()).serialize() for _ in range(number)]
+
+
+class TestMessageCompression:
+
+    def test_that_data_compressed_without_dictionary_is_decompressed_to_original_data(self):  # pylint: disable=no-self-use
+        [data] = _get_serialized_tasks_to_compute(1)
+
+        assert_that(decompress_message_data(compress_message_data(data))).is_equal_to(data)
+
+    def test_that_data_compressed_with_dictionary_is_decompressed_to_original_data(self):  # pylint: disable=no-self-use
+        [data, *samples] = _get_serialized_tasks_to_compute(10)
+        dictionary = train_compression_dictionary(samples)
+
+        assert_that(decompress_message_data(compress_message_data(data, dictionary), dictionary)).is_equal_to(data)
+
+    def test_that_trained_dictionary_does_not_exceed_given_size(self):  # pylint: disable=no-self-use
+        dictionary = train_compression_dictionary(_get_serialized_tasks_to_compute(10), dictionary_size=100)
+
+        assert_that(len(dictionary)).is_less_than_or_equal_to(100)
+
+    def test_that_trained_dictionary_improves_compression_of_similar_messages(self):  # pylint: disable=no-self-use
+        [data, *samples] = _get_serialized_tasks_to_compute(10)
+        dictionary = train_compression_dictionary(samples)
+
+        assert_that(len(compress_message_data(data, dictionary))).is_less_than(len(compress_message_data(data)))
+
+    def test_that_dictionary_is_empty_if_samples_have_nothing_in_common(self):  # pylint: disable=no-self-use
+        assert_that(train_compression_dictionary([b'a' * 100, b'b' * 100])).is_equal_to(b'')
+
+
+class StoredMessageDataCompressionTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task_to_compute = tasks.TaskToComputeFactory()
+
+    def _store_and_reload_message(self):
+        stored_message = store_message(self.task_to_compute, self.task_to_compute.task_id, self.task_to_compute.subtask_id)
+        return StoredMessage.objects.get(pk=stored_message.pk)
+
+    def test_that_message_is_compressed_without_dictionary_if_no_dictionary_has_been_trained(self):
+        stored_message = self._store_and_reload_message()
+
+        self.assertEqual(stored_message.message_data.codec, StoredMessageData.Codec.ZLIB.name)  # pylint: disable=no-member
+        self.assertIsNone(stored_message.message_data.compression_dictionary_id)
+        self.assertEqual(stored_message.data, copy(self.task_to_compute).serialize())
+
+    def test_that_message_is_compressed_with_latest_dictionary(self):
+        MessageCompressionDictionary.objects.create(data=b'outdated dictionary')
+        latest_dictionary = MessageCompressionDictionary.objects.create(
+            data=train_compression_dictionary(_get_serialized_tasks_to_compute(10)),
+        )
+
+        stored_message = self._store_and_reload_message()
+
+        self.assertEqual(stored_message.message_data.codec, StoredMessageData.Codec.ZLIB.name)  # pylint: disable=no-member
+        self.assertEqual(stored_message.message_data.compression_dictionary_id, latest_dictionary.pk)
+        self.assertEqual(stored_message.data, copy(self.task_to_compute).serialize())
+
+    def test_that_uncompressed_message_is_read_without_decompression(self):
+        data = copy(self.task_to_compute).serialize()
+        stored_message_data = StoredMessageData.objects.create(
+            digest='0' * 64,
+            data=data,
+            codec=StoredMessageData.Codec.UNCOMPRESSED.name,  # pylint: disable=no-member
+        )
+
+        decompressed_data = StoredMessageData.objects.get(pk=stored_message_data.pk).decompressed_data
+
+        self.assertIsInstance(decompressed_data, bytes)
+        self.assertEqual(decompressed_data, data)
@@ -2,6 +2,7 @@ from unittest import TestCase
 import pytest
 
 from django.conf import settings
+from django.db import transaction
 from django.test import override_settings
 from django.test.utils import freeze_time
 from golem_messages import message
@@ -9,12 +10,15 @@ from golem_messages import message
 from common.helpers import parse_timestamp_to_utc_datetime
 from core.exceptions import GolemMessageValidationError
 from core.message_handlers import are_items_unique
+from core.message_handlers import get_undelivered_pending_responses_for_update
 from core.message_handlers import handle_send_force_payment
 from core.message_handlers import update_and_return_updated_subtask
 from core.message_handlers import store_subtask
+from core.models import PendingResponse
 from core.models import Subtask
 from core.tests.utils import ConcentIntegrationTestCase
 from core.tests.utils import parse_iso_date_to_timestamp
+from core.transfer_operations import store_pending_message
 from core.utils import hex_to_bytes_convert
 from core.validation import validate_reject_report_computed_task
 
@@ -170,3 +174,61 @@ class TestCorrectMessageToForcePaymentHandler:
 
         with pytest.raises(AssertionError):
             handle_send_force_payment(force_payment)
+
+
+class TestGetUndeliveredPendingResponsesForUpdate(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.pending_responses = []
+        for (timestamp, response_type) in [
+            ("2017-12-01 10:00:00", PendingResponse.ResponseType.ForceReportComputedTask),
+            ("2017-12-01 10:00:02", PendingResponse.ResponseType.SubtaskResultsSettled),
+            ("2017-12-01 10:00:01", PendingResponse.ResponseType.ForceReportComputedTask),
+        ]:
+            task_to_compute = self._get_deserialized_task_to_compute(
+                compute_task_def=self._get_deserialized_compute_task_def(kwargs={'deadline': "2017-12-01 11:00:00"}),
+            )
+            with freeze_time(timestamp):
+                subtask = store_subtask(
+                    task_id=task_to_compute.task_id,
+                    subtask_id=task_to_compute.subtask_id,
+                    provider_public_key=self.PROVIDER_PUBLIC_KEY,
+                    requestor_public_key=self.REQUESTOR_PUBLIC_KEY,
+                    state=Subtask.SubtaskState.FORCING_REPORT,
+                    next_deadline=parse_iso_date_to_timestamp("2017-12-01 11:00:00") + settings.CONCENT_MESSAGING_TIME,
+                    task_to_compute=task_to_compute,
+                    report_computed_task=self._get_deserialized_report_computed_task(task_to_compute=task_to_compute),
+                )
+                store_pending_message(
+                    response_type=response_type,
+                    client_public_key=self.REQUESTOR_PUBLIC_KEY,
+                    queue=PendingResponse.Queue.Receive,
+                    subtask=subtask,
+                )
+            self.pending_responses.append(PendingResponse.objects.get(subtask=subtask))
+
+    def test_that_oldest_pending_responses_are_returned_in_order_of_creation(self):
+        with transaction.atomic(using='control'):
+            pending_responses = get_undelivered_pending_responses_for_update(self.REQUESTOR_PUBLIC_KEY, limit=2)
+
+        self.assertEqual(pending_responses, [self.pending_responses[0], self.pending_responses[2]])
+
+    def test_that_delivered_pending_responses_and_pending_responses_of_other_clients_are_not_returned(self):
+        PendingResponse.objects.filter(pk=self.pending_responses[0].pk).update(delivered=True)
+
+        with transaction.atomic(using='control'):
+            pending_responses = get_undelivered_pending_responses_for_update(self.REQUESTOR_PUBLIC_KEY, limit=10)
+            pending_responses_of_provider = get_undelivered_pending_responses_for_update(self.PROVIDER_PUBLIC_KEY, limit=10)
+
+        self.assertEqual(pending_responses, [self.pending_responses[2], self.pending_responses[1]])
+        self.assertEqual(pending_responses_of_provider, [])
+
+    def test_that_related_messages_needed_to_build_response_are_fetched_together_with_pending_responses(self):
+        with transaction.atomic(using='control'):
+            with self.assertNumQueries(2):
+                pending_responses = get_undelivered_pending_responses_for_update(self.REQUESTOR_PUBLIC_KEY, limit=10)
+
+            with self.assertNumQueries(0):
+                self.assertIsNotNone(pending_responses[0].subtask.report_computed_task.data)
+                self.assertIsNotNone(pending_responses[2].subtask.task_to_compute.data)
@@ -1,3 +1,5 @@
+import uuid
+
 import mock
 import pytest
 from django.test import override_settings
@@ -16,9 +18,14 @@ from core.constants import BIG_ENDIAN_INT_MAX_DIGITS
 from core.constants import MOCK_TRANSACTION
 from core.message_handlers import store_message
 from core.message_handlers import store_subtask
+from core.model_helpers import correct_total_claimed
+from core.model_helpers import delete_unreferenced_stored_message_data
+from core.model_helpers import find_deposit_accounts_with_incorrect_total_claimed
 from core.models import Client
 from core.models import DepositAccount
 from core.models import DepositClaim
+from core.models import StoredMessage
+from core.models import StoredMessageData
 from core.models import Subtask
 from core.tests.utils import ConcentIntegrationTestCase
 from core.utils import get_major_and_minor_golem_messages_version
@@ -229,6 +236,55 @@ def store_report_computed_task_as_subtask():
     return subtask
 
 
+class SubtaskRelatedMessagesValidationTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        with mock.patch.object(Subtask, '_deserialize_database_message') as deserialize_database_message_mock:
+            self.subtask = store_report_computed_task_as_subtask()
+
+        # Messages passed to store_subtask() are already in memory, so they should not be deserialized.
+        deserialize_database_message_mock.assert_not_called()
+
+    def test_that_related_messages_are_not_loaded_if_fields_validated_against_them_have_not_changed(self):
+        subtask = Subtask.objects.get(pk=self.subtask.pk)
+
+        with mock.patch.object(Subtask, '_deserialize_database_message') as deserialize_database_message_mock:
+            with mock.patch.object(Subtask, '_get_related_message_protocol_versions') as get_protocol_versions_mock:
+                subtask.full_clean()
+
+        deserialize_database_message_mock.assert_not_called()
+        get_protocol_versions_mock.assert_not_called()
+
+    def test_that_related_messages_are_validated_if_field_validated_against_them_has_changed(self):
+        subtask = Subtask.objects.get(pk=self.subtask.pk)
+        subtask.result_package_size += 1
+
+        with self.assertRaises(ValidationError) as error:
+            subtask.full_clean()
+
+        self.assertIn('result_package_size', error.exception.message_dict)
+
+    def test_that_protocol_versions_of_related_messages_not_loaded_into_memory_are_fetched_in_single_query(self):
+        subtask = Subtask.objects.get(pk=self.subtask.pk)
+
+        with self.assertNumQueries(1):
+            protocol_versions = subtask._get_related_message_protocol_versions()  # pylint: disable=protected-access
+
+        self.assertEqual(
+            set(protocol_versions),
+            {
+                'task_to_compute',
+                'want_to_compute_task',
+                'report_computed_task',
+                'ack_report_computed_task',
+                'force_get_task_result',
+                'subtask_results_rejected',
+            }
+        )
+        self.assertEqual(set(protocol_versions.values()), {subtask.protocol_version})
+
+
 class TestDepositAccountValidation(ConcentIntegrationTestCase):
     def setUp(self):
         super().setUp()
@@ -348,6 +404,109 @@ class TestDepositClaimValidation(ConcentIntegrationTestCase):
         self.deposit_claim.save()
 
 
+class DepositAccountTotalClaimedTest(ConcentIntegrationTestCase):
+    def setUp(self):
+        super().setUp()
+        task_to_compute = self._get_deserialized_task_to_compute()
+        self.payee_ethereum_address = task_to_compute.provider_ethereum_address
+
+        client = Client(public_key_bytes=self.REQUESTOR_PUBLIC_KEY)
+        client.clean()
+        client.save()
+
+        self.deposit_account = DepositAccount(client=client, ethereum_address=task_to_compute.requestor_ethereum_address)
+        self.deposit_account.clean()
+        self.deposit_account.save()
+
+    def _create_deposit_claim(self, amount):
+        deposit_claim = DepositClaim(
+            payer_deposit_account=self.deposit_account,
+            subtask_id=str(uuid.uuid4()),
+            payee_ethereum_address=self.payee_ethereum_address,
+            concent_use_case=ConcentUseCase.FORCED_ACCEPTANCE.value,
+            amount=amount,
+        )
+        deposit_claim.full_clean()
+        deposit_claim.save()
+        return deposit_claim
+
+    def _get_total_claimed(self):
+        return DepositAccount.objects.get(pk=self.deposit_account.pk).total_claimed
+
+    def test_that_total_claimed_is_updated_when_deposit_claims_are_created_modified_and_deleted(self):
+        deposit_claim = self._create_deposit_claim(10)
+        self._create_deposit_claim(5)
+        self.assertEqual(self._get_total_claimed(), 15)
+
+        deposit_claim.amount = 3
+        deposit_claim.save()
+        self.assertEqual(self._get_total_claimed(), 8)
+
+        deposit_claim.delete()
+        self.assertEqual(self._get_total_claimed(), 5)
+
+    def test_that_saving_deposit_account_does_not_overwrite_total_claimed(self):
+        self._create_deposit_claim(10)
+
+        self.deposit_account.save()
+
+        self.assertEqual(self._get_total_claimed(), 10)
+
+    def test_that_incorrect_total_claimed_is_found_and_corrected(self):
+        self._create_deposit_claim(10)
+        DepositAccount.objects.filter(pk=self.deposit_account.pk).update(total_claimed=7)
+
+        self.assertEqual(find_deposit_accounts_with_incorrect_total_claimed(), [(self.deposit_account.pk, 7, 10)])
+
+        correct_total_claimed(self.deposit_account.pk)
+
+        self.assertEqual(self._get_total_claimed(), 10)
+        self.assertEqual(find_deposit_accounts_with_incorrect_total_claimed(), [])
+
+
+class StoredMessageDataDeduplicationTest(ConcentIntegrationTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.task_to_compute = tasks.TaskToComputeFactory(sign__privkey=REQUESTOR_PRIVATE_KEY)
+
+    def test_that_identical_messages_share_stored_message_data(self):
+        first_stored_message = store_message(self.task_to_compute, self.task_to_compute.task_id, self.task_to_compute.subtask_id)
+        second_stored_message = store_message(self.task_to_compute, self.task_to_compute.task_id, self.task_to_compute.subtask_id)
+
+        self.assertNotEqual(first_stored_message.pk, second_stored_message.pk)
+        self.assertEqual(first_stored_message.message_data_id, second_stored_message.message_data_id)
+        self.assertEqual(StoredMessageData.objects.count(), 1)
+
+    def test_that_different_messages_do_not_share_stored_message_data(self):
+        different_task_to_compute = tasks.TaskToComputeFactory(sign__privkey=REQUESTOR_PRIVATE_KEY)
+
+        first_stored_message = store_message(self.task_to_compute, self.task_to_compute.task_id, self.task_to_compute.subtask_id)
+        second_stored_message = store_message(different_task_to_compute, different_task_to_compute.task_id, different_task_to_compute.subtask_id)
+
+        self.assertNotEqual(first_stored_message.message_data_id, second_stored_message.message_data_id)
+        self.assertEqual(StoredMessageData.objects.count(), 2)
+
+    def test_that_data_of_stored_message_loaded_from_database_is_equal_to_stored_data(self):
+        stored_message = store_message(self.task_to_compute, self.task_to_compute.task_id, self.task_to_compute.subtask_id)
+
+        with self.assertNumQueries(1):
+            data = StoredMessage.objects.get(pk=stored_message.pk).data
+
+        self.assertEqual(bytes(data), bytes(stored_message.data))
+
+    def test_that_only_unreferenced_stored_message_data_is_deleted(self):
+        first_stored_message = store_message(self.task_to_compute, self.task_to_compute.task_id, self.task_to_compute.subtask_id)
+        second_stored_message = store_message(self.task_to_compute, self.task_to_compute.task_id, self.task_to_compute.subtask_id)
+
+        first_stored_message.delete()
+        self.assertEqual(delete_unreferenced_stored_message_data(batch_size=10), 0)
+
+        second_stored_message.delete()
+        self.assertEqual(delete_unreferenced_stored_message_data(batch_size=10), 1)
+        self.assertFalse(StoredMessageData.objects.exists())
+
+
 class ProtocolVersionValidationTest(ConcentIntegrationTestCase):
 
     def setUp(self):
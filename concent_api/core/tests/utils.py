@@ -1059,7 +1059,7 @@ class ConcentIntegrationTestCase(TestCase):
 
     def _test_report_computed_task_in_database(self, report_computed_task):
         subtask = Subtask.objects.get(subtask_id = report_computed_task.subtask_id)
-        stored_report_computed_task = message.Message.deserialize(subtask.report_computed_task.data.tobytes(), decrypt_func = None, check_time = False)
+        stored_report_computed_task = message.Message.deserialize(subtask.report_computed_task.data, decrypt_func = None, check_time = False)
         self.assertEqual(stored_report_computed_task, report_computed_task)
 
     @staticmethod
@@ -5,6 +5,7 @@ import requests
 
 from django.conf import settings
 from django.db import IntegrityError
+from django.db import transaction
 
 from golem_messages import message
 from golem_messages.message.concents import FileTransferToken
@@ -21,6 +22,8 @@ from core.models import Client
 from core.models import PaymentInfo
 from core.models import PendingResponse
 from core.models import Subtask
+from core.notifications import notify_about_pending_response
+from core.receive_cache import invalidate_receive_cache
 from core.utils import calculate_maximum_download_time
 from core.utils import calculate_subtask_verification_time
 
@@ -78,6 +81,9 @@ def store_pending_message(
     except IntegrityError:
         raise CreateModelIntegrityError
 
+    notify_about_pending_response(client_public_key)
+    transaction.on_commit(lambda: invalidate_receive_cache(client_public_key), using='control')
+
     logging.log_new_pending_response(
         logger,
         response_type.name,
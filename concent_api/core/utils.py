@@ -25,6 +25,8 @@ from core.exceptions import Http400
 from core.exceptions import SceneFilePathError
 from .constants import GOLEM_PUBLIC_KEY_HEX_LENGTH
 from .constants import GOLEM_PUBLIC_KEY_LENGTH
+from .constants import RECEIVE_BATCH_MAXIMUM_SIZE
+from .constants import RECEIVE_LONG_POLL_MAXIMUM_TIMEOUT
 from .constants import VALID_SCENE_FILE_PREFIXES
 
 logger = getLogger(__name__)
@@ -157,6 +159,40 @@ def is_given_golem_messages_version_supported_by_concent(
         return True
 
 
+def get_receive_batch_size(request: HttpRequest) -> int:
+    """
+    Returns number of messages requested by the client in `Concent-Batch-Size` header.
+    If header is missing, the maximum batch size is assumed.
+    """
+    if 'HTTP_CONCENT_BATCH_SIZE' not in request.META:
+        return RECEIVE_BATCH_MAXIMUM_SIZE
+
+    batch_size = request.META['HTTP_CONCENT_BATCH_SIZE']
+    if not batch_size.isdigit() or not 0 < int(batch_size) <= RECEIVE_BATCH_MAXIMUM_SIZE:
+        raise Http400(
+            f'Concent-Batch-Size header must be an integer between 1 and {RECEIVE_BATCH_MAXIMUM_SIZE}.',
+            error_code=ErrorCode.HEADER_BATCH_SIZE_INVALID,
+        )
+    return int(batch_size)
+
+
+def get_long_poll_timeout(request: HttpRequest) -> Optional[int]:
+    """
+    Returns number of seconds for which the client wants to wait for a pending message, given in
+    `Concent-Long-Poll-Timeout` header. If header is missing, long-poll mode is not used and None is returned.
+    """
+    if 'HTTP_CONCENT_LONG_POLL_TIMEOUT' not in request.META:
+        return None
+
+    long_poll_timeout = request.META['HTTP_CONCENT_LONG_POLL_TIMEOUT']
+    if not long_poll_timeout.isdigit() or not 0 < int(long_poll_timeout) <= RECEIVE_LONG_POLL_MAXIMUM_TIMEOUT:
+        raise Http400(
+            f'Concent-Long-Poll-Timeout header must be an integer between 1 and {RECEIVE_LONG_POLL_MAXIMUM_TIMEOUT}.',
+            error_code=ErrorCode.HEADER_LONG_POLL_TIMEOUT_INVALID,
+        )
+    return int(long_poll_timeout)
+
+
 def generate_uuid(seed: Optional[int] = None) -> str:
     if seed is None:
         seed = get_current_utc_timestamp()
@@ -188,13 +224,15 @@ class BlocksHelper:
     def __init__(self, sci: SmartContractsInterface) -> None:
         self._sci = sci
 
-    def get_latest_existing_block_at(self, timestamp: int) -> Block:
+    def get_latest_existing_block_at(self, timestamp: int, lowest_block_number: int = -1) -> Block:
         """
         Returns block with smallest number for which
         `block.timestamp > timestamp` is satisfied or if
         such block doesn't exist returns latest block.
+        Search can be limited to blocks after `lowest_block_number`
+        if that block is known to have `block.timestamp <= timestamp`.
         """
-        lowest = -1
+        lowest = lowest_block_number
         highest = self._sci.get_latest_confirmed_block_number()
         while lowest + 1 < highest:
             medium = (lowest + highest) // 2
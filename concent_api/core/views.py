@@ -1,4 +1,7 @@
+from functools import partial
 from logging import getLogger
+from typing import List
+from typing import Optional
 from typing import Union
 
 from django.conf import settings
@@ -20,8 +23,14 @@ from core.decorators import require_golem_message
 from core.decorators import validate_protocol_version_in_core
 from core.message_handlers import handle_message
 from core.message_handlers import handle_messages_from_database
+from core.message_handlers import handle_messages_from_database_in_batch
+from core.notifications import listen_for_pending_responses
+from core.notifications import wait_for_pending_response_notification
+from core.receive_cache import call_unless_nothing_pending
 from core.subtask_helpers import pre_process_message_related_subtasks
 from core.subtask_helpers import update_all_timed_out_subtasks_of_a_client
+from core.utils import get_long_poll_timeout
+from core.utils import get_receive_batch_size
 
 logger = getLogger(__name__)
 
@@ -54,12 +63,50 @@ def send(_request: HttpRequest, client_message: Message, client_public_key: byte
 @require_golem_auth_message
 @handle_errors_and_responses(database_name='control')
 @transaction.non_atomic_requests(using='control')
-def receive(_request: HttpRequest, _message: Message, _client_public_key: bytes) -> Union[Message, HttpResponse]:
+def receive(request: HttpRequest, _message: Message, _client_public_key: bytes) -> Union[Message, HttpResponse]:
     assert isinstance(_message.client_public_key, bytes)
+    long_poll_timeout = get_long_poll_timeout(request)
+    if long_poll_timeout is None:
+        return call_unless_nothing_pending(
+            _message.client_public_key,
+            partial(_update_subtasks_and_handle_messages_from_database, _message.client_public_key),
+        )
+
+    # Client starts listening before checking the database, so that no notification is lost in between.
+    with listen_for_pending_responses(_message.client_public_key):
+        response_to_client = call_unless_nothing_pending(
+            _message.client_public_key,
+            partial(_update_subtasks_and_handle_messages_from_database, _message.client_public_key),
+        )
+        if response_to_client is None and wait_for_pending_response_notification(long_poll_timeout):
+            response_to_client = handle_messages_from_database(client_public_key=_message.client_public_key)
+    return response_to_client
+
+
+def _update_subtasks_and_handle_messages_from_database(client_public_key: bytes) -> Optional[Message]:
     update_all_timed_out_subtasks_of_a_client(
+        client_public_key=client_public_key,
+    )
+    return handle_messages_from_database(client_public_key=client_public_key)
+
+
+@provides_concent_feature('concent-api')
+@csrf_exempt
+@require_POST
+@validate_protocol_version_in_core
+@require_golem_auth_message
+@handle_errors_and_responses(database_name='control')
+@transaction.non_atomic_requests(using='control')
+def receive_batch(request: HttpRequest, _message: Message, _client_public_key: bytes) -> Union[List[Message], HttpResponse]:
+    assert isinstance(_message.client_public_key, bytes)
+    batch_size = get_receive_batch_size(request)
+    update_all_timed_out_subtasks_of_a_client(
+        client_public_key=_message.client_public_key,
+    )
+    return handle_messages_from_database_in_batch(
         client_public_key=_message.client_public_key,
+        batch_size=batch_size,
     )
-    return handle_messages_from_database(client_public_key=_message.client_public_key)
 
 
 @require_GET
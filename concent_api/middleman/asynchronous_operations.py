@@ -1,3 +1,4 @@
+from asyncio import Event
 from asyncio import IncompleteReadError
 from asyncio import Queue
 from asyncio import sleep
@@ -7,6 +8,9 @@ from collections import OrderedDict
 from logging import getLogger
 from logging import Logger
 from random import choices
+from typing import Dict
+from typing import List
+from typing import Tuple
 
 from django.conf import settings
 
@@ -19,10 +23,14 @@ from middleman.constants import AUTHENTICATION_CHALLENGE_SIZE
 from middleman.constants import CONNECTION_COUNTER_LIMIT
 from middleman.constants import HEARTBEAT_INTERVAL
 from middleman.constants import HEARTBEAT_REQUEST_ID
+from middleman.constants import MESSAGE_TRACKER_SWEEP_INTERVAL
 from middleman.constants import MessageTrackerItem
 from middleman.constants import RequestQueueItem
 from middleman.constants import ResponseQueueItem
+from middleman.constants import SigningServiceConnection
+from middleman.utils import MessageTracker
 from middleman.utils import QueuePool
+from middleman_protocol.constants import ErrorCode
 from middleman_protocol.constants import PayloadType
 from middleman_protocol.constants import REQUEST_ID_FOR_RESPONSE_FOR_INVALID_FRAME
 from middleman_protocol.exceptions import BrokenEscapingInFrameMiddlemanProtocolError
@@ -30,10 +38,10 @@ from middleman_protocol.exceptions import FrameInvalidMiddlemanProtocolError
 from middleman_protocol.exceptions import MiddlemanProtocolError
 from middleman_protocol.exceptions import PayloadTypeInvalidMiddlemanProtocolError
 from middleman_protocol.exceptions import SignatureInvalidMiddlemanProtocolError
+from middleman_protocol.message import AbstractFrame
 from middleman_protocol.message import AuthenticationChallengeFrame
 from middleman_protocol.message import AuthenticationResponseFrame
 from middleman_protocol.message import ErrorFrame
-from middleman_protocol.message import GolemMessageFrame
 from middleman_protocol.message import HeartbeatFrame
 from middleman_protocol.registry import create_middleman_protocol_message
 from middleman_protocol.stream_async import handle_frame_receive_async
@@ -83,6 +91,35 @@ async def request_producer(
         await request_queue.put(item)
 
 
+async def request_dispatcher(
+    request_queue: Queue,
+    signing_service_connections: Dict[int, SigningServiceConnection],
+    signing_service_connected: Event,
+) -> None:
+    """
+    Passes requests from Concent to the Signing Service connection with the lowest number of outstanding requests,
+    i.e. requests waiting to be sent to it and requests waiting for its response.
+    """
+    while True:
+        item: RequestQueueItem = await request_queue.get()
+        assert isinstance(item, RequestQueueItem)
+        while len(signing_service_connections) == 0:
+            await signing_service_connected.wait()
+
+        (signing_service_connection_id, signing_service_connection) = min(
+            signing_service_connections.items(),
+            key=lambda id_and_connection: (
+                id_and_connection[1].request_queue.qsize() + len(id_and_connection[1].message_tracker)
+            ),
+        )
+        logger.debug(
+            f"Passing request to Signing Service connection with ID: {signing_service_connection_id}"
+            f" (Concent request ID: {item.concent_request_id}, connection ID: {item.connection_id})"
+        )
+        signing_service_connection.request_queue.put_nowait(item)
+        request_queue.task_done()
+
+
 async def request_consumer(
     request_queue: Queue,
     response_queue_pool: QueuePool,
@@ -144,7 +181,13 @@ async def response_producer(
             f"Received response from Signing Service: request ID = {frame.request_id}"
             f" (Concent request ID: {current_track.concent_request_id}, connection ID: {current_track.connection_id}"
         )
-        discard_entries_for_lost_messages(frame.request_id, message_tracker, logger)
+        for (_lost_request_id, lost_item) in discard_entries_for_lost_messages(frame.request_id, message_tracker, logger):
+            respond_with_error_frame(
+                response_queue_pool,
+                lost_item,
+                ErrorCode.MessageLost,
+                'Signing Service has responded to a later request, so this one will not be responded to.',
+            )
         await response_queue_pool[current_track.connection_id].put(
             ResponseQueueItem(
                 message=frame.payload,
@@ -164,11 +207,15 @@ async def response_consumer(
     while True:
         item = await response_queue.get()
         assert isinstance(item, ResponseQueueItem)
-        frame: GolemMessageFrame = create_middleman_protocol_message(
-            PayloadType.GOLEM_MESSAGE,
-            item.message,
-            item.concent_request_id,
-        )
+        frame: AbstractFrame
+        if isinstance(item.message, ErrorFrame):
+            frame = item.message
+        else:
+            frame = create_middleman_protocol_message(
+                PayloadType.GOLEM_MESSAGE,
+                item.message,
+                item.concent_request_id,
+            )
 
         await send_over_stream_async(frame, writer, settings.CONCENT_PRIVATE_KEY)
         logger.info(
@@ -220,7 +267,11 @@ def discard_entries_for_lost_messages(
     current_request_id: int,
     message_tracker: OrderedDict,
     logger_: Logger
-) -> None:
+) -> List[Tuple[int, MessageTrackerItem]]:
+    """
+    Signing Service responds to requests in the order it receives them, so requests sent before the one
+    it has just responded to will not be responded to. Removes them from message tracker and returns them.
+    """
     lost_messages_counter = 0
     for signinig_service_request_id in message_tracker.keys():
         if signinig_service_request_id == current_request_id:
@@ -229,8 +280,9 @@ def discard_entries_for_lost_messages(
 
     if lost_messages_counter == len(message_tracker):
         logger_.warning(f"Signing Service request ID has not been found - this should not happen")
-        return
+        return []
 
+    lost_entries = []
     for _ in range(lost_messages_counter):
         request_id, item = message_tracker.popitem(last=False)
         logger_.info(
@@ -239,6 +291,46 @@ def discard_entries_for_lost_messages(
             f"messsage = {item.message}, "
             f"received at: {item.timestamp}"
         )
+        lost_entries.append((request_id, item))
+    return lost_entries
+
+
+async def message_tracker_sweeper(response_queue_pool: QueuePool, message_tracker: MessageTracker) -> None:
+    """
+    Periodically removes requests which Signing Service has not responded to in time from message tracker
+    and responds to Concent with an ErrorFrame, so that it does not wait for the response until its own timeout.
+    """
+    while True:
+        await sleep(MESSAGE_TRACKER_SWEEP_INTERVAL)
+        for (signing_service_request_id, item) in message_tracker.pop_expired():
+            logger.info(
+                f"Signing Service has not responded in {message_tracker.timeout} seconds: request ID = {signing_service_request_id}"
+                f" (Concent request ID: {item.concent_request_id}, connection ID: {item.connection_id})"
+            )
+            respond_with_error_frame(
+                response_queue_pool,
+                item,
+                ErrorCode.ConnectionTimeout,
+                f'Signing Service has not responded in {message_tracker.timeout} seconds.',
+            )
+
+
+def respond_with_error_frame(
+    response_queue_pool: QueuePool,
+    item: MessageTrackerItem,
+    error_code: ErrorCode,
+    error_message: str,
+) -> None:
+    if item.connection_id not in response_queue_pool:
+        logger.info(f"Response queue for {item.connection_id} doesn't exist anymore, skipping...")
+        return
+    response_queue_pool[item.connection_id].put_nowait(
+        ResponseQueueItem(
+            message=ErrorFrame((error_code, error_message), item.concent_request_id),
+            concent_request_id=item.concent_request_id,
+            timestamp=get_current_utc_timestamp(),
+        )
+    )
 
 
 def create_error_frame(exception: MiddlemanProtocolError) -> ErrorFrame:
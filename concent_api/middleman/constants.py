@@ -14,6 +14,17 @@ HEARTBEAT_REQUEST_ID = 777
 # Interval in seconds, after which MiddleMan should send HeartbeatFrame
 HEARTBEAT_INTERVAL = 15
 
+# Time in seconds after which MiddleMan stops waiting for Signing Service's response to a request and responds to Concent
+# with an ErrorFrame instead. Must be lower than the time Concent waits for the response itself.
+MESSAGE_TRACKER_ENTRY_TIMEOUT = 20
+
+# Interval in seconds, after which MiddleMan checks again whether any request sent to Signing Service has expired
+MESSAGE_TRACKER_SWEEP_INTERVAL = 1
+
+# Maximum number of authenticated Signing Service connections MiddleMan spreads signing requests among.
+# More than one allows restarting Signing Service instances one by one without interrupting the service.
+MAXIMUM_NUMBER_OF_SIGNING_SERVICE_CONNECTIONS = 4
+
 RequestQueueItem = namedtuple(
     "RequestQueueItem",
     (
@@ -42,3 +53,11 @@ MessageTrackerItem = namedtuple(
         "timestamp",
     )
 )
+
+SigningServiceConnection = namedtuple(
+    "SigningServiceConnection",
+    (
+        "request_queue",
+        "message_tracker",
+    )
+)
@@ -1,9 +1,9 @@
 import asyncio
 from asyncio.base_events import BaseEventLoop
 import traceback
-from collections import OrderedDict
 from contextlib import suppress
 from logging import getLogger
+from typing import Dict
 from typing import Iterable
 from typing import List
 from typing import Optional
@@ -15,13 +15,20 @@ from middleman.constants import DEFAULT_EXTERNAL_PORT
 from middleman.constants import DEFAULT_INTERNAL_PORT
 from middleman.constants import ERROR_ADDRESS_ALREADY_IN_USE
 from middleman.constants import LOCALHOST_IP
+from middleman.constants import MAXIMUM_NUMBER_OF_SIGNING_SERVICE_CONNECTIONS
+from middleman.constants import MESSAGE_TRACKER_ENTRY_TIMEOUT
 from middleman.constants import PROCESSING_TIMEOUT
+from middleman.constants import RequestQueueItem
+from middleman.constants import SigningServiceConnection
 from middleman.asynchronous_operations import is_authenticated
 from middleman.asynchronous_operations import heartbeat_producer
+from middleman.asynchronous_operations import message_tracker_sweeper
 from middleman.asynchronous_operations import request_consumer
+from middleman.asynchronous_operations import request_dispatcher
 from middleman.asynchronous_operations import request_producer
 from middleman.asynchronous_operations import response_consumer
 from middleman.asynchronous_operations import response_producer
+from middleman.utils import MessageTracker
 from middleman.utils import QueuePool
 from middleman_protocol.constants import MAXIMUM_FRAME_LENGTH
 
@@ -42,12 +49,14 @@ class MiddleMan:
         self._external_port = external_port if external_port is not None else DEFAULT_EXTERNAL_PORT
         self._server_for_concent: Optional[BaseEventLoop] = None
         self._server_for_signing_service = None
-        self._is_signing_service_connection_active = False
         self._loop = loop if loop is not None else asyncio.get_event_loop()
         self._connection_id = 0
         self._request_queue: asyncio.Queue = asyncio.Queue(loop=self._loop)
+        self._request_dispatcher_task: Optional[asyncio.Task] = None
         self._response_queue_pool = QueuePool(loop=self._loop)
-        self._message_tracker: OrderedDict = OrderedDict()
+        self._signing_service_connection_id = 0
+        self._signing_service_connections: Dict[int, SigningServiceConnection] = {}
+        self._signing_service_connected = asyncio.Event(loop=self._loop)
         self._ss_connection_candidates: List[Tuple[asyncio.Task, asyncio.StreamWriter]] = []
 
         # Handle shutdown signal.
@@ -179,21 +188,29 @@ class MiddleMan:
                 logger.info(f"Removing response queue for connection ID: {connection_id}.")
 
     async def _handle_service_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
-        if self._is_signing_service_connection_active:
+        if len(self._signing_service_connections) >= MAXIMUM_NUMBER_OF_SIGNING_SERVICE_CONNECTIONS:
             writer.close()
         else:
             tasks: list = []
+            signing_service_connection_id = None
             try:
                 successful = await self._authenticate_signing_service(reader, writer)
                 if not successful:
                     writer.close()
                     return
+                if len(self._signing_service_connections) >= MAXIMUM_NUMBER_OF_SIGNING_SERVICE_CONNECTIONS:
+                    logger.info("Maximum number of Signing Service connections has been reached, closing connection.")
+                    writer.close()
+                    return
+
+                signing_service_connection_id = self._add_signing_service_connection()
+                signing_service_connection = self._signing_service_connections[signing_service_connection_id]
 
                 request_consumer_task = self._loop.create_task(
                     request_consumer(
-                        self._request_queue,
+                        signing_service_connection.request_queue,
                         self._response_queue_pool,
-                        self._message_tracker,
+                        signing_service_connection.message_tracker,
                         writer
                     )
                 )
@@ -203,7 +220,7 @@ class MiddleMan:
                     response_producer(
                         self._response_queue_pool,
                         reader,
-                        self._message_tracker
+                        signing_service_connection.message_tracker
                     )
                 )
                 tasks.append(response_producer_task)
@@ -215,6 +232,14 @@ class MiddleMan:
                 )
                 tasks.append(heartbeat_producer_task)
 
+                message_tracker_sweeper_task = self._loop.create_task(
+                    message_tracker_sweeper(
+                        self._response_queue_pool,
+                        signing_service_connection.message_tracker,
+                    )
+                )
+                tasks.append(message_tracker_sweeper_task)
+
                 done_tasks, pending_tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
                 for future in pending_tasks:
                     future.cancel()
@@ -237,7 +262,62 @@ class MiddleMan:
                 logger.debug(f"Canceling tasks upon exit of Signing Service connection handler. Number of tasks to cancel: {len(tasks)}.")
                 # cancel all tasks - if task is already done/cancelled it makes no harm
                 self._cancel_pending_tasks(tasks)
-                self._is_signing_service_connection_active = False
+                if signing_service_connection_id is not None:
+                    self._remove_signing_service_connection(signing_service_connection_id)
+
+    def _add_signing_service_connection(self) -> int:
+        signing_service_connection_id = self._signing_service_connection_id = (
+            (self._signing_service_connection_id + 1) % CONNECTION_COUNTER_LIMIT
+        )
+        self._signing_service_connections[signing_service_connection_id] = SigningServiceConnection(
+            request_queue=asyncio.Queue(loop=self._loop),
+            message_tracker=MessageTracker(timeout=MESSAGE_TRACKER_ENTRY_TIMEOUT),
+        )
+        self._signing_service_connected.set()
+        if self._request_dispatcher_task is None or self._request_dispatcher_task.done():
+            self._request_dispatcher_task = self._loop.create_task(
+                request_dispatcher(
+                    self._request_queue,
+                    self._signing_service_connections,
+                    self._signing_service_connected,
+                )
+            )
+        logger.info(
+            f"Signing Service connection with ID: {signing_service_connection_id} has been added. "
+            f"Number of Signing Service connections: {len(self._signing_service_connections)}."
+        )
+        return signing_service_connection_id
+
+    def _remove_signing_service_connection(self, signing_service_connection_id: int) -> None:
+        """
+        Removes Signing Service connection from the pool and puts requests sent over it, for which no response
+        has been received, back to the request queue, followed by requests which have not been sent yet.
+        They will be passed to other Signing Service connections, if there are any, or to the next one.
+        """
+        signing_service_connection = self._signing_service_connections.pop(signing_service_connection_id)
+        if len(self._signing_service_connections) == 0:
+            self._signing_service_connected.clear()
+
+        requests_to_requeue = [
+            RequestQueueItem(
+                connection_id=item.connection_id,
+                concent_request_id=item.concent_request_id,
+                message=item.message,
+                timestamp=item.timestamp,
+            )
+            for item in signing_service_connection.message_tracker.values()
+        ]
+        signing_service_connection.message_tracker.clear()
+        while not signing_service_connection.request_queue.empty():
+            requests_to_requeue.append(signing_service_connection.request_queue.get_nowait())
+            signing_service_connection.request_queue.task_done()
+
+        for item in requests_to_requeue:
+            self._request_queue.put_nowait(item)
+        logger.info(
+            f"Signing Service connection with ID: {signing_service_connection_id} has been removed. "
+            f"Number of requests put back to the request queue: {len(requests_to_requeue)}."
+        )
 
     def _terminate_connections(self) -> None:
         logger.info('SIGTERM received - closing connections and exiting.')
@@ -256,17 +336,23 @@ class MiddleMan:
     async def _authenticate_signing_service(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> bool:
         logger.info("Signing Service candidate has connected, authenticating...")
         authentication_task = self._loop.create_task(is_authenticated(reader, writer))
-        index = len(self._ss_connection_candidates)
-        self._ss_connection_candidates.append((authentication_task, writer))
+        candidate = (authentication_task, writer)
+        self._ss_connection_candidates.append(candidate)
 
-        await authentication_task
-        self._ss_connection_candidates.pop(index)
+        try:
+            await authentication_task
+        finally:
+            # Several candidates can be authenticated at the same time and finish in any order. All of them are removed
+            # at once if authentication is aborted.
+            if candidate in self._ss_connection_candidates:
+                self._ss_connection_candidates.remove(candidate)
 
         is_signing_service_authenticated = authentication_task.result()
         if is_signing_service_authenticated:
             logger.info("Authentication successful: Signing Service has connected.")
-            self._is_signing_service_connection_active = True
-            self._abort_ongoing_authentication()
+            # This connection is not in the pool yet, so the pool becomes full once it is added.
+            if len(self._signing_service_connections) + 1 >= MAXIMUM_NUMBER_OF_SIGNING_SERVICE_CONNECTIONS:
+                self._abort_ongoing_authentication()
         else:
             logger.info("Authentication unsuccessful, closing connection with candidate.")
         return is_signing_service_authenticated
@@ -1,4 +1,5 @@
 from asyncio import CancelledError
+from asyncio import Event
 from asyncio import IncompleteReadError
 from asyncio import Queue
 from asyncio import sleep
@@ -29,14 +30,18 @@ from middleman.constants import HEARTBEAT_REQUEST_ID
 from middleman.constants import MessageTrackerItem
 from middleman.constants import RequestQueueItem
 from middleman.constants import ResponseQueueItem
+from middleman.constants import SigningServiceConnection
 from middleman.asynchronous_operations import create_error_frame
 from middleman.asynchronous_operations import discard_entries_for_lost_messages
 from middleman.asynchronous_operations import heartbeat_producer
+from middleman.asynchronous_operations import message_tracker_sweeper
 from middleman.asynchronous_operations import is_authenticated
 from middleman.asynchronous_operations import request_consumer
+from middleman.asynchronous_operations import request_dispatcher
 from middleman.asynchronous_operations import request_producer
 from middleman.asynchronous_operations import response_consumer
 from middleman.asynchronous_operations import response_producer
+from middleman.utils import MessageTracker
 from middleman.utils import QueuePool
 from middleman_protocol.constants import ErrorCode
 from middleman_protocol.constants import MIDDLEMAN_EXCEPTION_TO_ERROR_CODE_MAP
@@ -242,6 +247,71 @@ class TestRequestConsumer:
                 self.mocked_writer.drain.mock.assert_called_once_with()
 
 
+class TestRequestDispatcher:
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, event_loop):
+        self.request_queue = Queue(loop=event_loop)
+        self.signing_service_connected = Event(loop=event_loop)
+        self.signing_service_connections = {}
+        self.request_queue_item = RequestQueueItem(4, 888, Ping(), FROZEN_TIMESTAMP)
+
+    def _add_signing_service_connection(
+        self,
+        signing_service_connection_id,
+        number_of_requests_sent,
+        number_of_requests_queued,
+        event_loop,
+    ):
+        signing_service_connection = SigningServiceConnection(Queue(loop=event_loop), OrderedDict())
+        for signing_service_request_id in range(number_of_requests_sent):
+            signing_service_connection.message_tracker[signing_service_request_id] = MessageTrackerItem(
+                signing_service_request_id,
+                4,
+                Ping(),
+                FROZEN_TIMESTAMP,
+            )
+        for _ in range(number_of_requests_queued):
+            signing_service_connection.request_queue.put_nowait(self.request_queue_item)
+        self.signing_service_connections[signing_service_connection_id] = signing_service_connection
+        self.signing_service_connected.set()
+        return signing_service_connection
+
+    @pytest.mark.asyncio
+    async def test_that_request_is_passed_to_signing_service_connection_with_least_outstanding_requests(self, event_loop):
+        first_connection = self._add_signing_service_connection(1, 2, 0, event_loop)
+        second_connection = self._add_signing_service_connection(2, 0, 1, event_loop)
+        third_connection = self._add_signing_service_connection(3, 1, 1, event_loop)
+
+        await self.request_queue.put(self.request_queue_item)
+        dispatcher_task = event_loop.create_task(
+            request_dispatcher(self.request_queue, self.signing_service_connections, self.signing_service_connected)
+        )
+        await self.request_queue.join()
+        dispatcher_task.cancel()
+
+        assert_that(first_connection.request_queue.qsize()).is_equal_to(0)
+        assert_that(second_connection.request_queue.qsize()).is_equal_to(2)
+        assert_that(third_connection.request_queue.qsize()).is_equal_to(1)
+
+    @pytest.mark.asyncio
+    async def test_that_request_waits_until_signing_service_connects(self, event_loop):
+        await self.request_queue.put(self.request_queue_item)
+        dispatcher_task = event_loop.create_task(
+            request_dispatcher(self.request_queue, self.signing_service_connections, self.signing_service_connected)
+        )
+        await sleep(0.01)
+
+        assert_that(self.request_queue.qsize()).is_equal_to(0)
+        assert_that(dispatcher_task.done()).is_false()
+
+        signing_service_connection = self._add_signing_service_connection(1, 0, 0, event_loop)
+        await self.request_queue.join()
+        dispatcher_task.cancel()
+
+        assert_that(signing_service_connection.request_queue.get_nowait()).is_equal_to(self.request_queue_item)
+
+
 class TestDiscardEntriesForLostMessages:
 
     @pytest.fixture(autouse=True)
@@ -267,8 +337,10 @@ class TestDiscardEntriesForLostMessages:
     def test_that_if_request_id_matches_third_entry_two_messages_are_discarded(self):
         index_of_second_entry = 2
         third_entry_id = self.all_initial_keys[index_of_second_entry]
-        discard_entries_for_lost_messages(third_entry_id, self.message_tracker, self.mocked_logger)
+        expected_lost_entries = list(self.message_tracker.items())[:index_of_second_entry]
+        lost_entries = discard_entries_for_lost_messages(third_entry_id, self.message_tracker, self.mocked_logger)
 
+        assert_that(lost_entries).is_equal_to(expected_lost_entries)
         assert_that(self.mocked_logger.info.call_count).is_equal_to(2)
         assert_that(self.message_tracker.keys()).contains_only(*self.all_initial_keys[index_of_second_entry:])
 
@@ -284,8 +356,9 @@ class TestDiscardEntriesForLostMessages:
 
     def test_that_if_request_id_matches_no_entry_no_messages_are_discarded_and_warning_is_logged(self):
         non_existing_request_id = 777
-        discard_entries_for_lost_messages(non_existing_request_id, self.message_tracker, self.mocked_logger)
+        lost_entries = discard_entries_for_lost_messages(non_existing_request_id, self.message_tracker, self.mocked_logger)
 
+        assert_that(lost_entries).is_empty()
         assert_that(self.mocked_logger.info.call_count).is_equal_to(0)
         assert_that(self.mocked_logger.warning.call_count).is_equal_to(1)
         assert_that(self.message_tracker).contains_only(*self.all_initial_keys)
@@ -457,6 +530,13 @@ class TestResponseProducer:
                 assert_that(item.message).is_equal_to(self.golem_message_from_ss)
                 assert_that(item.timestamp).is_equal_to(FROZEN_TIMESTAMP)
 
+                lost_message_item = self.response_queue_pool[self.connection_id_1].get_nowait()
+                assert_that(lost_message_item.concent_request_id).is_equal_to(self.concent_request_id)
+                assert_that(lost_message_item.message).is_instance_of(ErrorFrame)
+                assert_that(lost_message_item.message.payload[0]).is_equal_to(ErrorCode.MessageLost)
+                assert_that(lost_message_item.message.request_id).is_equal_to(self.concent_request_id)
+                assert_that(self.response_queue_pool[self.connection_id_4].empty()).is_true()
+
     @pytest.mark.asyncio
     async def test_that_if_signing_service_closes_connection_coroutine_ends(self, event_loop):
         with patch("middleman.asynchronous_operations.logger") as mocked_logger:
@@ -515,6 +595,82 @@ class TestResponseConsumer:
             mocked_writer.write.assert_called_once_with(expected_data)
             mocked_writer.drain.mock.assert_called_once_with()
 
+    @pytest.mark.asyncio
+    async def test_that_error_frame_received_via_response_queue_is_sent_to_concent_as_it_is(self, event_loop):
+        with override_settings(
+            CONCENT_PRIVATE_KEY=CONCENT_PRIVATE_KEY,
+            CONCENT_PUBLIC_KEY=CONCENT_PUBLIC_KEY,
+            SIGNING_SERVICE_PUBLIC_KEY=SIGNING_SERVICE_PUBLIC_KEY
+        ):
+            connection_id = 11
+            concent_request_id = 77
+            response_queue = Queue(loop=event_loop)
+            error_frame = ErrorFrame((ErrorCode.ConnectionTimeout, 'Signing Service has not responded.'), concent_request_id)
+            expected_data = append_frame_separator(
+                escape_encode_raw_message(
+                    error_frame.serialize(settings.CONCENT_PRIVATE_KEY)
+                )
+            )
+            mocked_writer = prepare_mocked_writer()
+
+            await response_queue.put(ResponseQueueItem(error_frame, concent_request_id, FROZEN_TIMESTAMP))
+            consumer_task = event_loop.create_task(
+                response_consumer(
+                    response_queue,
+                    mocked_writer,
+                    connection_id
+                )
+            )
+            await response_queue.join()
+            consumer_task.cancel()
+
+            mocked_writer.write.assert_called_once_with(expected_data)
+
+
+class TestMessageTrackerSweeper:
+
+    @pytest.fixture(autouse=True)
+    def setUp(self, event_loop):
+        self.connection_id = 7
+        self.removed_connection_id = 8
+        self.concent_request_id = 777
+        self.response_queue_pool = QueuePool({self.connection_id: Queue(loop=event_loop)})
+
+    @pytest.mark.asyncio
+    async def test_that_expired_entries_are_removed_and_responded_to_with_error_frame(self, event_loop):
+        message_tracker = MessageTracker(timeout=0)
+        message_tracker[17] = MessageTrackerItem(self.concent_request_id, self.connection_id, Ping(), FROZEN_TIMESTAMP)
+        message_tracker[19] = MessageTrackerItem(self.concent_request_id, self.removed_connection_id, Ping(), FROZEN_TIMESTAMP)
+
+        with patch("middleman.asynchronous_operations.MESSAGE_TRACKER_SWEEP_INTERVAL", 0.0001):
+            sweeper_task = event_loop.create_task(
+                message_tracker_sweeper(self.response_queue_pool, message_tracker)
+            )
+            item = await get_item(self.response_queue_pool[self.connection_id])
+            sweeper_task.cancel()
+
+        assert_that(message_tracker).is_empty()
+        assert_that(item.concent_request_id).is_equal_to(self.concent_request_id)
+        assert_that(item.message).is_instance_of(ErrorFrame)
+        assert_that(item.message.payload[0]).is_equal_to(ErrorCode.ConnectionTimeout)
+        assert_that(item.message.request_id).is_equal_to(self.concent_request_id)
+        assert_that(self.response_queue_pool[self.connection_id].empty()).is_true()
+
+    @pytest.mark.asyncio
+    async def test_that_entries_which_have_not_expired_are_left_in_message_tracker(self, event_loop):
+        message_tracker = MessageTracker(timeout=60)
+        message_tracker[17] = MessageTrackerItem(self.concent_request_id, self.connection_id, Ping(), FROZEN_TIMESTAMP)
+
+        with patch("middleman.asynchronous_operations.MESSAGE_TRACKER_SWEEP_INTERVAL", 0.0001):
+            sweeper_task = event_loop.create_task(
+                message_tracker_sweeper(self.response_queue_pool, message_tracker)
+            )
+            await sleep(0.01)
+            sweeper_task.cancel()
+
+        assert_that(message_tracker.keys()).contains_only(17)
+        assert_that(self.response_queue_pool[self.connection_id].empty()).is_true()
+
 
 class TestIsAuthenticated:
     @pytest.fixture(autouse=True)
@@ -23,6 +23,9 @@ from middleman.constants import DEFAULT_EXTERNAL_PORT
 from middleman.constants import DEFAULT_INTERNAL_PORT
 from middleman.constants import ERROR_ADDRESS_ALREADY_IN_USE
 from middleman.constants import LOCALHOST_IP
+from middleman.constants import MAXIMUM_NUMBER_OF_SIGNING_SERVICE_CONNECTIONS
+from middleman.constants import MessageTrackerItem
+from middleman.constants import RequestQueueItem
 from middleman.middleman_server import MiddleMan
 
 (CONCENT_PRIVATE_KEY, CONCENT_PUBLIC_KEY) = generate_ecc_key_pair()
@@ -190,8 +193,9 @@ class TestMiddleManServer:
             fake_client.close()
             self.crash_logger_mock.error.assert_not_called()
 
-    def test_that_when_signing_service_connection_is_active_subsequent_attempts_will_fail(self, event_loop):
-        self.middleman._is_signing_service_connection_active = True
+    def test_that_when_maximum_number_of_signing_service_connections_is_active_subsequent_attempts_will_fail(self, event_loop):
+        for _ in range(MAXIMUM_NUMBER_OF_SIGNING_SERVICE_CONNECTIONS):
+            self.middleman._add_signing_service_connection()
         mocked_reader = prepare_mocked_reader(b"some bytes")
         mocked_writer = prepare_mocked_writer()
 
@@ -202,7 +206,6 @@ class TestMiddleManServer:
         mocked_writer.close.assert_called_once_with()
 
     def test_that_when_authentication_is_unsuccessful_then_connection_ends(self, event_loop):
-        self.middleman._is_signing_service_connection_active = False
         mocked_reader = prepare_mocked_reader(b"some bytes")
         mocked_writer = prepare_mocked_writer()
 
@@ -223,7 +226,6 @@ class TestMiddleManServer:
             CONCENT_PUBLIC_KEY=CONCENT_PUBLIC_KEY,
             SIGNING_SERVICE_PUBLIC_KEY=SIGNING_SERVICE_PUBLIC_KEY,
         ):
-            self.middleman._is_signing_service_connection_active = False
             some_bytes = b"some bytes"
             mocked_reader = prepare_mocked_reader(
                 some_bytes,
@@ -241,8 +243,10 @@ class TestMiddleManServer:
                 )
 
                 self.crash_logger_mock.assert_not_called()
+                assert_that(self.middleman._signing_service_connections).is_empty()
 
-    def test_that_when_one_authentication_task_is_successful_remaining_ones_are_cancelled(self, event_loop):
+    @mock.patch("middleman.middleman_server.MAXIMUM_NUMBER_OF_SIGNING_SERVICE_CONNECTIONS", 1)
+    def test_that_when_authentication_task_fills_connection_pool_remaining_ones_are_cancelled(self, event_loop):
         with override_settings(
             CONCENT_PRIVATE_KEY=CONCENT_PRIVATE_KEY,
             CONCENT_PUBLIC_KEY=CONCENT_PUBLIC_KEY,
@@ -270,4 +274,54 @@ class TestMiddleManServer:
                 assert_that(mock_authentication_task.cancelled()).is_true()
                 mocked_writer2.close.assert_called_once_with()
                 assert_that(self.middleman._ss_connection_candidates).is_empty()
-                assert_that(self.middleman._is_signing_service_connection_active).is_true()
+
+    def test_that_when_authentication_task_does_not_fill_connection_pool_remaining_ones_continue(self, event_loop):
+        with override_settings(
+            CONCENT_PRIVATE_KEY=CONCENT_PRIVATE_KEY,
+            CONCENT_PUBLIC_KEY=CONCENT_PUBLIC_KEY,
+            SIGNING_SERVICE_PUBLIC_KEY=SIGNING_SERVICE_PUBLIC_KEY,
+        ):
+
+            async def mock_coro():
+                await asyncio.sleep(3)
+
+            mocked_reader = prepare_mocked_reader(b"some bytes")
+            mocked_writer = prepare_mocked_writer()
+            mocked_writer2 = prepare_mocked_writer()
+            mock_authentication_task = event_loop.create_task(mock_coro())
+            with mock.patch(
+                "middleman.middleman_server.is_authenticated",
+                new=async_stream_actor_mock(return_value=True)
+            ):
+                self.middleman._ss_connection_candidates.append((mock_authentication_task, mocked_writer2))
+
+                is_authenticated = event_loop.run_until_complete(
+                    self.middleman._authenticate_signing_service(mocked_reader, mocked_writer)
+                )
+
+                assert_that(is_authenticated).is_true()
+                assert_that(mock_authentication_task.cancelled()).is_false()
+                mocked_writer2.close.assert_not_called()
+                assert_that(self.middleman._ss_connection_candidates).is_equal_to([(mock_authentication_task, mocked_writer2)])
+                mock_authentication_task.cancel()
+
+    def test_that_when_signing_service_connection_is_removed_its_outstanding_requests_are_requeued(self, event_loop):  # pylint: disable=unused-argument
+        sent_request = RequestQueueItem(1, 101, Ping(), 1000)
+        queued_request = RequestQueueItem(2, 102, Ping(), 1001)
+        signing_service_connection_id = self.middleman._add_signing_service_connection()
+        signing_service_connection = self.middleman._signing_service_connections[signing_service_connection_id]
+        signing_service_connection.message_tracker[1] = MessageTrackerItem(
+            sent_request.concent_request_id,
+            sent_request.connection_id,
+            sent_request.message,
+            sent_request.timestamp,
+        )
+        signing_service_connection.request_queue.put_nowait(queued_request)
+
+        self.middleman._remove_signing_service_connection(signing_service_connection_id)
+
+        assert_that(self.middleman._signing_service_connections).is_empty()
+        assert_that(self.middleman._signing_service_connected.is_set()).is_false()
+        assert_that(self.middleman._request_queue.get_nowait()).is_equal_to(sent_request)
+        assert_that(self.middleman._request_queue.get_nowait()).is_equal_to(queued_request)
+        assert_that(self.middleman._request_queue.empty()).is_true()
@@ -11,7 +11,9 @@ from mock import sentinel
 from golem_messages.message import Ping
 
 from common.helpers import get_current_utc_timestamp
+from middleman.constants import MessageTrackerItem
 from middleman.constants import ResponseQueueItem
+from middleman.utils import MessageTracker
 from middleman.utils import QueuePool
 from middleman.utils import validate_connection_to_queue_mapping
 
@@ -115,6 +117,48 @@ class TestQueuePoolOperations:
             await second_queue.put(item)
 
 
+class TestMessageTracker:
+    @pytest.fixture(autouse=True)
+    def setUp(self):
+        self.message_tracker = MessageTracker(timeout=20)
+        self.first_item = MessageTrackerItem(777, 1, Ping(), get_current_utc_timestamp())
+        self.second_item = MessageTrackerItem(888, 2, Ping(), get_current_utc_timestamp())
+
+    def test_that_entries_are_kept_until_their_deadline_passes(self):
+        with patch("middleman.utils.monotonic", side_effect=[100.0, 105.0, 119.0]):
+            self.message_tracker[1] = self.first_item
+            self.message_tracker[2] = self.second_item
+
+            assert_that(self.message_tracker.pop_expired()).is_empty()
+        assert_that(list(self.message_tracker.keys())).is_equal_to([1, 2])
+
+    def test_that_only_expired_entries_are_removed_and_returned(self):
+        with patch("middleman.utils.monotonic", side_effect=[100.0, 105.0, 120.0]):
+            self.message_tracker[1] = self.first_item
+            self.message_tracker[2] = self.second_item
+
+            assert_that(self.message_tracker.pop_expired()).is_equal_to([(1, self.first_item)])
+        assert_that(list(self.message_tracker.keys())).is_equal_to([2])
+
+    def test_that_entries_removed_before_their_deadline_are_not_returned(self):
+        with patch("middleman.utils.monotonic", side_effect=[100.0, 105.0, 130.0]):
+            self.message_tracker[1] = self.first_item
+            self.message_tracker[2] = self.second_item
+            self.message_tracker.popitem(last=False)
+
+            assert_that(self.message_tracker.pop_expired()).is_equal_to([(2, self.second_item)])
+        assert_that(self.message_tracker).is_empty()
+
+    def test_that_deadline_of_removed_entry_does_not_apply_to_entry_added_later_with_the_same_key(self):
+        with patch("middleman.utils.monotonic", side_effect=[100.0, 110.0, 125.0]):
+            self.message_tracker[1] = self.first_item
+            del self.message_tracker[1]
+            self.message_tracker[1] = self.second_item
+
+            assert_that(self.message_tracker.pop_expired()).is_empty()
+        assert_that(self.message_tracker[1]).is_equal_to(self.second_item)
+
+
 @pytest.mark.parametrize(
     "key, value", [
         ("this_is_not_int", asyncio.Queue()),
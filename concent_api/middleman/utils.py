@@ -1,13 +1,18 @@
+from collections import OrderedDict
 from typing import Any
 from typing import Dict
+from typing import List
 from typing import Tuple
+import heapq
 
 import asyncio
 from asyncio.base_events import BaseEventLoop
 
 from logging import getLogger
 from logging import Logger
+from time import monotonic
 
+from middleman.constants import MessageTrackerItem
 from middleman.constants import ResponseQueueItem
 from middleman.constants import STANDARD_ERROR_MESSAGE
 from middleman.constants import WRONG_TYPE_ERROR_MESSAGE
@@ -73,6 +78,46 @@ class QueuePool(dict):
             )
 
 
+class MessageTracker(OrderedDict):
+    """
+    Maps Signing Service request IDs to requests sent to Signing Service, in the order they were sent, and remembers
+    the time after which the response for each of them is not expected anymore. Deadlines are kept in a heap,
+    so that expired entries can be found without looking at the ones which have not expired.
+    """
+
+    def __init__(self, timeout: float) -> None:
+        super().__init__()
+        self.timeout = timeout
+        self._deadlines: List[Tuple[float, int]] = []
+        self._key_to_deadline: Dict[int, float] = {}
+
+    def __setitem__(self, key: int, value: MessageTrackerItem) -> None:  # type: ignore
+        super().__setitem__(key, value)
+        deadline = monotonic() + self.timeout
+        self._key_to_deadline[key] = deadline
+        heapq.heappush(self._deadlines, (deadline, key))
+
+    def clear(self) -> None:
+        super().clear()
+        self._deadlines.clear()
+        self._key_to_deadline.clear()
+
+    def pop_expired(self) -> List[Tuple[int, MessageTrackerItem]]:
+        """ Removes and returns entries whose deadline has passed. """
+        now = monotonic()
+        expired_entries = []
+        while len(self._deadlines) > 0 and self._deadlines[0][0] <= now:
+            (deadline, key) = heapq.heappop(self._deadlines)
+            # Deadlines of entries removed earlier, e.g. when the response has been received, are left in the heap
+            # until they pass. The key may have been used again since then, in which case it has a later deadline.
+            if self._key_to_deadline.get(key) != deadline:
+                continue
+            del self._key_to_deadline[key]
+            if key in self:
+                expired_entries.append((key, super().pop(key)))
+        return expired_entries
+
+
 def validate_connection_to_queue_mapping(key: int, value: asyncio.Queue) -> None:
     if not isinstance(value, asyncio.Queue):
         raise ValueError(WRONG_TYPE_ERROR_MESSAGE)
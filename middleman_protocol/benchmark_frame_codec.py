@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Measures how many frames per second AbstractFrame.serialize() and AbstractFrame.deserialize() process and compares
+them with the previous implementation, which built and parsed frames with the construct definition returned by
+AbstractFrame.get_frame_format() and rebuilt the signed part of each received frame to verify its signature.
+
+Usage: python3 benchmark_frame_codec.py [--frames N] [--payload-length N]
+"""
+import argparse
+import os
+import time
+
+from typing import Callable
+
+from construct import Container
+from construct import StreamError
+from golem_messages.cryptography import ECCx
+from golem_messages.cryptography import ecdsa_sign
+
+from middleman_protocol.constants import PayloadType
+from middleman_protocol.exceptions import FrameInvalidMiddlemanProtocolError
+from middleman_protocol.message import AbstractFrame
+from middleman_protocol.message import AuthenticationChallengeFrame
+from middleman_protocol.registry import PAYLOAD_TYPE_TO_MIDDLEMAN_MESSAGE_CLASS
+
+
+def serialize_with_construct(frame: AbstractFrame, private_key: bytes) -> bytes:
+    """ Implementation of AbstractFrame.serialize() replaced by the struct-based one, kept here as a baseline. """
+    frame_format = frame.get_frame_format()
+    signed_part_of_the_frame = Container(
+        request_id=frame.request_id,
+        payload_type=frame.payload_type,  # type: ignore  # pylint: disable=no-member
+        payload=frame._serialize_payload(frame.payload),  # pylint: disable=protected-access
+    )
+    raw_signed_part_of_the_frame = frame_format.signed_part_of_the_frame.build(signed_part_of_the_frame)
+    return frame_format.build(
+        Container(
+            frame_signature=ecdsa_sign(privkey=private_key, msghash=raw_signed_part_of_the_frame),
+            signed_part_of_the_frame=signed_part_of_the_frame,
+        )
+    )
+
+
+def deserialize_with_construct(raw_message: bytes, public_key: bytes) -> AbstractFrame:
+    """ Implementation of AbstractFrame.deserialize() replaced by the struct-based one, kept here as a baseline. """
+    frame_format = AbstractFrame.get_frame_format()
+    try:
+        frame = frame_format.parse(raw_message)
+    except StreamError as exception:
+        raise FrameInvalidMiddlemanProtocolError(str(exception))
+
+    raw_signed_part_of_the_frame = frame_format.signed_part_of_the_frame.build(frame.signed_part_of_the_frame)
+    AbstractFrame._validate_signature(raw_signed_part_of_the_frame, frame.frame_signature, public_key)  # pylint: disable=protected-access
+
+    message_class = PAYLOAD_TYPE_TO_MIDDLEMAN_MESSAGE_CLASS[PayloadType[str(frame.signed_part_of_the_frame.payload_type)]]
+    return message_class(
+        payload=message_class._deserialize_payload(frame.signed_part_of_the_frame.payload),  # pylint: disable=protected-access
+        request_id=frame.signed_part_of_the_frame.request_id,
+    )
+
+
+def measure_frames_per_second(function: Callable[[], object], number_of_frames: int) -> float:
+    start = time.perf_counter()
+    for _i in range(number_of_frames):
+        function()
+    return number_of_frames / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=2000, help='Number of frames processed by each implementation.')
+    parser.add_argument('--payload-length', type=int, default=1024, help='Length of payload of each frame in bytes.')
+    arguments = parser.parse_args()
+
+    ecc_keys = ECCx(None)
+    (private_key, public_key) = (ecc_keys.raw_privkey, ecc_keys.raw_pubkey)
+    frame = AuthenticationChallengeFrame(payload=os.urandom(arguments.payload_length), request_id=99)
+    raw_frame = frame.serialize(private_key=private_key)
+
+    for (name, function) in [
+        ('serialize with construct (before)', lambda: serialize_with_construct(frame, private_key)),
+        ('serialize (after)', lambda: frame.serialize(private_key=private_key)),
+        ('deserialize with construct (before)', lambda: deserialize_with_construct(raw_frame, public_key)),
+        ('deserialize (after)', lambda: AbstractFrame.deserialize(raw_frame, public_key)),
+    ]:
+        frames_per_second = measure_frames_per_second(function, arguments.frames)
+        print(f'{name:<37} {frames_per_second:12.0f} frames/s')
+
+
+if __name__ == '__main__':
+    main()
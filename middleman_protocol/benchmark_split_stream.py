@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Measures how fast split_stream() splits data received over a local socket into frames and compares it with the
+previous implementation, which received and inspected the stream one byte at a time.
+
+Usage: python3 benchmark_split_stream.py [--megabytes N]
+"""
+import argparse
+import os
+import socket
+import threading
+import time
+
+from typing import Callable
+from typing import Iterator
+
+from middleman_protocol.constants import FRAME_SEPARATOR
+from middleman_protocol.constants import MAXIMUM_FRAME_LENGTH
+from middleman_protocol.stream import append_frame_separator
+from middleman_protocol.stream import escape_encode_raw_message
+from middleman_protocol.stream import split_stream
+
+FRAME_LENGTH = 1024
+
+
+def split_stream_byte_by_byte(connection: socket.socket) -> Iterator[bytes]:
+    """ Implementation of split_stream() replaced by the buffer-scanning one, kept here as a baseline. """
+    received_data = []  # type: ignore
+
+    try:
+        while True:
+            next_bytes = connection.recv(1)
+            if not next_bytes:
+                raise socket.error()
+
+            for next_byte in next_bytes:
+                if bytes([next_byte]) == FRAME_SEPARATOR:
+                    data_to_yield = b''.join(received_data)
+                    received_data = []
+                    if len(data_to_yield) <= MAXIMUM_FRAME_LENGTH:
+                        yield data_to_yield
+                else:
+                    if MAXIMUM_FRAME_LENGTH < len(received_data):
+                        continue
+                    received_data.append(bytes([next_byte]))
+    finally:
+        connection.close()
+
+
+def measure_throughput(split_stream_function: Callable, raw_frames: bytes, number_of_frames: int) -> float:
+    """ Returns number of megabytes per second split into frames by given function. """
+    (sending_socket, receiving_socket) = socket.socketpair()
+    sender = threading.Thread(target=sending_socket.sendall, args=(raw_frames,), daemon=True)
+
+    start = time.perf_counter()
+    sender.start()
+    frames = split_stream_function(receiving_socket)
+    for _i in range(number_of_frames):
+        next(frames)
+    duration = time.perf_counter() - start
+
+    sender.join()
+    frames.close()
+    sending_socket.close()
+    return len(raw_frames) / duration / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--megabytes',
+        type=float,
+        default=4.0,
+        help='Amount of data to split with each implementation.',
+    )
+    arguments = parser.parse_args()
+
+    raw_frame = append_frame_separator(escape_encode_raw_message(os.urandom(FRAME_LENGTH)))
+    number_of_frames = max(int(arguments.megabytes * 2**20 / len(raw_frame)), 1)
+    raw_frames = raw_frame * number_of_frames
+
+    for (name, split_stream_function) in [
+        ('byte by byte (before)', split_stream_byte_by_byte),
+        ('buffer scanning (after)', split_stream),
+    ]:
+        throughput = measure_throughput(split_stream_function, raw_frames, number_of_frames)
+        print(f'{name:<25} {throughput:10.2f} MB/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -53,7 +53,7 @@ assert ESCAPE_CHARACTER != FRAME_SEPARATOR
 assert len(set(ESCAPE_SEQUENCES.values())) == len(ESCAPE_SEQUENCES)
 assert all([FRAME_SEPARATOR not in escape_sequence for escape_sequence in ESCAPE_SEQUENCES.values()])
 
-RECEIVE_BYTES_PER_LOOP = 1
+RECEIVE_BYTES_PER_LOOP = 2**14  # 16 KiB
 MAXIMUM_FRAME_LENGTH = 2**12  # 4096 B
 
 MIDDLEMAN_EXCEPTION_TO_ERROR_CODE_MAP = {
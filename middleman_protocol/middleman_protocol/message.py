@@ -1,5 +1,8 @@
 from abc import ABC
 from abc import abstractmethod
+from functools import lru_cache
+from typing import Tuple
+import struct
 
 from mypy.types import Any
 
@@ -12,7 +15,6 @@ from construct import GreedyBytes
 from construct import Int16ub
 from construct import PascalString
 from construct import Prefixed
-from construct import StreamError
 from construct import Struct
 from construct import VarInt
 
@@ -34,6 +36,47 @@ from .exceptions import SignatureInvalidMiddlemanProtocolError
 from .registry import PAYLOAD_TYPE_TO_MIDDLEMAN_MESSAGE_CLASS
 from .registry import register
 
+# Fixed-size part of the frame preceding the length of the payload: signature, request_id and payload type.
+# Equivalent to the beginning of the structure returned by AbstractFrame.get_frame_format(), which is kept as the
+# reference definition of the frame format.
+FRAME_HEADER_FORMAT = struct.Struct(f'>{FRAME_SIGNATURE_BYTES_LENGTH}sIB')
+
+assert FRAME_REQUEST_ID_BYTES_LENGTH == struct.calcsize('>I')
+assert FRAME_PAYLOAD_TYPE_LENGTH == struct.calcsize('>B')
+assert FRAME_HEADER_FORMAT.size == FRAME_PAYLOAD_STARTING_BYTE
+
+
+def encode_var_int(value: int) -> bytes:
+    """ Encodes non-negative integer like construct.VarInt: in 7-bit groups, least significant first. """
+    assert value >= 0
+
+    encoded_value = bytearray()
+    while value > 0x7f:
+        encoded_value.append(0x80 | (value & 0x7f))
+        value >>= 7
+    encoded_value.append(value)
+    return bytes(encoded_value)
+
+
+def decode_var_int(raw_message: bytes, offset: int) -> Tuple[int, int]:
+    """
+    Decodes integer encoded like construct.VarInt starting at given offset.
+    Returns the integer and the offset of the first byte after it.
+    """
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(raw_message):
+            raise FrameInvalidMiddlemanProtocolError(
+                'Protocol frame is malformed and could not be deserialized: payload length is incomplete.'
+            )
+        byte = raw_message[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte & 0x80 == 0:
+            return (value, offset)
+        shift += 7
+
 
 class AbstractFrame(ABC):
     """
@@ -88,8 +131,12 @@ class AbstractFrame(ABC):
         pass
 
     @classmethod
+    @lru_cache()
     def get_frame_format(cls) -> Struct:
-        """ Returns Struct object containing frame structure. """
+        """
+        Returns Struct object containing frame structure. Frames are serialized and deserialized without it,
+        but both must stay equivalent to this definition.
+        """
         frame_format = Struct(
             frame_signature=Bytes(FRAME_SIGNATURE_BYTES_LENGTH),
             signed_part_of_the_frame=Struct(
@@ -117,34 +164,34 @@ class AbstractFrame(ABC):
         assert isinstance(public_key, bytes)
 
         # Parse frame
-        frame_format = cls.get_frame_format()
         try:
-            frame = frame_format.parse(raw_message)
-        except StreamError as exception:
+            (frame_signature, request_id, payload_type) = FRAME_HEADER_FORMAT.unpack_from(raw_message)
+        except struct.error as exception:
             raise FrameInvalidMiddlemanProtocolError(
                 f'Protocol frame is malformed and could not be deserialized: {exception}.'
             )
-
-        raw_signed_part_of_the_frame = frame_format.signed_part_of_the_frame.build(
-            frame.signed_part_of_the_frame
-        )
+        (payload_length, payload_start) = decode_var_int(raw_message, FRAME_PAYLOAD_STARTING_BYTE)
+        payload_end = payload_start + payload_length
+        if len(raw_message) < payload_end:
+            raise FrameInvalidMiddlemanProtocolError(
+                f'Protocol frame is malformed and could not be deserialized: payload is {len(raw_message) - payload_start} '
+                f'bytes long instead of {payload_length}.'
+            )
 
         # Validate
-        cls._validate_signature(raw_signed_part_of_the_frame, frame.frame_signature, public_key)
-        cls._validate_payload_type(frame.signed_part_of_the_frame.payload_type)
+        cls._validate_signature(raw_message[FRAME_SIGNATURE_BYTES_LENGTH:payload_end], frame_signature, public_key)
+        cls._validate_payload_type(payload_type)
 
         # Get class related to current payload type
-        message_class = PAYLOAD_TYPE_TO_MIDDLEMAN_MESSAGE_CLASS[
-            PayloadType[str(frame.signed_part_of_the_frame.payload_type)]
-        ]
+        message_class = PAYLOAD_TYPE_TO_MIDDLEMAN_MESSAGE_CLASS[PayloadType(payload_type)]
 
         # Deserialize payload
-        deserialized_payload = message_class._deserialize_payload(frame.signed_part_of_the_frame.payload)
+        deserialized_payload = message_class._deserialize_payload(raw_message[payload_start:payload_end])
 
         # Recreate original message
         message = message_class(
             payload=deserialized_payload,
-            request_id=frame.signed_part_of_the_frame.request_id
+            request_id=request_id,
         )
 
         return message
@@ -152,8 +199,8 @@ class AbstractFrame(ABC):
     @classmethod
     def _validate_payload_type(cls, payload_type: int) -> None:
         if (
-            not hasattr(PayloadType, str(payload_type)) or
-            PayloadType[str(payload_type)] not in PAYLOAD_TYPE_TO_MIDDLEMAN_MESSAGE_CLASS
+            payload_type not in PayloadType.__members__.values() or
+            PayloadType(payload_type) not in PAYLOAD_TYPE_TO_MIDDLEMAN_MESSAGE_CLASS
         ):
             raise PayloadTypeInvalidMiddlemanProtocolError(
                 f'Payload type {payload_type} is not valid or not registered.'
@@ -185,27 +232,20 @@ class AbstractFrame(ABC):
 
         assert isinstance(serialized_payload, bytes)
 
-        frame_format = self.get_frame_format()
-
-        # Create and build part of the frame which will be signed
-        signed_part_of_the_frame = Container(
-            request_id=self.request_id,
-            payload_type=self.payload_type,  # type: ignore  # pylint: disable=no-member
-            payload=serialized_payload,
-        )
-        raw_signed_part_of_the_frame = frame_format.signed_part_of_the_frame.build(
-            signed_part_of_the_frame
+        # Create part of the frame which will be signed
+        raw_signed_part_of_the_frame = (
+            self.request_id.to_bytes(FRAME_REQUEST_ID_BYTES_LENGTH, byteorder='big') +
+            bytes([self.payload_type]) +  # type: ignore  # pylint: disable=no-member
+            encode_var_int(len(serialized_payload)) +
+            serialized_payload
         )
 
         # Create signature of part of the frame
         frame_signature = ecdsa_sign(privkey=private_key, msghash=raw_signed_part_of_the_frame)
+        assert len(frame_signature) == FRAME_SIGNATURE_BYTES_LENGTH
 
         # Create frame with signature
-        frame = Container(
-            frame_signature=frame_signature,
-            signed_part_of_the_frame=signed_part_of_the_frame,
-        )
-        raw_frame = frame_format.build(frame)
+        raw_frame = frame_signature + raw_signed_part_of_the_frame
 
         return raw_frame
 
@@ -1,5 +1,6 @@
 import socket
 
+from itertools import islice
 from typing import Iterator
 from typing import Optional
 
@@ -11,6 +12,17 @@ from middleman_protocol.constants import RECEIVE_BYTES_PER_LOOP
 from middleman_protocol.exceptions import BrokenEscapingInFrameMiddlemanProtocolError
 from middleman_protocol.message import AbstractFrame
 
+# Maps the byte following escape character in each escape sequence to the character escaped with it.
+ESCAPE_SEQUENCE_ENDINGS_TO_CHARACTERS = {
+    escape_sequence[len(ESCAPE_CHARACTER):]: character
+    for (character, escape_sequence) in ESCAPE_SEQUENCES.items()
+}
+
+assert all(
+    escape_sequence.startswith(ESCAPE_CHARACTER) and len(escape_sequence) == len(ESCAPE_CHARACTER) + 1
+    for escape_sequence in ESCAPE_SEQUENCES.values()
+)
+
 
 def append_frame_separator(raw_frame: bytes) -> bytes:
     """ Adds frame separator to raw frame. """
@@ -29,6 +41,7 @@ def remove_frame_separator(raw_message: bytes) -> bytes:
 
 def escape_encode_raw_message(raw_message: bytes) -> bytes:
     """ Escapes occurrences of escape character and frame separator in raw message to avoid sending them in message. """
+    # Each replace() is a single scan done in C, which makes it faster than any single pass written in Python.
     return raw_message.replace(
         ESCAPE_CHARACTER, ESCAPE_SEQUENCES[ESCAPE_CHARACTER]
     ).replace(
@@ -41,31 +54,34 @@ def escape_decode_raw_message(raw_message: bytes) -> bytes:
     Reverses escaping of occurrences of escape character and frame separator in raw message.
     If there is an escape character which is not a valid escape sequence,
     raise BrokenEscapingInFrameMiddlemanProtocolError.
-    This can be checked by comparing sum of occurrences of escape character
-    to sum of occurrences of escape sequences. If they are equal, data is escaped correctly.
+    Message is split on escape character in a single scan, so each part following an escape character
+    must start with the rest of a valid escape sequence. That byte is replaced with the escaped character.
     """
-    if (
-        raw_message.count(ESCAPE_CHARACTER) !=
-        sum([raw_message.count(escape_sequence) for escape_sequence in ESCAPE_SEQUENCES.values()])
-    ):
-        raise BrokenEscapingInFrameMiddlemanProtocolError()
-    else:
-        return raw_message.replace(
-            ESCAPE_SEQUENCES[FRAME_SEPARATOR], FRAME_SEPARATOR
-        ).replace(
-            ESCAPE_SEQUENCES[ESCAPE_CHARACTER], ESCAPE_CHARACTER
-        )
+    parts = raw_message.split(ESCAPE_CHARACTER)
+    if len(parts) == 1:
+        return raw_message
+
+    unescaped_parts = [parts[0]]
+    for part in islice(parts, 1, None):
+        try:
+            unescaped_parts.append(ESCAPE_SEQUENCE_ENDINGS_TO_CHARACTERS[part[:1]])
+        except KeyError:
+            raise BrokenEscapingInFrameMiddlemanProtocolError()
+        unescaped_parts.append(part[1:])
+    return b''.join(unescaped_parts)
 
 
 def split_stream(connection: socket.socket) -> Iterator[bytes]:
     """
-    Lowest level receiver which determines if received data is frame separator,
-    which means previously received data should be yielded,
-    or if received data is something else and receiver should continue to gather bytes.
+    Lowest level receiver which gathers received data in a buffer and yields data preceding each frame separator
+    found in it. Frames longer than MAXIMUM_FRAME_LENGTH are not yielded and are not kept in the buffer either.
     """
     assert isinstance(connection, socket.socket)
 
-    received_data = []  # type: ignore
+    received_data = bytearray()
+    # Part of the buffer before this position has already been searched for frame separator.
+    search_start = 0
+    is_current_frame_too_long = False
 
     try:
         while True:
@@ -73,16 +89,24 @@ def split_stream(connection: socket.socket) -> Iterator[bytes]:
             if not next_bytes:
                 raise socket.error()
 
-            for next_byte in next_bytes:
-                if bytes([next_byte]) == FRAME_SEPARATOR:
-                    data_to_yield = b''.join(received_data)
-                    received_data = []
-                    if len(data_to_yield) <= MAXIMUM_FRAME_LENGTH:
-                        yield data_to_yield
-                else:
-                    if MAXIMUM_FRAME_LENGTH < len(received_data):
-                        continue
-                    received_data.append(bytes([next_byte]))
+            received_data += next_bytes
+            frame_start = 0
+            separator_position = received_data.find(FRAME_SEPARATOR, search_start)
+            while separator_position != -1:
+                if not is_current_frame_too_long and separator_position - frame_start <= MAXIMUM_FRAME_LENGTH:
+                    yield bytes(received_data[frame_start:separator_position])
+                is_current_frame_too_long = False
+                frame_start = separator_position + len(FRAME_SEPARATOR)
+                separator_position = received_data.find(FRAME_SEPARATOR, frame_start)
+
+            del received_data[:frame_start]
+            # Frame separator is a single byte, so it cannot be split between consecutive reads.
+            search_start = len(received_data)
+
+            if MAXIMUM_FRAME_LENGTH < len(received_data):
+                received_data.clear()
+                search_start = 0
+                is_current_frame_too_long = True
     finally:
         connection.close()
 
@@ -3,6 +3,8 @@ from contextlib import closing
 
 import assertpy
 import pytest
+from construct import Container
+from construct import VarInt
 
 from golem_messages.cryptography import ECCx
 from golem_messages.cryptography import ecdsa_sign
@@ -23,6 +25,8 @@ from middleman_protocol.message import AuthenticationResponseFrame
 from middleman_protocol.message import ErrorFrame
 from middleman_protocol.message import GolemMessageFrame
 from middleman_protocol.message import HeartbeatFrame
+from middleman_protocol.message import decode_var_int
+from middleman_protocol.message import encode_var_int
 from middleman_protocol.registry import create_middleman_protocol_message
 from middleman_protocol.registry import PAYLOAD_TYPE_TO_MIDDLEMAN_MESSAGE_CLASS
 from middleman_protocol.stream import send_over_stream
@@ -217,3 +221,91 @@ class TestMessageMiddlemanProtocol:
                 malformed_raw_message,
                 CONCENT_PUBLIC_KEY,
             )
+
+
+class TestFrameFormatEquivalenceMiddlemanProtocol:
+    """
+    Frames are serialized and deserialized without the construct definition returned by
+    AbstractFrame.get_frame_format(), but must stay equivalent to it.
+    """
+
+    request_id = 99
+
+    @staticmethod
+    def _build_frame_with_reference_format(middleman_message, frame_signature=None):
+        frame_format = AbstractFrame.get_frame_format()
+        signed_part_of_the_frame = Container(
+            request_id=middleman_message.request_id,
+            payload_type=middleman_message.payload_type,
+            payload=middleman_message._serialize_payload(middleman_message.payload),  # pylint: disable=protected-access
+        )
+        if frame_signature is None:
+            frame_signature = ecdsa_sign(
+                CONCENT_PRIVATE_KEY,
+                frame_format.signed_part_of_the_frame.build(signed_part_of_the_frame),
+            )
+        return frame_format.build(
+            Container(
+                frame_signature=frame_signature,
+                signed_part_of_the_frame=signed_part_of_the_frame,
+            )
+        )
+
+    @pytest.mark.parametrize(('middleman_message_type', 'payload', 'request_id'), [
+        (GolemMessageFrame, Ping(), 0),
+        (ErrorFrame, (111, 'error_message'), 99),
+        (AuthenticationChallengeFrame, b'', 2**32 - 1),
+        (AuthenticationChallengeFrame, b'a' * 127, 99),
+        (AuthenticationChallengeFrame, b'a' * 128, 99),
+        (AuthenticationResponseFrame, b'a' * 16383, 99),
+        (AuthenticationResponseFrame, b'a' * 16384, 99),
+        (HeartbeatFrame, None, 99),
+    ])
+    def test_that_serialized_frame_should_match_frame_built_with_reference_format(
+        self,
+        middleman_message_type,
+        payload,
+        request_id,
+    ):
+        middleman_message = middleman_message_type(payload, request_id)
+        raw_message = middleman_message.serialize(private_key=CONCENT_PRIVATE_KEY)
+
+        assertpy.assert_that(raw_message).is_equal_to(
+            self._build_frame_with_reference_format(middleman_message, raw_message[:FRAME_SIGNATURE_BYTES_LENGTH])
+        )
+
+    @pytest.mark.parametrize(('middleman_message_type', 'payload'), [
+        (GolemMessageFrame, Ping()),
+        (ErrorFrame, (111, 'error_message')),
+        (AuthenticationChallengeFrame, b'a' * 128),
+        (AuthenticationResponseFrame, b'a' * 16384),
+        (HeartbeatFrame, None),
+    ])
+    def test_that_frame_built_with_reference_format_should_be_deserialized(
+        self,
+        middleman_message_type,
+        payload,
+    ):
+        middleman_message = middleman_message_type(payload, self.request_id)
+        raw_message = self._build_frame_with_reference_format(middleman_message)
+
+        deserialized_message = AbstractFrame.deserialize(raw_message, CONCENT_PUBLIC_KEY)
+
+        assertpy.assert_that(deserialized_message).is_equal_to(middleman_message)
+
+    def test_that_bytes_following_frame_should_be_ignored_like_by_reference_format(self):
+        middleman_message = ErrorFrame((111, 'error_message'), self.request_id)
+        raw_message = middleman_message.serialize(private_key=CONCENT_PRIVATE_KEY) + b'trailing_bytes'
+
+        reference_frame = AbstractFrame.get_frame_format().parse(raw_message)
+        deserialized_message = AbstractFrame.deserialize(raw_message, CONCENT_PUBLIC_KEY)
+
+        assertpy.assert_that(deserialized_message).is_equal_to(middleman_message)
+        assertpy.assert_that(deserialized_message.request_id).is_equal_to(reference_frame.signed_part_of_the_frame.request_id)
+
+    @pytest.mark.parametrize('value', [0, 1, 127, 128, 16383, 16384, 2**21, 2**35 + 5])
+    def test_that_var_int_should_be_encoded_and_decoded_like_by_reference_format(self, value):  # pylint: disable=no-self-use
+        encoded_value = encode_var_int(value)
+
+        assertpy.assert_that(encoded_value).is_equal_to(VarInt.build(value))
+        assertpy.assert_that(decode_var_int(b'\x00' + encoded_value, 1)).is_equal_to((value, len(encoded_value) + 1))
@@ -1,3 +1,4 @@
+import random
 import socket
 from contextlib import closing
 from unittest import TestCase
@@ -112,6 +113,58 @@ class TestEscapingAndHandlingSeparatorMiddlemanProtocol(TestCase):
         self.assertEqual(raw, raw_unescaped)
 
 
+def escape_decode_raw_message_by_counting_escape_sequences(raw_message):
+    """ Previous implementation of escape_decode_raw_message(), used as a reference. """
+    if (
+        raw_message.count(ESCAPE_CHARACTER) !=
+        sum([raw_message.count(escape_sequence) for escape_sequence in ESCAPE_SEQUENCES.values()])
+    ):
+        raise BrokenEscapingInFrameMiddlemanProtocolError()
+    return raw_message.replace(
+        ESCAPE_SEQUENCES[FRAME_SEPARATOR], FRAME_SEPARATOR
+    ).replace(
+        ESCAPE_SEQUENCES[ESCAPE_CHARACTER], ESCAPE_CHARACTER
+    )
+
+
+def generate_random_messages(seed, alphabet):
+    """
+    Generates messages of random length made of bytes from given alphabet. Generator is seeded,
+    so that a failing case can be reproduced.
+    """
+    generator = random.Random(seed)
+    for length in list(range(5)) + [generator.randint(0, 300) for _ in range(200)]:
+        yield bytes(generator.choice(alphabet) for _ in range(length))
+
+
+# Bytes interesting for escaping are much more likely to appear next to each other than in random data.
+ESCAPING_ALPHABET = ESCAPE_CHARACTER + FRAME_SEPARATOR + b'\xff' + b''.join(
+    escape_sequence[len(ESCAPE_CHARACTER):] for escape_sequence in ESCAPE_SEQUENCES.values()
+)
+
+
+class TestEscapingPropertiesMiddlemanProtocol:
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_that_decoding_escaped_message_should_return_original_message(self, seed):  # pylint: disable=no-self-use
+        for raw_message in generate_random_messages(seed, ESCAPING_ALPHABET + bytes(range(256))):
+            raw_escaped = escape_encode_raw_message(raw_message)
+
+            assert FRAME_SEPARATOR not in raw_escaped
+            assert escape_decode_raw_message(raw_escaped) == raw_message
+
+    @pytest.mark.parametrize('seed', range(5))
+    def test_that_decoding_any_message_should_give_the_same_result_as_reference_implementation(self, seed):  # pylint: disable=no-self-use
+        for raw_message in generate_random_messages(seed, ESCAPING_ALPHABET + b'a'):
+            try:
+                expected_result = escape_decode_raw_message_by_counting_escape_sequences(raw_message)
+            except BrokenEscapingInFrameMiddlemanProtocolError:
+                with pytest.raises(BrokenEscapingInFrameMiddlemanProtocolError):
+                    escape_decode_raw_message(raw_message)
+            else:
+                assert escape_decode_raw_message(raw_message) == expected_result
+
+
 class TestUnescapeStreamHelperMiddlemanProtocol:
 
     request_id = 99
@@ -409,3 +462,30 @@ class TestSplitStreamHelperMiddlemanProtocol:
                 client_socket.close()
                 with pytest.raises(socket.error):
                     next(split_stream(connection=connection))
+
+    def test_that_frames_split_between_and_sharing_received_chunks_should_be_handled_correctly(self, unused_tcp_port):
+        raw_messages = [
+            escape_encode_raw_message(
+                GolemMessageFrame(Ping(), request_id).serialize(private_key=CONCENT_PRIVATE_KEY)
+            )
+            for request_id in range(3)
+        ]
+
+        with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as server_socket:
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+            with closing(socket.socket(socket.AF_INET, socket.SOCK_STREAM)) as client_socket:
+                client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, True)
+                server_socket.bind(('127.0.0.1', unused_tcp_port))
+                server_socket.listen(1)
+
+                client_socket.connect(('127.0.0.1', unused_tcp_port))
+
+                (connection, _address) = server_socket.accept()
+
+                client_socket.sendall(b''.join(append_frame_separator(raw_message) for raw_message in raw_messages))
+
+                with mock.patch('middleman_protocol.stream.RECEIVE_BYTES_PER_LOOP', 7):
+                    split_stream_generator = split_stream(connection=connection)
+                    raw_messages_received = [next(split_stream_generator) for _ in raw_messages]
+
+        assertpy.assert_that(raw_messages_received).is_equal_to(raw_messages)